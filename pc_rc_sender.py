@@ -22,9 +22,11 @@ Data Flow:
 import argparse
 import glob
 import os
+import random
 import socket
 import struct
 import sys
+import threading
 import time
 
 import serial
@@ -33,6 +35,49 @@ import serial
 IBUS_FRAME_LEN = 32        # Each iBUS frame is 32 bytes
 IBUS_HEADER = b"\x20\x40"  # Frame starts with these two bytes
 
+# Optional RC datagram envelope (--envelope). Must match pi_rover_system.py.
+# Layout (little-endian): magic "RV", version, flags, session id (random per
+# sender run), sequence number, sender monotonic timestamp in µs, then the
+# unmodified 32-byte iBUS frame. Without --envelope the bare frame is sent.
+ENVELOPE_MAGIC = b"RV"
+ENVELOPE_VERSION = 1
+ENVELOPE_HEADER = struct.Struct("<2sBBIIQ")
+ENVELOPE_LEN = ENVELOPE_HEADER.size + IBUS_FRAME_LEN
+
+# Send scheduling modes (--mode)
+SEND_MODES = ("fixed-rate", "on-change", "arrival", "delta")
+
+# ESP32 IBusBM declares RC_LOST after 500 ms without a frame; delta-mode
+# keepalives must stay well inside that window even if one is lost.
+ESP32_RC_LOST_SEC = 0.5
+
+
+def parse_path(spec: str, default_port: int) -> tuple:
+    """
+    Parse a --path spec "HOST[:PORT][@SRC_IP]".
+
+    SRC_IP binds the socket to a local address so the copy leaves through a
+    specific NIC (e.g. the USB-Ethernet adapter) rather than the default route.
+
+    Returns:
+        tuple: (host, port, src_ip or "")
+    """
+    dest, _, src_ip = spec.partition("@")
+    host, sep, port = dest.rpartition(":")
+    if not sep:
+        host, port = dest, ""
+    if not host:
+        raise ValueError(f"invalid path {spec!r}, expected HOST[:PORT][@SRC_IP]")
+    return host, int(port) if port else default_port, src_ip
+
+
+def open_path(host: str, port: int, src_ip: str = "") -> tuple:
+    """Create a UDP socket for one link, bound to src_ip if given."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    if src_ip:
+        sock.bind((src_ip, 0))
+    return sock, (host, port)
+
 
 def auto_detect_serial() -> str:
     """
@@ -59,6 +104,12 @@ def auto_detect_serial() -> str:
     return candidates[0]
 
 
+def ibus_checksum_ok(frame) -> bool:
+    """Return True if the trailing checksum of a 32-byte iBUS frame matches."""
+    expected_checksum = frame[30] | (frame[31] << 8)
+    return (0xFFFF - (sum(frame[:30]) & 0xFFFF)) & 0xFFFF == expected_checksum
+
+
 def parse_ibus_frame(frame: bytes):
     """
     Parse a raw iBUS frame and extract 14 channel values.
@@ -82,9 +133,7 @@ def parse_ibus_frame(frame: bytes):
         return None
 
     # Validate checksum: 0xFFFF - sum(bytes 0-29) should equal checksum bytes
-    expected_checksum = struct.unpack_from("<H", frame, 30)[0]
-    checksum = (0xFFFF - (sum(frame[:30]) & 0xFFFF)) & 0xFFFF
-    if checksum != expected_checksum:
+    if not ibus_checksum_ok(frame):
         return None
 
     # Extract 14 channel values (2 bytes each, little-endian)
@@ -92,66 +141,376 @@ def parse_ibus_frame(frame: bytes):
     return channels
 
 
-def read_ibus_frame(ser: serial.Serial):
+class IBusDeframer:
     """
-    Read and synchronize to an iBUS frame from serial port.
-
-    Scans for the iBUS header (0x20 0x40) then reads remaining 30 bytes.
-    Handles partial frames and synchronization loss gracefully.
+    Streaming iBUS frame synchronizer.
 
-    Args:
-        ser: Open serial.Serial instance (CP2102 device)
+    Bytes are appended to an internal buffer in whatever block size the serial
+    driver delivers; the buffer is then scanned for 0x20 0x40 headers with
+    bytes.find() and every candidate is checksum-validated before it is
+    accepted. A corrupted candidate only advances the scan by one byte, so the
+    deframer resyncs on the next real header without losing a frame.
 
-    Returns:
-        bytes: 32-byte iBUS frame or None on timeout/error
+    Every feed() scans to the end of the buffer, so afterwards at most a
+    partial frame (fewer than 32 bytes) is kept; noise cannot grow memory.
     """
-    while True:
-        # Look for first header byte (with timeout handled by ser.timeout)
-        first = ser.read(1)
-        if not first:
-            return None          # Timeout – caller re-enters loop
-        if first != b"\x20":
-            continue
-
-        # Look for second header byte
-        second = ser.read(1)
-        if not second:
-            return None
-
-        # Handle case where we might have sync slipped to the middle of a stream
-        # e.g., ... 0x20 0x20 0x40 ...
-        # If second byte is 0x20, it might be the START of the new frame, not the 2nd byte.
-        if second == b"\x20":
-            # Peek next byte to see if it is 0x40
-            # Note: pyserial peek isn't standard, so we just read one more.
-            third = ser.read(1)
-            if not third:
-                return None
-
-            if third == b"\x40":
-                # Found 0x20 0x20 0x40 -> The second 0x20 was the start.
-                # We have consumed header (second, third).
-                # Need to read rest.
-                rest = ser.read(IBUS_FRAME_LEN - 2)
-                if len(rest) != IBUS_FRAME_LEN - 2:
-                    return None
-                return b"\x20\x40" + rest
-            elif third == b"\x20":
-                # 0x20 0x20 0x20 ... keep trying to sync
-                continue
+
+    def __init__(self):
+        self.buf = bytearray()
+        self.frames_ok = 0
+        self.checksum_errors = 0
+        self.bytes_discarded = 0
+
+    def feed(self, data: bytes) -> list:
+        """
+        Append raw bytes and extract every complete, valid frame.
+
+        Returns:
+            list: Zero or more 32-byte iBUS frames, oldest first
+        """
+        buf = self.buf
+        buf.extend(data)
+        frames = []
+        pos = 0
+        end = len(buf)
+
+        while True:
+            idx = buf.find(IBUS_HEADER, pos)
+            if idx < 0:
+                # Keep a trailing 0x20 – it may be the first half of a header
+                keep_from = end - 1 if end and buf[-1] == IBUS_HEADER[0] else end
+                self.bytes_discarded += keep_from - pos
+                pos = keep_from
+                break
+            self.bytes_discarded += idx - pos
+            if end - idx < IBUS_FRAME_LEN:
+                pos = idx          # Partial frame – wait for more bytes
+                break
+            frame = bytes(buf[idx:idx + IBUS_FRAME_LEN])
+            if ibus_checksum_ok(frame):
+                frames.append(frame)
+                pos = idx + IBUS_FRAME_LEN
             else:
-                # 0x20 0x20 0x?? -> Not a valid header. Reset.
-                continue
+                # False header inside payload or corrupted frame – resync
+                self.checksum_errors += 1
+                self.bytes_discarded += 1
+                pos = idx + 1
+
+        if pos:
+            del buf[:pos]
 
-        if second != b"\x40":
-            continue
+        self.frames_ok += len(frames)
+        return frames
 
-        # Found 0x20 0x40
-        rest = ser.read(IBUS_FRAME_LEN - 2)
-        if len(rest) != IBUS_FRAME_LEN - 2:
-            return None
+    def read(self, ser: serial.Serial) -> list:
+        """
+        Read everything currently waiting on the serial port and deframe it.
 
-        return first + second + rest
+        Blocks for at most ser.timeout when the driver buffer is empty, so the
+        caller's loop does not spin.
+
+        Returns:
+            list: Zero or more 32-byte iBUS frames, oldest first
+        """
+        data = ser.read(max(ser.in_waiting, 1))
+        if not data:
+            return []
+        return self.feed(data)
+
+    def reset(self) -> None:
+        """Drop buffered bytes (e.g. after the serial port is reopened)."""
+        self.buf.clear()
+
+
+def pack_envelope(frame: bytes, session: int, seq: int, ts_us: int) -> bytes:
+    """Wrap a 32-byte iBUS frame in the versioned RC datagram envelope."""
+    return ENVELOPE_HEADER.pack(ENVELOPE_MAGIC, ENVELOPE_VERSION, 0, session,
+                                seq & 0xFFFFFFFF, ts_us & 0xFFFFFFFFFFFFFFFF) + frame
+
+
+class LatestFrame:
+    """
+    Single-slot mailbox between the serial reader and the UDP sender.
+
+    The reader overwrites the slot with every valid frame (latest wins) and
+    bumps a sequence number; the sender never sees a queue of stale frames,
+    only the newest one and whether it has changed since it last looked.
+    """
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.seq = 0
+        self.frame = None
+        self.channels = None
+        self.rx_time = 0.0
+
+    def publish(self, frame: bytes, channels: list, rx_time: float) -> None:
+        with self.cond:
+            self.frame = frame
+            self.channels = channels
+            self.rx_time = rx_time
+            self.seq += 1
+            self.cond.notify_all()
+
+    def wait_newer(self, seq: int, timeout: float):
+        """
+        Wait up to timeout for a frame newer than seq.
+
+        Returns:
+            tuple: (seq, frame, channels, rx_time) of the newest frame, which
+                   may still be seq itself if the wait timed out
+        """
+        with self.cond:
+            if self.seq == seq and timeout > 0:
+                self.cond.wait(timeout)
+            return self.seq, self.frame, self.channels, self.rx_time
+
+
+class Histogram:
+    """Fixed-bucket millisecond histogram with an ASCII report."""
+
+    BOUNDS_MS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100)
+
+    def __init__(self, title: str):
+        self.title = title
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.samples = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value_ms: float) -> None:
+        i = 0
+        while i < len(self.BOUNDS_MS) and value_ms > self.BOUNDS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.samples += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+
+    def percentile(self, pct: float) -> float:
+        """Upper bucket bound containing the given percentile (ms)."""
+        target = self.samples * pct / 100.0
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return self.BOUNDS_MS[i] if i < len(self.BOUNDS_MS) else self.max
+        return 0.0
+
+    def report(self, width: int = 40) -> str:
+        if not self.samples:
+            return f"{self.title}: no samples"
+        lines = [
+            f"{self.title}: n={self.samples} mean={self.total / self.samples:.3f}ms "
+            f"p50<={self.percentile(50):g}ms p99<={self.percentile(99):g}ms max={self.max:.3f}ms"
+        ]
+        peak = max(self.counts)
+        for i, count in enumerate(self.counts):
+            label = f"<={self.BOUNDS_MS[i]:g}" if i < len(self.BOUNDS_MS) else f">{self.BOUNDS_MS[-1]:g}"
+            if count:
+                bar = "#" * max(1, round(width * count / peak))
+                lines.append(f"  {label:>7} ms {count:>8} {bar}")
+        return "\n".join(lines)
+
+
+def serial_reader(serial_port: str, baud: int, slot: LatestFrame, stop: threading.Event) -> None:
+    """
+    Reader thread: keep the serial port open and publish every valid frame.
+
+    Reconnects after serial errors until stop is set.
+    """
+    deframer = IBusDeframer()
+    fail_count = 0
+    while not stop.is_set():
+        try:
+            # Open serial connection to CP2102/Flysky receiver
+            # timeout=0.1 lets the deframer return an empty batch on timeout instead of blocking
+            with serial.Serial(serial_port, baud, timeout=0.1, exclusive=True) as ser:
+                print(f"[OK]  Serial port {serial_port} opened.")
+                fail_count = 0
+                deframer.reset()
+
+                while not stop.is_set():
+                    # Read all buffered bytes, yielding zero or more complete iBUS frames
+                    frames = deframer.read(ser)
+                    if not frames:
+                        continue
+                    rx_time = time.monotonic()
+                    # Only the newest frame of a batch matters – older ones are already stale
+                    frame = frames[-1]
+                    channels = parse_ibus_frame(frame)
+                    if channels is not None:
+                        slot.publish(frame, channels, rx_time)
+
+        except serial.SerialException as e:
+            fail_count += 1
+            print(f"[WARN] Serial error ({fail_count}): {e}. Reconnecting in 2s...")
+            stop.wait(2)
+
+        except Exception as e:
+            fail_count += 1
+            print(f"[WARN] Unexpected error ({fail_count}): {e}. Retrying in 2s...")
+            stop.wait(2)
+
+
+class RcSender:
+    """
+    Sender thread: forwards the newest frame from a LatestFrame slot over UDP.
+
+    Modes:
+      fixed-rate – send the newest frame on an absolute monotonic tick
+                   (start + k * interval), so the rate does not drift
+      on-change  – send as soon as the channels change, otherwise on the tick
+      arrival    – send every frame as soon as the reader publishes it
+      delta      – send as soon as any channel moves more than
+                   delta_threshold from the last sent frame, otherwise a
+                   keepalive every keepalive seconds
+
+    A frame is sent at most once, so nothing goes out once the Flysky
+    receiver stops producing frames and the ESP32 failsafe still trips.
+
+    With envelope=True every datagram carries a sequence number and send
+    timestamp so the Pi can tell loss, reordering and delay apart.
+
+    paths is a list of (socket, (host, port)); every frame is sent on all of
+    them with the same sequence number and the Pi forwards the first copy.
+    """
+
+    def __init__(self, paths: list, slot: LatestFrame, mode: str,
+                 interval: float, print_every: int = 0, delta_threshold: int = 5,
+                 keepalive: float = 0.2, envelope: bool = False):
+        self.paths = paths
+        self.slot = slot
+        self.mode = mode
+        self.interval = interval
+        self.print_every = print_every
+        self.delta_threshold = delta_threshold
+        self.keepalive = keepalive
+        self.envelope = envelope
+        self.session = random.getrandbits(32)
+        self.seq = 0
+        self.started = time.monotonic()
+        self.sent_count = 0
+        self.sent_by_reason = {}
+        self.send_errors = 0
+        self.last_sent_seq = 0
+        self.last_seen_seq = 0
+        self.last_sent_channels = None
+        self.latency = Histogram("Stick-to-UDP latency")
+        self.jitter = Histogram("Send-interval jitter")
+
+    def send(self, frame: bytes, channels: list, rx_time: float, reason: str) -> None:
+        payload = frame
+        if self.envelope:
+            # Every attempt consumes a sequence number, so a failed send shows
+            # up as loss on the Pi just like a dropped packet would
+            self.seq += 1
+            payload = pack_envelope(frame, self.session, self.seq, time.monotonic_ns() // 1000)
+        delivered = False
+        for sock, dest in self.paths:
+            try:
+                # Send raw 32-byte iBUS frame (optionally enveloped) to Pi
+                sock.sendto(payload, dest)
+                delivered = True
+            except OSError as e:
+                # One dead link must not hold back the others
+                self.send_errors += 1
+                if self.send_errors == 1 or self.send_errors % 100 == 0:
+                    print(f"[WARN] UDP send error to {dest[0]}:{dest[1]} ({self.send_errors}): {e}")
+        if not delivered:
+            return
+        self.latency.add((time.monotonic() - rx_time) * 1000.0)
+        self.last_sent_channels = channels
+        self.sent_count += 1
+        self.sent_by_reason[reason] = self.sent_by_reason.get(reason, 0) + 1
+        if self.print_every > 0 and self.sent_count % self.print_every == 0:
+            ch_str = " ".join(str(ch) for ch in channels)
+            print(f"TX #{self.sent_count}: Raw iBUS Frame sent (channels: {ch_str})")
+
+    def run(self, stop: threading.Event) -> None:
+        self.started = time.monotonic()
+        if self.mode == "arrival":
+            self._run_arrival(stop)
+        elif self.mode == "delta":
+            self._run_delta(stop)
+        else:
+            self._run_ticked(stop)
+
+    def _run_arrival(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            seq, frame, channels, rx_time = self.slot.wait_newer(self.last_sent_seq, 0.1)
+            if seq != self.last_sent_seq:
+                self.last_sent_seq = seq
+                self.send(frame, channels, rx_time, "arrival")
+
+    def _run_ticked(self, stop: threading.Event) -> None:
+        start = time.monotonic()
+        tick = 1
+        deadline = start + self.interval
+        while not stop.is_set():
+            now = time.monotonic()
+            if now < deadline:
+                if self.mode == "on-change":
+                    seq, frame, channels, rx_time = self.slot.wait_newer(self.last_seen_seq, deadline - now)
+                    self.last_seen_seq = seq
+                    if seq != self.last_sent_seq and channels != self.last_sent_channels:
+                        self.last_sent_seq = seq
+                        self.send(frame, channels, rx_time, "change")
+                else:
+                    time.sleep(deadline - now)
+                continue
+
+            # Tick reached – record how late we woke relative to the absolute deadline
+            self.jitter.add((now - deadline) * 1000.0)
+            seq, frame, channels, rx_time = self.slot.wait_newer(self.last_sent_seq, 0)
+            if seq != self.last_sent_seq:
+                self.last_sent_seq = seq
+                self.send(frame, channels, rx_time, "tick")
+
+            # Absolute schedule; skip ticks we overslept instead of bursting to catch up
+            tick = max(tick + 1, int((now - start) / self.interval) + 1)
+            deadline = start + tick * self.interval
+
+    def moved(self, channels: list) -> bool:
+        """True if any channel differs from the last sent frame by more than delta_threshold."""
+        last = self.last_sent_channels
+        if last is None:
+            return True
+        threshold = self.delta_threshold
+        return any(abs(a - b) > threshold for a, b in zip(channels, last))
+
+    def _run_delta(self, stop: threading.Event) -> None:
+        keepalive_at = time.monotonic() + self.keepalive
+        while not stop.is_set():
+            now = time.monotonic()
+            if now >= keepalive_at:
+                # Quiet sticks – refresh the ESP32 with the newest frame. Only a
+                # frame the receiver produced since the last send qualifies, so a
+                # dead receiver still goes silent and trips the failsafe.
+                seq, frame, channels, rx_time = self.slot.wait_newer(self.last_sent_seq, 0)
+                if seq != self.last_sent_seq:
+                    self.last_sent_seq = seq
+                    self.send(frame, channels, rx_time, "keepalive")
+                keepalive_at = now + self.keepalive
+                continue
+
+            seq, frame, channels, rx_time = self.slot.wait_newer(self.last_seen_seq, keepalive_at - now)
+            self.last_seen_seq = seq
+            if seq != self.last_sent_seq and self.moved(channels):
+                self.last_sent_seq = seq
+                self.send(frame, channels, rx_time, "change")
+                keepalive_at = time.monotonic() + self.keepalive
+
+    def report(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        by_reason = ", ".join(f"{k}={v}" for k, v in sorted(self.sent_by_reason.items())) or "none"
+        lines = [f"Mode {self.mode}: sent {self.sent_count} frames ({self.sent_count / elapsed:.1f}/s), "
+                 f"{self.send_errors} send errors",
+                 f"Packets by trigger: {by_reason}",
+                 self.latency.report()]
+        if self.mode in ("fixed-rate", "on-change"):
+            lines.append(self.jitter.report())
+        return "\n".join(lines)
 
 
 def main():
@@ -168,6 +527,24 @@ def main():
     parser.add_argument("--pi-ip", required=True, help="Raspberry Pi IP address (e.g. pi04b.local)")
     parser.add_argument("--pi-port", type=int, default=5000, help="Raspberry Pi UDP port (default: 5000)")
     parser.add_argument("--hz", type=float, default=50.0, help="Send rate in Hz (default: 50)")
+    parser.add_argument(
+        "--mode",
+        choices=SEND_MODES,
+        default="fixed-rate",
+        help="Send scheduling: fixed-rate tick, on-change (immediate on stick movement, "
+             "else tick), arrival (every frame) or delta (movement beyond --delta-threshold, "
+             "else keepalive) (default: fixed-rate)",
+    )
+    parser.add_argument("--delta-threshold", type=int, default=5,
+                        help="delta mode: channel change in µs that triggers an immediate send (default: 5)")
+    parser.add_argument("--keepalive", type=float, default=0.2,
+                        help="delta mode: resend interval in seconds while sticks are still (default: 0.2)")
+    parser.add_argument("--path", action="append", default=[], metavar="HOST[:PORT][@SRC_IP]",
+                        help="Additional redundant link; every frame is also sent here (repeatable, "
+                             "implies --envelope so the Pi can deduplicate)")
+    parser.add_argument("--envelope", action="store_true",
+                        help="Wrap frames with sequence number and timestamp for Pi-side loss/latency "
+                             "stats (needs a Pi running the matching pi_rover_system.py)")
     parser.add_argument("--print-every", type=int, default=10, help="Print channel values every N sent packets (default: 10)")
     args = parser.parse_args()
 
@@ -187,77 +564,63 @@ def main():
 
     # Calculate send interval (1/Hz)
     interval = 1.0 / max(args.hz, 1.0)
-    next_send = 0.0
-    sent_count = 0
-    fail_count = 0
 
-    # Create UDP socket for sending to Pi
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    if args.mode == "delta" and args.keepalive >= ESP32_RC_LOST_SEC / 2:
+        print(f"[WARN] --keepalive {args.keepalive}s leaves no margin inside the ESP32 "
+              f"{ESP32_RC_LOST_SEC * 1000:.0f} ms RC_LOST window; one lost packet will trip failsafe")
+
+    # Create one UDP socket per link to the Pi (primary first)
+    try:
+        specs = [(args.pi_ip, args.pi_port, "")] + [parse_path(p, args.pi_port) for p in args.path]
+        paths = [open_path(*spec) for spec in specs]
+    except (ValueError, OSError) as e:
+        print(f"[FAIL] Bad --path: {e}")
+        sys.exit(1)
+    # Redundant copies are only safe if the Pi can recognise duplicates
+    envelope = args.envelope or len(paths) > 1
+    slot = LatestFrame()
+    stop = threading.Event()
+    sender = RcSender(paths, slot, args.mode, interval, args.print_every,
+                      args.delta_threshold, args.keepalive, envelope)
 
     print(f"\n{'='*55}")
     print(f"  RC SENDER - Flysky iBUS → UDP → Raspberry Pi")
     print(f"{'='*55}")
     print(f"  Serial port : {serial_port} @ {args.baud} baud")
-    print(f"  Destination : {args.pi_ip}:{args.pi_port}  (UDP)")
-    print(f"  Send rate   : {args.hz:.1f} Hz")
+    for i, (host, port, src_ip) in enumerate(specs):
+        label = "Destination :" if i == 0 else "  + path    :"
+        via = f"  via {src_ip}" if src_ip else ""
+        print(f"  {label} {host}:{port}  (UDP){via}")
+    if args.mode == "delta":
+        print(f"  Send rate   : on change > {args.delta_threshold} µs, keepalive {args.keepalive * 1000:.0f} ms")
+    else:
+        print(f"  Send rate   : {args.hz:.1f} Hz ({args.mode})")
+    print(f"  Payload     : {'enveloped iBUS (seq + timestamp)' if envelope else 'raw 32-byte iBUS'}")
     print(f"{'='*55}")
     print("  Move Flysky sticks to start sending data...")
     print("  Press Ctrl+C to exit.\n")
 
-    try:
-        while True:
-            try:
-                # Open serial connection to CP2102/Flysky receiver
-                # timeout=0.1 lets read_ibus_frame return None on timeout instead of blocking
-                with serial.Serial(serial_port, args.baud, timeout=0.1, exclusive=True) as ser:
-                    print(f"[OK]  Serial port {serial_port} opened.")
-                    fail_count = 0
-
-                    while True:
-                        # Read one complete iBUS frame
-                        frame = read_ibus_frame(ser)
-                        if not frame:
-                            continue
-
-                        # Parse frame to extract 14 channel values
-                        channels = parse_ibus_frame(frame)
-                        if channels is None:
-                            continue
-
-                        # Apply frame rate limiting (send at ~Hz)
-                        now = time.monotonic()
-                        if now < next_send:
-                            continue
-
-                        # Send raw 32-byte iBUS frame to Pi
-                        sock.sendto(frame, (args.pi_ip, args.pi_port))
-
-                        sent_count += 1
-                        if args.print_every > 0 and sent_count % args.print_every == 0:
-                            ch_str = " ".join(str(ch) for ch in channels)
-                            print(f"TX #{sent_count}: Raw iBUS Frame sent (channels: {ch_str})")
-
-                        next_send = now + interval
-
-            except KeyboardInterrupt:
-                # Must be before Exception so Ctrl+C is caught here first
-                raise
-
-            except serial.SerialException as e:
-                fail_count += 1
-                print(f"[WARN] Serial error ({fail_count}): {e}. Reconnecting in 2s...")
-                time.sleep(2)
-
-            except Exception as e:
-                fail_count += 1
-                print(f"[WARN] Unexpected error ({fail_count}): {e}. Retrying in 2s...")
-                time.sleep(2)
+    reader_thread = threading.Thread(
+        target=serial_reader, args=(serial_port, args.baud, slot, stop), daemon=True
+    )
+    sender_thread = threading.Thread(target=sender.run, args=(stop,), daemon=True)
+    reader_thread.start()
+    sender_thread.start()
 
+    try:
+        # Main thread only waits so Ctrl+C is delivered here
+        while reader_thread.is_alive() and sender_thread.is_alive():
+            time.sleep(0.5)
     except KeyboardInterrupt:
         print("\n[INFO] Exiting – RC sender stopped.")
     finally:
-        sock.close()
+        stop.set()
+        reader_thread.join(timeout=1.0)
+        sender_thread.join(timeout=1.0)
+        for sock, _ in paths:
+            sock.close()
+        print(sender.report())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -27,20 +27,41 @@ DATA FLOW:
 """
 
 import argparse
+import array
+import binascii
+import math
 import struct
 import collections
+import ctypes
+import errno
+import fcntl
+import gzip
+import hashlib
+import heapq
+import json
+import mimetypes
+import os
+import sys
 import time
 import socket
 import select
+import selectors
 import subprocess
 import threading
 import serial
 import re
 from contextlib import suppress
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Deque, List, Optional
 
-from flask import Flask, jsonify, render_template_string, request
+from flask import Flask, Response, abort, jsonify, request, stream_with_context
+from jinja2 import Template
+from werkzeug.http import http_date
+
+try:
+    import brotli
+except ImportError:
+    brotli = None   # Optional: gzip is always available
 
 try:
     import RPi.GPIO as GPIO
@@ -49,6 +70,13 @@ except (ImportError, RuntimeError):
     GPIO_AVAILABLE = False
     print("Warning: RPi.GPIO not found or not on Pi. GPIO features will be simulated.")
 
+try:
+    from flask_sock import Sock
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    WEBSOCKET_AVAILABLE = False
+    print("Warning: flask-sock not installed. Dashboard controls will use REST only.")
+
 # ─── GPIO CONFIGURATION ─────────────────────────────────────────────────────
 PIN_SERVO_1 = 12  # Hardware PWM 0
 PIN_SERVO_2 = 13  # Hardware PWM 1
@@ -61,361 +89,9 @@ PIN_SWITCH_3 = 22
 SWITCH_PINS = [PIN_SWITCH_1, PIN_SWITCH_2, PIN_SWITCH_3]
 SWITCH_LABELS = ["Switch 1 (GPIO 17)", "Switch 2 (GPIO 27)", "Switch 3 (GPIO 22)"]
 
-DASHBOARD_HTML = """
-<!doctype html>
-<html>
-<head>
-  <meta charset="utf-8" />
-  <meta name="viewport" content="width=device-width, initial-scale=1" />
-  <title>Rover Command Center</title>
-  <!-- Fonts: using system fonts for offline operation (no CDN needed) -->
-  <style>
-    :root {
-      --bg1:#0a0a1a;
-      --glass:rgba(255,255,255,0.04);
-      --glass-b:rgba(255,255,255,0.09);
-      --gp:linear-gradient(135deg,#7c3aed,#06b6d4);
-      --success:#10b981;--warning:#f59e0b;--danger:#ef4444;
-      --text:#f1f5f9;--muted:#64748b;
-      --glp:rgba(124,58,237,0.35);--glc:rgba(6,182,212,0.35);
-    }
-    *,*::before,*::after{box-sizing:border-box;margin:0;padding:0}
-    body{
-      font-family:'Segoe UI',system-ui,-apple-system,'Helvetica Neue',Arial,sans-serif;
-      background:var(--bg1);
-      background-image:
-        radial-gradient(ellipse 80% 50% at 15% 10%,rgba(124,58,237,.18) 0%,transparent 60%),
-        radial-gradient(ellipse 60% 40% at 85% 90%,rgba(6,182,212,.14) 0%,transparent 60%),
-        radial-gradient(ellipse 50% 70% at 50% 50%,rgba(15,10,40,.9) 0%,transparent 100%);
-      color:var(--text);height:100vh;overflow:hidden;
-    }
-    .wrap{display:grid;grid-template-columns:270px 1fr 290px;grid-template-rows:64px 1fr;gap:12px;padding:12px;height:100vh;}
-    .card{background:var(--glass);backdrop-filter:blur(20px) saturate(180%);-webkit-backdrop-filter:blur(20px) saturate(180%);border:1px solid var(--glass-b);border-radius:18px;padding:18px;display:flex;flex-direction:column;transition:border-color .3s,box-shadow .3s;position:relative;overflow:hidden;}
-    .card::before{content:'';position:absolute;inset:0;border-radius:inherit;background:linear-gradient(135deg,rgba(255,255,255,.05) 0%,transparent 60%);pointer-events:none;}
-    .card:hover{border-color:rgba(124,58,237,.3);box-shadow:0 0 30px rgba(124,58,237,.1)}
-    .header{grid-column:1/-1;flex-direction:row;align-items:center;justify-content:space-between;padding:10px 18px;background:rgba(255,255,255,.025);border-color:rgba(255,255,255,.06);}
-    .brand{display:flex;align-items:center;gap:12px}
-    .brand-icon{width:38px;height:38px;border-radius:10px;background:var(--gp);display:flex;align-items:center;justify-content:center;font-size:20px;box-shadow:0 0 20px var(--glp);}
-    .brand-name{font-size:16px;font-weight:700;letter-spacing:.5px;background:var(--gp);-webkit-background-clip:text;-webkit-text-fill-color:transparent;background-clip:text;}
-    .brand-sub{font-size:9px;color:var(--muted);letter-spacing:2px;text-transform:uppercase}
-    .hdr-right{display:flex;align-items:center;gap:16px}
-    .sys-time{font-family:'Consolas','Courier New',monospace;font-size:13px;color:var(--muted)}
-    .sbadge{display:flex;align-items:center;gap:6px;padding:6px 14px;border-radius:999px;font-size:10px;font-weight:700;letter-spacing:1.5px;background:rgba(239,68,68,.12);color:var(--danger);border:1px solid rgba(239,68,68,.25);transition:all .4s;}
-    .sbadge.live{background:rgba(16,185,129,.12);color:var(--success);border-color:rgba(16,185,129,.3);box-shadow:0 0 18px rgba(16,185,129,.2);}
-    .led{width:7px;height:7px;border-radius:50%;background:var(--danger);box-shadow:0 0 8px var(--danger)}
-    .sbadge.live .led{background:var(--success);box-shadow:0 0 8px var(--success);animation:lp 1.5s ease-in-out infinite}
-    @keyframes lp{0%,100%{opacity:1;transform:scale(1)}50%{opacity:.4;transform:scale(.8)}}
-    .stitle{font-size:10px;font-weight:600;letter-spacing:2px;text-transform:uppercase;color:var(--muted);display:flex;align-items:center;justify-content:space-between;margin-bottom:14px;}
-    .stitle::before{content:'';display:inline-block;width:3px;height:12px;border-radius:2px;background:var(--gp);margin-right:8px;box-shadow:0 0 8px var(--glp);}
-    .stat-row{display:grid;grid-template-columns:1fr 1fr;gap:8px;margin-bottom:12px}
-    .stat-box{background:rgba(255,255,255,.03);border:1px solid var(--glass-b);border-radius:12px;padding:12px;text-align:center;transition:transform .2s,border-color .2s;}
-    .stat-box:hover{transform:translateY(-2px);border-color:rgba(124,58,237,.3)}
-    .stat-val{font-size:20px;font-weight:700;background:var(--gp);-webkit-background-clip:text;-webkit-text-fill-color:transparent;background-clip:text;animation:sh 3s ease-in-out infinite;}
-    @keyframes sh{0%,100%{filter:brightness(1)}50%{filter:brightness(1.4)}}
-    .stat-lbl{font-size:9px;color:var(--muted);text-transform:uppercase;letter-spacing:1.5px;margin-top:4px}
-    .titem{margin-bottom:10px}
-    .thdr{display:flex;justify-content:space-between;font-size:10px;color:var(--muted);margin-bottom:4px;letter-spacing:1px}
-    .ttrack{height:5px;background:rgba(255,255,255,.06);border-radius:3px;overflow:hidden}
-    .tbar{height:100%;border-radius:3px;background:var(--gp);box-shadow:0 0 8px var(--glp);transition:width .8s cubic-bezier(.4,0,.2,1)}
-    .cgrp{margin-bottom:16px}
-    .clbl{display:flex;justify-content:space-between;align-items:center;font-size:10px;color:var(--muted);margin-bottom:8px;letter-spacing:1.5px}
-    .cval{font-family:'Consolas','Courier New',monospace;font-size:13px;font-weight:600;background:var(--gp);-webkit-background-clip:text;-webkit-text-fill-color:transparent;background-clip:text}
-    input[type=range]{-webkit-appearance:none;width:100%;background:transparent;cursor:pointer}
-    input[type=range]::-webkit-slider-runnable-track{height:5px;border-radius:3px;background:linear-gradient(90deg,rgba(124,58,237,.5),rgba(6,182,212,.5))}
-    input[type=range]::-webkit-slider-thumb{-webkit-appearance:none;width:18px;height:18px;border-radius:50%;background:#fff;margin-top:-6.5px;box-shadow:0 0 12px var(--glp);transition:transform .15s,box-shadow .15s}
-    input[type=range]:hover::-webkit-slider-thumb{transform:scale(1.25);box-shadow:0 0 22px var(--glc)}
-    .rpanel{background:rgba(0,0,0,.2);border:1px solid var(--glass-b);border-radius:12px;padding:14px}
-    .rlbl{font-size:9px;color:var(--muted);letter-spacing:2px;text-transform:uppercase;margin-bottom:10px}
-    .btn-m{width:100%;padding:13px;background:var(--gp);border:none;border-radius:10px;color:#fff;font-family:'Space Grotesk',sans-serif;font-size:11px;font-weight:700;letter-spacing:2px;text-transform:uppercase;cursor:pointer;box-shadow:0 0 22px var(--glp),0 4px 15px rgba(0,0,0,.3);transition:transform .15s,box-shadow .15s,filter .15s;position:relative;overflow:hidden;}
-    .btn-m::after{content:'';position:absolute;inset:0;border-radius:inherit;background:linear-gradient(135deg,rgba(255,255,255,.15),transparent);pointer-events:none}
-    .btn-m:hover{transform:translateY(-2px);box-shadow:0 0 38px var(--glp),0 8px 20px rgba(0,0,0,.4)}
-    .btn-m:active{transform:scale(.97);filter:brightness(.9)}
-    .sw-row{display:flex;justify-content:space-between;align-items:center;margin-top:12px}
-    .sw-lbl{font-size:10px;color:var(--muted);letter-spacing:1px}
-    .sw{position:relative;width:46px;height:26px}
-    .sw input{opacity:0;width:0;height:0}
-    .tog{position:absolute;inset:0;cursor:pointer;background:rgba(255,255,255,.08);border-radius:26px;border:1px solid var(--glass-b);transition:background .3s,box-shadow .3s}
-    .tog::before{content:'';position:absolute;width:20px;height:20px;left:2px;top:2px;background:#fff;border-radius:50%;transition:transform .3s,box-shadow .3s}
-    input:checked+.tog{background:linear-gradient(135deg,rgba(124,58,237,.6),rgba(6,182,212,.6));border-color:rgba(124,58,237,.5);box-shadow:0 0 14px var(--glp)}
-    input:checked+.tog::before{transform:translateX(20px);box-shadow:0 0 8px var(--glc)}
-    .gpio-sw-card{background:rgba(0,0,0,.18);border:1px solid var(--glass-b);border-radius:12px;padding:14px;margin-top:14px;}
-    .gpio-sw-row{display:flex;justify-content:space-between;align-items:center;padding:8px 0;border-bottom:1px solid rgba(255,255,255,.04);}
-    .gpio-sw-row:last-child{border-bottom:none;}
-    .gpio-sw-info{display:flex;flex-direction:column;gap:3px;}
-    .gpio-sw-name{font-size:11px;font-weight:600;color:var(--text);letter-spacing:.5px;}
-    .gpio-sw-pin{font-size:9px;color:var(--muted);letter-spacing:1.5px;text-transform:uppercase;font-family:'Consolas','Courier New',monospace;}
-    .gpio-sw-state{font-size:9px;font-weight:700;padding:2px 7px;border-radius:999px;letter-spacing:1px;transition:all .3s;}
-    .gpio-sw-state.on{background:rgba(16,185,129,.15);color:var(--success);border:1px solid rgba(16,185,129,.3);}
-    .gpio-sw-state.off{background:rgba(239,68,68,.1);color:var(--danger);border:1px solid rgba(239,68,68,.2);}
-    .cam-wrap{flex:1;min-height:0;background:#000;border-radius:10px;overflow:hidden;position:relative;border:1px solid var(--glass-b)}
-    .cam-wrap img{width:100%;height:100%;object-fit:contain;display:block}
-    .cam-hud{position:absolute;top:10px;right:10px;display:flex;align-items:center;gap:8px}
-    .cam-st{display:flex;align-items:center;gap:6px;background:rgba(0,0,0,.6);backdrop-filter:blur(8px);padding:5px 12px;border-radius:20px;font-size:10px;font-weight:700;letter-spacing:1px;border:1px solid rgba(255,255,255,.1)}
-    .cam-dot{width:7px;height:7px;border-radius:50%;background:var(--success);box-shadow:0 0 8px var(--success);animation:lp 1.5s infinite}
-    .cam-err .cam-dot{background:var(--danger);box-shadow:0 0 8px var(--danger);animation:none}
-    .btn-rc{background:rgba(124,58,237,.2);border:1px solid rgba(124,58,237,.4);color:#a78bfa;padding:5px 12px;border-radius:8px;font-size:10px;font-weight:600;letter-spacing:1px;cursor:pointer;backdrop-filter:blur(8px);transition:background .2s,box-shadow .2s}
-    .btn-rc:hover{background:rgba(124,58,237,.4);box-shadow:0 0 12px var(--glp)}
-    .console{font-family:'Consolas','Courier New',monospace;font-size:11px;background:rgba(0,0,0,.45);border:1px solid rgba(255,255,255,.06);border-radius:10px;padding:10px;flex:1;overflow-y:auto;display:flex;flex-direction:column;gap:3px}
-    .console::-webkit-scrollbar{width:4px}
-    .console::-webkit-scrollbar-track{background:transparent}
-    .console::-webkit-scrollbar-thumb{background:rgba(124,58,237,.4);border-radius:2px}
-    .log-entry{display:flex;gap:8px;opacity:.85;align-items:baseline;line-height:1.5}
-    .log-entry:hover{opacity:1}
-    .ts{color:#445566;min-width:56px;font-size:10px}
-    .tag{font-weight:700;border-radius:4px;padding:1px 5px;min-width:40px;text-align:center;font-size:9px;letter-spacing:1px}
-    .tag-ESP32{background:rgba(59,130,246,.15);color:#60a5fa;border:1px solid rgba(59,130,246,.2)}
-    .tag-PI{background:rgba(167,139,250,.15);color:#a78bfa;border:1px solid rgba(167,139,250,.2)}
-    .tag-RC{background:rgba(52,211,153,.15);color:#34d399;border:1px solid rgba(52,211,153,.2)}
-    .tag-SYS{background:rgba(251,146,60,.15);color:#fb923c;border:1px solid rgba(251,146,60,.2)}
-    .tag-GPIO{background:rgba(245,158,11,.15);color:#fbbf24;border:1px solid rgba(245,158,11,.2)}
-    .fbar{display:flex;gap:6px;flex-wrap:wrap;margin-top:10px}
-    .chip{display:flex;align-items:center;gap:5px;padding:4px 10px;border-radius:999px;cursor:pointer;font-size:10px;font-weight:600;letter-spacing:1px;background:rgba(255,255,255,.05);border:1px solid var(--glass-b);color:var(--muted);transition:all .2s;user-select:none}
-    .chip:hover{background:rgba(124,58,237,.15);border-color:rgba(124,58,237,.3);color:#a78bfa}
-    .chip input{display:none}
-    .cdot{width:6px;height:6px;border-radius:50%}
-    @media(max-width:1100px){
-      .wrap{grid-template-columns:240px 1fr;grid-template-rows:auto 1fr 1fr;height:auto;overflow:auto}
-      .header{grid-column:1/-1}
-      .col-r{grid-column:1/-1}
-    }
-    @media(max-width:700px){.wrap{grid-template-columns:1fr}}
-  </style>
-</head>
-<body>
-<div class="wrap">
-  <div class="card header">
-    <div class="brand">
-      <div class="brand-icon">&#x1F916;</div>
-      <div>
-        <div class="brand-name">BlackFin COMMAND CENTER</div>
-        <div class="brand-sub">Underwater Systems Interface &#xB7; v2.0</div>
-      </div>
-    </div>
-    <div class="hdr-right">
-      <div class="sys-time" id="sys-time">--:--:--</div>
-      <div id="link-badge" class="sbadge lost">
-        <span class="led"></span>
-        <span id="link-txt">SIGNAL LOST</span>
-      </div>
-    </div>
-  </div>
-
-  <div style="display:flex;flex-direction:column;gap:12px;overflow-y:auto;min-height:0;">
-    <div class="card">
-      <div class="stitle">Link Telemetry</div>
-      <div class="stat-row">
-        <div class="stat-box"><div id="stat-rc" class="stat-val">--</div><div class="stat-lbl">Last Packet</div></div>
-        <div class="stat-box"><div id="stat-pps" class="stat-val">0</div><div class="stat-lbl">Packets/Sec</div></div>
-      </div>
-      <div class="titem">
-        <div class="thdr"><span>Signal Strength</span><span id="sig-pct">0%</span></div>
-        <div class="ttrack"><div class="tbar" id="sig-bar" style="width:0%"></div></div>
-      </div>
-    </div>
-    <div class="card" style="flex:1">
-      <div class="stitle">Hardware Control</div>
-      <div class="cgrp">
-        <div class="clbl"><span>SERVO 1 (GPIO 12)</span><span id="val-s1" class="cval">90&deg;</span></div>
-        <input type="range" min="0" max="180" value="90" oninput="updateServo(1,this.value)">
-      </div>
-      <div class="cgrp">
-        <div class="clbl"><span>SERVO 2 (GPIO 13)</span><span id="val-s2" class="cval">90&deg;</span></div>
-        <input type="range" min="0" max="180" value="90" oninput="updateServo(2,this.value)">
-      </div>
-      <div class="rpanel">
-        <div class="rlbl">Auxiliary Relay &middot; GPIO 26</div>
-        <button class="btn-m" onmousedown="momentary(true)" onmouseup="momentary(false)" onmouseleave="momentary(false)">
-          &#x26A1; Hold to Activate
-        </button>
-        <div class="sw-row">
-          <span class="sw-lbl">Auto-Blink Mode</span>
-          <label class="sw">
-            <input type="checkbox" id="chk-blink" onchange="toggleBlink(this.checked)">
-            <span class="tog"></span>
-          </label>
-        </div>
-      </div>
-      <div class="gpio-sw-card">
-        <div class="rlbl" style="margin-bottom:6px;">&#x1F50C; GPIO Switches</div>
-        <div class="gpio-sw-row">
-          <div class="gpio-sw-info">
-            <span class="gpio-sw-name">Switch 1</span>
-            <span class="gpio-sw-pin">GPIO 17</span>
-          </div>
-          <div style="display:flex;align-items:center;gap:10px;">
-            <span id="sw-state-1" class="gpio-sw-state off">OFF</span>
-            <label class="sw">
-              <input type="checkbox" id="chk-sw1" onchange="toggleGpioSwitch(1, this.checked)">
-              <span class="tog"></span>
-            </label>
-          </div>
-        </div>
-        <div class="gpio-sw-row">
-          <div class="gpio-sw-info">
-            <span class="gpio-sw-name">Switch 2</span>
-            <span class="gpio-sw-pin">GPIO 27</span>
-          </div>
-          <div style="display:flex;align-items:center;gap:10px;">
-            <span id="sw-state-2" class="gpio-sw-state off">OFF</span>
-            <label class="sw">
-              <input type="checkbox" id="chk-sw2" onchange="toggleGpioSwitch(2, this.checked)">
-              <span class="tog"></span>
-            </label>
-          </div>
-        </div>
-        <div class="gpio-sw-row">
-          <div class="gpio-sw-info">
-            <span class="gpio-sw-name">Switch 3</span>
-            <span class="gpio-sw-pin">GPIO 22</span>
-          </div>
-          <div style="display:flex;align-items:center;gap:10px;">
-            <span id="sw-state-3" class="gpio-sw-state off">OFF</span>
-            <label class="sw">
-              <input type="checkbox" id="chk-sw3" onchange="toggleGpioSwitch(3, this.checked)">
-              <span class="tog"></span>
-            </label>
-          </div>
-        </div>
-      </div>
-    </div>
-  </div>
-
-  <div class="card" style="overflow:hidden;">
-    <div class="stitle">
-      Live Camera Feed
-      <button class="btn-rc" onclick="reconnectCam()">&#x21BB; RECONNECT</button>
-    </div>
-    <div class="cam-wrap">
-      <img id="cam-img" src="{{ video_url }}" alt="Camera feed" onerror="camError()" onload="camOk()" />
-      <div class="cam-hud">
-        <div id="cam-status-bar" class="cam-st">
-          <div class="cam-dot" id="cam-dot"></div>
-          <span id="cam-status-txt">LIVE</span>
-        </div>
-      </div>
-    </div>
-  </div>
-
-  <div class="card col-r" style="overflow:hidden;">
-    <div class="stitle">
-      System Logs
-      <button onclick="clearLogs()" style="background:none;border:none;color:var(--muted);cursor:pointer;font-size:10px;letter-spacing:1px;">&#x2715; CLEAR</button>
-    </div>
-    <div id="console" class="console"></div>
-    <div class="fbar">
-      <label class="chip"><input type="checkbox" checked onchange="toggleSrc('ESP32')" id="f-ESP32"><span class="cdot" style="background:#60a5fa"></span>ESP32</label>
-      <label class="chip"><input type="checkbox" checked onchange="toggleSrc('PI')" id="f-PI"><span class="cdot" style="background:#a78bfa"></span>PI</label>
-      <label class="chip"><input type="checkbox" checked onchange="toggleSrc('RC')" id="f-RC"><span class="cdot" style="background:#34d399"></span>RC</label>
-      <label class="chip"><input type="checkbox" checked onchange="toggleSrc('SYS')" id="f-SYS"><span class="cdot" style="background:#fb923c"></span>SYS</label>
-      <label class="chip"><input type="checkbox" checked onchange="toggleSrc('GPIO')" id="f-GPIO"><span class="cdot" style="background:#fbbf24"></span>GPIO</label>
-    </div>
-  </div>
-</div>
-<script>
-  let lastId = 0;
-  const filterState = { ESP32: true, PI: true, RC: true, SYS: true, GPIO: true };
-  let lastPktCount = 0, lastTime = Date.now();
-
-  function tickClock() {
-    document.getElementById('sys-time').innerText = new Date().toLocaleTimeString('en-US',{hour12:false});
-  }
-  setInterval(tickClock, 1000); tickClock();
-
-  async function refreshStatus() {
-    try {
-      const r = await fetch('/api/status');
-      const s = await r.json();
-      const badge = document.getElementById('link-badge');
-      const txt = document.getElementById('link-txt');
-      if (s.link_alive) { badge.className='sbadge live'; txt.innerText='LINK ACTIVE'; }
-      else { badge.className='sbadge lost'; txt.innerText='SIGNAL LOST'; }
-      document.getElementById('stat-rc').innerText = s.last_rc_age_sec < 900 ? s.last_rc_age_sec.toFixed(2)+'s' : '--';
-      const now = Date.now();
-      if (now - lastTime > 1000) {
-        const pps = Math.round((s.packets_rx - lastPktCount)*1000/(now-lastTime));
-        const safe = pps > 0 ? pps : 0;
-        document.getElementById('stat-pps').innerText = safe;
-        const pct = Math.min(100, Math.round(safe/60*100));
-        document.getElementById('sig-bar').style.width = pct+'%';
-        document.getElementById('sig-pct').innerText = pct+'%';
-        lastPktCount = s.packets_rx; lastTime = now;
-      }
-    } catch(e) {}
-  }
-
-  async function refreshLogs() {
-    try {
-      const r = await fetch('/api/logs?since='+lastId);
-      const data = await r.json();
-      const box = document.getElementById('console');
-      const atBottom = box.scrollHeight - box.scrollTop <= box.clientHeight + 5;
-      data.logs.forEach(item => {
-        lastId = item.id;
-        const row = document.createElement('div');
-        row.className = 'log-entry row-'+item.src;
-        let color = '#94a3b8';
-        if (item.msg.includes('ERR')||item.msg.includes('FAIL')) color = '#f87171';
-        else if (item.msg.includes('WARN')) color = '#fbbf24';
-        else if (item.msg.includes('OK')||item.msg.includes('open')) color = '#4ade80';
-        row.innerHTML = '<span class="ts">'+item.ts+'</span><span class="tag tag-'+item.src+'">'+item.src+'</span><span style="color:'+color+';flex:1">'+item.msg+'</span>';
-        if (!filterState[item.src] && filterState[item.src] !== undefined) row.style.display = 'none';
-        box.appendChild(row);
-      });
-      while (box.children.length > 200) box.removeChild(box.firstChild);
-      if (atBottom && data.logs.length > 0) box.scrollTop = box.scrollHeight;
-    } catch(e) {}
-  }
-
-  function toggleSrc(src) {
-    filterState[src] = document.getElementById('f-'+src).checked;
-    document.querySelectorAll('.row-'+src).forEach(r => r.style.display = filterState[src] ? 'flex' : 'none');
-  }
-  function updateServo(id, val) {
-    document.getElementById('val-s'+id).innerText = val+'°';
-    fetch('/api/servo/'+id, {method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({angle:parseInt(val)})});
-  }
-  function momentary(active) {
-    fetch('/api/gpio/momentary', {method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({active})});
-  }
-  function toggleBlink(active) {
-    fetch('/api/gpio/blink', {method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({active})});
-  }
-  function toggleGpioSwitch(id, active) {
-    fetch('/api/gpio/switch/'+id, {method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({active})})
-      .then(r=>r.json()).then(d=>{
-        const el = document.getElementById('sw-state-'+id);
-        if (el) {
-          el.textContent = d.state ? 'ON' : 'OFF';
-          el.className = 'gpio-sw-state ' + (d.state ? 'on' : 'off');
-        }
-      }).catch(()=>{});
-  }
-  function clearLogs() { document.getElementById('console').innerHTML = ''; }
-
-  function camOk() {
-    const bar=document.getElementById('cam-status-bar'),dot=document.getElementById('cam-dot'),txt=document.getElementById('cam-status-txt');
-    bar.classList.remove('cam-err');
-    dot.style.background='var(--success)'; dot.style.boxShadow='0 0 8px var(--success)'; dot.style.animation='lp 1.5s infinite';
-    txt.innerText='LIVE';
-  }
-  function camError() {
-    const bar=document.getElementById('cam-status-bar'),dot=document.getElementById('cam-dot'),txt=document.getElementById('cam-status-txt');
-    bar.classList.add('cam-err');
-    dot.style.background='var(--danger)'; dot.style.boxShadow='0 0 8px var(--danger)'; dot.style.animation='none';
-    txt.innerText='OFFLINE';
-  }
-  function reconnectCam() {
-    const img = document.getElementById('cam-img');
-    img.src = img.src.split('?')[0]+'?t='+Date.now();
-  }
-
-  setInterval(refreshStatus, 500);
-  setInterval(refreshLogs, 500);
-  refreshStatus(); refreshLogs();
-</script>
-</body>
-</html>
-"""
+# Dashboard page, stylesheet and script live in static/ next to this file
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+ASSET_MAX_AGE = 365 * 24 * 3600   # Versioned CSS/JS URLs never change content
 
 # ── iBUS parsing (same protocol as pc_rc_sender.py) ─────────────────────────
 IBUS_FRAME_LEN = 32
@@ -431,69 +107,960 @@ def parse_ibus_frame(frame: bytes):
         return None
     return [struct.unpack_from("<H", frame, 2 + 2 * i)[0] for i in range(14)]
 
+def build_ibus_frame(channels) -> bytes:
+    """14 channel values → 32-byte iBUS frame with header and checksum."""
+    body = IBUS_HEADER + struct.pack("<14H", *channels)
+    return body + struct.pack("<H", (0xFFFF - (sum(body) & 0xFFFF)) & 0xFFFF)
+
+# ── Pi-side RC failsafe ─────────────────────────────────────────────────────
+# rcNorm() on the ESP32 maps 1500 to 0: no thrust, servos centred, CH6 in
+# DEPTH_STAB (what the ESP32's own failsafe forces) and CH8 between the arm
+# and disarm thresholds, so the arm state is left as it was.
+FAILSAFE_NEUTRAL = (1500,) * 14
+RC_CHANNEL_MIN = 1000
+RC_CHANNEL_MAX = 2000
+
+@dataclass(frozen=True)
+class FailsafeProfile:
+    """Channel values the bridge sends after RC loss, with the frame prebuilt."""
+    channels: tuple = FAILSAFE_NEUTRAL
+    frame: bytes = build_ibus_frame(FAILSAFE_NEUTRAL)
+
+def make_failsafe_profile(channels) -> FailsafeProfile:
+    """Validate 14 channel values (RC_CHANNEL_MIN..RC_CHANNEL_MAX); raises ValueError."""
+    channels = tuple(int(v) for v in channels)
+    if len(channels) != 14:
+        raise ValueError("failsafe profile needs 14 channels")
+    if not all(RC_CHANNEL_MIN <= v <= RC_CHANNEL_MAX for v in channels):
+        raise ValueError(f"failsafe channels must be {RC_CHANNEL_MIN}..{RC_CHANNEL_MAX}")
+    return FailsafeProfile(channels, build_ibus_frame(channels))
+
+# ── RC datagram envelope (same layout as pc_rc_sender.py --envelope) ────────
+# magic "RV", version, flags, session id, sequence number, sender monotonic µs,
+# then the 32-byte iBUS frame. Bare 32-byte frames are still accepted.
+ENVELOPE_MAGIC = b"RV"
+ENVELOPE_VERSION = 1
+ENVELOPE_HEADER = struct.Struct("<2sBBIIQ")
+ENVELOPE_LEN = ENVELOPE_HEADER.size + IBUS_FRAME_LEN
+
+def unpack_rc_datagram(data: bytes):
+    """Split a UDP payload into (session, seq, sender_ts_us, frame).
+
+    Bare 32-byte payloads return (None, None, None, data); anything else that
+    is not a current-version envelope returns None.
+    """
+    if len(data) == IBUS_FRAME_LEN:
+        return None, None, None, data
+    if len(data) != ENVELOPE_LEN or data[:2] != ENVELOPE_MAGIC:
+        return None
+    _, version, _flags, session, seq, ts_us = ENVELOPE_HEADER.unpack_from(data)
+    if version != ENVELOPE_VERSION:
+        return None
+    return session, seq, ts_us, data[ENVELOPE_HEADER.size:]
+
+def _percentiles(values, pcts=(50, 90, 99)) -> dict:
+    if not values:
+        return {f"p{p}": None for p in pcts}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {f"p{p}": round(ordered[min(last, int(last * p / 100.0 + 0.5))], 3) for p in pcts}
+
+def parse_listen_addr(spec: str, default_port: int):
+    """Parse an --extra-listen spec "[IP:]PORT" or "IP" into (ip, port)."""
+    ip, sep, port = spec.rpartition(":")
+    if not sep:
+        if spec.isdigit():
+            return "0.0.0.0", int(spec)
+        return spec, default_port
+    return ip or "0.0.0.0", int(port)
+
 def now_ts() -> str:
     return time.strftime("%H:%M:%S")
 
-def check_ethernet_up(interface: str) -> bool:
+LINK_COUNTERS = ("rx_errors", "tx_errors", "rx_dropped", "tx_dropped")
+LINK_REFRESH_SEC = 1.0     # sysfs re-read for the counters (transitions arrive via netlink)
+LINK_EVENTS_MAX = 20       # Up/down transitions kept for /api/status
+
+def _read_sysfs(path: str) -> Optional[str]:
+    # Attributes such as speed/carrier raise EINVAL while the link is down
     try:
-        result = subprocess.run(
-            ["ip", "-brief", "link", "show", interface],
-            check=False,
-            capture_output=True,
-            text=True,
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def read_link_state(interface: str) -> dict:
+    """Current link attributes of `interface` from /sys/class/net (no subprocess)."""
+    base = f"/sys/class/net/{interface}"
+    operstate = _read_sysfs(f"{base}/operstate") or "missing"
+    carrier = _read_sysfs(f"{base}/carrier")
+    speed = _read_sysfs(f"{base}/speed")
+    state = {
+        "operstate": operstate,
+        "up": operstate == "up",     # Same as the UP column of `ip -brief link`
+        "carrier": carrier == "1" if carrier is not None else None,
+        # Some drivers report -1 (or 2^32-1) for an unknown speed
+        "speed_mbps": int(speed) if speed and speed.lstrip("-").isdigit() and 0 < int(speed) < 0xFFFFFFFF else None,
+        "duplex": _read_sysfs(f"{base}/duplex"),
+    }
+    for name in LINK_COUNTERS:
+        value = _read_sysfs(f"{base}/statistics/{name}")
+        state[name] = int(value) if value is not None else None
+    return state
+
+# ─── TELEMETRY ──────────────────────────────────────────────────────────────
+TELEMETRY_LOG_SEC = 10.0   # Interval of the SYS summary line in the dashboard log
+# TelemetrySample fields recorded as time series
+TELEMETRY_METRICS = ("cpu_temp_c", "cpu_pct", "load_1m", "mem_used_pct", "core_volts", "net_rx_bps", "net_tx_bps")
+
+def decode_throttled(value: Optional[int]) -> str:
+    """Human-readable state of the firmware get_throttled bitmask."""
+    if value is None:
+        return "Unknown"
+    if value & 0xF == 0:
+        return "OK"
+    msgs = []
+    if value & 0x1: msgs.append("Under-voltage")
+    if value & 0x2: msgs.append("Freq-capped")
+    if value & 0x4: msgs.append("Throttled")
+    if value & 0x8: msgs.append("Soft-temp-limit")
+    return ", ".join(msgs)
+
+class _KernelFile:
+    """A procfs/sysfs file kept open and re-read with pread() at offset 0."""
+
+    def __init__(self, path: str):
+        self.fd: Optional[int] = None
+        with suppress(OSError):
+            self.fd = os.open(path, os.O_RDONLY)
+
+    def read(self) -> Optional[bytes]:
+        if self.fd is None:
+            return None
+        try:
+            return os.pread(self.fd, 16384, 0)
+        except OSError:
+            return None
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+class VcMailbox:
+    """Property requests to the VideoCore firmware through /dev/vcio.
+
+    These are the values vcgencmd asks the firmware for, without a fork per
+    reading. Raises OSError from the constructor when /dev/vcio is absent.
+    """
+    TAG_GET_VOLTAGE = 0x00030003
+    TAG_GET_THROTTLED = 0x00030046
+    VOLTAGE_CORE = 1
+    REQUEST_OK = 0x80000000
+    # _IOWR(100, 0, char *)
+    IOCTL_PROPERTY = (3 << 30) | (ctypes.sizeof(ctypes.c_void_p) << 16) | (100 << 8)
+
+    def __init__(self, path: str = "/dev/vcio"):
+        self.fd = os.open(path, os.O_RDWR)
+
+    def _property(self, tag: int, values: list) -> tuple:
+        # [size, request code, tag, value buffer size, tag request code, values..., end tag]
+        words = [0, 0, tag, 4 * len(values), 0, *values, 0]
+        words[0] = 4 * len(words)
+        buf = bytearray(struct.pack(f"<{len(words)}I", *words))
+        fcntl.ioctl(self.fd, self.IOCTL_PROPERTY, buf, True)
+        reply = struct.unpack(f"<{len(words)}I", buf)
+        if reply[1] != self.REQUEST_OK:
+            raise OSError(errno.EIO, f"mailbox tag {tag:#x} failed")
+        return reply[5:5 + len(values)]
+
+    def throttled(self) -> int:
+        return self._property(self.TAG_GET_THROTTLED, [0])[0]
+
+    def core_volts(self) -> float:
+        return self._property(self.TAG_GET_VOLTAGE, [self.VOLTAGE_CORE, 0])[1] / 1e6
+
+    def close(self):
+        os.close(self.fd)
+
+@dataclass(frozen=True)
+class TelemetrySample:
+    """One reading of the Pi's health. None means the source is not available."""
+    time: float = 0.0                       # time.time() of the sample
+    cpu_temp_c: Optional[float] = None
+    cpu_pct: Optional[float] = None         # Busy share of all CPUs since the previous sample
+    load_1m: Optional[float] = None
+    mem_total_kb: Optional[int] = None
+    mem_available_kb: Optional[int] = None
+    mem_used_pct: Optional[float] = None
+    core_volts: Optional[float] = None
+    throttled: Optional[int] = None         # Firmware get_throttled bitmask
+    net_rx_bps: Optional[float] = None      # Bytes/s on the Ethernet interface
+    net_tx_bps: Optional[float] = None
+
+class TelemetryCollector:
+    """Reads Pi telemetry straight from sysfs, procfs and the firmware mailbox.
+
+    Sources stay open between samples, so a sample is a handful of pread()
+    calls (plus two ioctls on a Pi) instead of four forked processes.
+    Rates (CPU %, network bytes/s) are computed against the previous sample.
+    """
+
+    def __init__(self, interface: str = "eth0"):
+        self.interface = interface
+        self.thermal = _KernelFile("/sys/class/thermal/thermal_zone0/temp")
+        self.meminfo = _KernelFile("/proc/meminfo")
+        self.stat = _KernelFile("/proc/stat")
+        self.loadavg = _KernelFile("/proc/loadavg")
+        self.netdev = _KernelFile("/proc/net/dev")
+        self.throttled_file = _KernelFile("/sys/devices/platform/soc/soc:firmware/get_throttled")
+        try:
+            self.mailbox: Optional[VcMailbox] = VcMailbox()
+        except OSError:
+            self.mailbox = None
+        self._cpu_prev: Optional[tuple] = None
+        self._net_prev: Optional[tuple] = None
+
+    def sample(self) -> TelemetrySample:
+        now = time.monotonic()
+        mem_total, mem_avail = self._meminfo()
+        volts = throttled = None
+        if self.mailbox is not None:
+            with suppress(OSError):
+                volts = self.mailbox.core_volts()
+            with suppress(OSError):
+                throttled = self.mailbox.throttled()
+        if throttled is None:
+            raw = self.throttled_file.read()
+            if raw:
+                throttled = int(raw, 16)
+        raw = self.thermal.read()
+        raw_load = self.loadavg.read()
+        net_rx, net_tx = self._net_rates(now)
+        return TelemetrySample(
+            time=time.time(),
+            cpu_temp_c=int(raw) / 1000.0 if raw else None,
+            cpu_pct=self._cpu_pct(),
+            load_1m=float(raw_load.split()[0]) if raw_load else None,
+            mem_total_kb=mem_total,
+            mem_available_kb=mem_avail,
+            mem_used_pct=round(100.0 * (mem_total - mem_avail) / mem_total, 1) if mem_total and mem_avail is not None else None,
+            core_volts=volts,
+            throttled=throttled,
+            net_rx_bps=net_rx,
+            net_tx_bps=net_tx,
         )
-        if result.returncode != 0:
+
+    def _meminfo(self):
+        raw = self.meminfo.read()
+        total = avail = None
+        if raw:
+            for line in raw.split(b"\n"):
+                if line.startswith(b"MemTotal:"):
+                    total = int(line.split()[1])
+                elif line.startswith(b"MemAvailable:"):
+                    avail = int(line.split()[1])
+                    break
+        return total, avail
+
+    def _cpu_pct(self) -> Optional[float]:
+        raw = self.stat.read()
+        if not raw:
+            return None
+        # cpu  user nice system idle iowait irq softirq steal ...
+        fields = [int(v) for v in raw[:raw.index(b"\n")].split()[1:9]]
+        total, idle = sum(fields), fields[3] + fields[4]
+        prev, self._cpu_prev = self._cpu_prev, (total, idle)
+        if prev is None or total == prev[0]:
+            return None
+        return round(100.0 * (1.0 - (idle - prev[1]) / (total - prev[0])), 1)
+
+    def _net_rates(self, now: float):
+        raw = self.netdev.read()
+        if not raw:
+            return None, None
+        prefix = self.interface.encode() + b":"
+        for line in raw.split(b"\n")[2:]:
+            name, _, counters = line.strip().partition(b":")
+            if name + b":" != prefix:
+                continue
+            values = counters.split()
+            rx, tx = int(values[0]), int(values[8])
+            prev, self._net_prev = self._net_prev, (now, rx, tx)
+            if prev is None or now <= prev[0]:
+                return None, None
+            dt = now - prev[0]
+            return round((rx - prev[1]) / dt, 1), round((tx - prev[2]) / dt, 1)
+        return None, None
+
+    def close(self):
+        for f in (self.thermal, self.meminfo, self.stat, self.loadavg, self.netdev, self.throttled_file):
+            f.close()
+        if self.mailbox is not None:
+            self.mailbox.close()
+
+def _note_missing(missing: "collections.OrderedDict[int, None]", seq: int, gap: int, cap: int):
+    """Remember the gap - 1 sequence numbers skipped before seq (at most cap, oldest first)."""
+    for back in range(min(gap - 1, cap), 0, -1):
+        missing[(seq - back) % RcLinkStats.SEQ_MOD] = None
+    while len(missing) > cap:
+        missing.popitem(last=False)
+
+
+class RcPathStats:
+    """Arrival accounting for one receive path (link) of a redundant RC stream."""
+
+    def __init__(self, window: int):
+        self.arrivals = 0
+        self.wins = 0                 # Copies that arrived first and went to the UART
+        self.lost = 0                 # Gaps in this path's own sequence stream
+        self.highest_seq = None
+        self.missing: "collections.OrderedDict[int, None]" = collections.OrderedDict()
+        self.lag_us: Deque[int] = collections.deque(maxlen=window)   # Behind the winning copy
+        self.last_arrival = 0.0
+
+    def on_arrival(self, seq: int, lag_us: int, won: bool):
+        self.arrivals += 1
+        self.last_arrival = time.monotonic()
+        if won:
+            self.wins += 1
+        self.lag_us.append(lag_us)
+        if self.highest_seq is not None:
+            gap = (seq - self.highest_seq) % RcLinkStats.SEQ_MOD
+            if 0 < gap < RcLinkStats.SEQ_MOD // 2:
+                self.lost += gap - 1
+                _note_missing(self.missing, seq, gap, RcLinkStats.RECENT_SEQS)
+            else:
+                # Late on this path: it fills a gap counted as lost
+                if seq in self.missing:
+                    del self.missing[seq]
+                    self.lost -= 1
+                return
+        self.highest_seq = seq
+
+    def snapshot(self) -> dict:
+        return {
+            "arrivals": self.arrivals,
+            "wins": self.wins,
+            "win_pct": round(100.0 * self.wins / self.arrivals, 1) if self.arrivals else 0.0,
+            "lost": self.lost,
+            "lag_ms": _percentiles([lag / 1000.0 for lag in self.lag_us]),
+            "last_arrival": self.last_arrival if self.arrivals else None,
+        }
+
+
+class RcLinkStats:
+    """Loss, reordering and one-way delay accounting for enveloped RC datagrams.
+
+    Sequence numbers are compared with 32-bit serial arithmetic; anything at
+    or behind the newest accepted number is a duplicate or late reorder and
+    must not reach the UART. A late packet that fills one of the last
+    RECENT_SEQS gaps is taken back out of lost and counted as reordered, so
+    each sequence number is lost, reordered or accepted, never two of them;
+    anything older counts as a duplicate. PC and Pi clocks are unrelated, so
+    delay is reported relative to the fastest transit in the sample window
+    and jitter as the change in transit time between consecutive packets
+    (plus the RFC 3550 smoothed estimate).
+
+    With redundant links the same sequence number arrives once per path; the
+    first copy wins and later copies count as duplicates. Per-path stats show
+    which link wins and how far the others lag behind it.
+    """
+
+    SEQ_MOD = 1 << 32
+    RECENT_SEQS = 256   # Accepted and skipped seqs remembered to tell copies, reorders and losses apart
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self.session = None
+        self.highest_seq = None
+        self.accepted = 0
+        self.lost = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self.bare_frames = 0
+        self.malformed = 0
+        self.sessions = 0
+        self.recent: "collections.OrderedDict[int, int]" = collections.OrderedDict()
+        self.missing: "collections.OrderedDict[int, None]" = collections.OrderedDict()
+        self.paths: dict = {}
+        self.gaps: Deque[int] = collections.deque(maxlen=window)   # Seqs advanced per arrival; 0 for a late fill
+        self.gap_sum = 0
+        self.transit_us: Deque[int] = collections.deque(maxlen=window)
+        self.jitter_us: Deque[int] = collections.deque(maxlen=window)
+        self.last_transit = None
+        self.rfc3550_jitter_us = 0.0
+
+    def _reset_session(self, session: int):
+        self.session = session
+        self.highest_seq = None
+        self.recent.clear()
+        self.missing.clear()
+        self.paths.clear()
+        self.gaps.clear()
+        self.gap_sum = 0
+        self.transit_us.clear()
+        self.jitter_us.clear()
+        self.last_transit = None
+        self.rfc3550_jitter_us = 0.0
+        self.sessions += 1
+
+    def on_envelope(self, session: int, seq: int, sender_ts_us: int, recv_us: int,
+                    path: str = "") -> bool:
+        """Account one enveloped datagram. Returns False if it must be dropped."""
+        if session != self.session:
+            # Sender restarted: new sequence space and a new monotonic clock
+            self._reset_session(session)
+        path_stats = self.paths.get(path)
+        if path_stats is None:
+            path_stats = self.paths[path] = RcPathStats(self.window)
+
+        first_recv = self.recent.get(seq)
+        if first_recv is not None:
+            # Copy of a frame another path (or a network duplicate) already delivered
+            self.duplicates += 1
+            path_stats.on_arrival(seq, recv_us - first_recv, False)
             return False
-        return " UP " in f" {result.stdout.strip()} "
-    except Exception:
-        return False
+        if self.highest_seq is None:
+            gap = 1
+        else:
+            gap = (seq - self.highest_seq) % self.SEQ_MOD
+            if gap >= self.SEQ_MOD // 2:
+                if seq in self.missing:
+                    # Arrived after all: reordered, not lost
+                    del self.missing[seq]
+                    self.reordered += 1
+                    self.lost -= 1
+                    self._window_append(0)
+                else:
+                    # Delivered already, or skipped too long ago to tell
+                    self.duplicates += 1
+                path_stats.on_arrival(seq, 0, False)
+                return False
+        self.highest_seq = seq
+        self.recent[seq] = recv_us
+        if len(self.recent) > self.RECENT_SEQS:
+            self.recent.popitem(last=False)
+        path_stats.on_arrival(seq, 0, True)
+        self.accepted += 1
+        self.lost += gap - 1
+        _note_missing(self.missing, seq, gap, self.RECENT_SEQS)
+        self._window_append(gap)
+
+        transit = recv_us - sender_ts_us
+        if self.last_transit is not None:
+            d = abs(transit - self.last_transit)
+            self.jitter_us.append(d)
+            self.rfc3550_jitter_us += (d - self.rfc3550_jitter_us) / 16.0
+        self.last_transit = transit
+        self.transit_us.append(transit)
+        return True
+
+    def _window_append(self, gap: int):
+        if len(self.gaps) == self.gaps.maxlen:
+            self.gap_sum -= self.gaps[0]
+        self.gaps.append(gap)
+        self.gap_sum += gap
+
+    def snapshot(self) -> dict:
+        """JSON-ready summary for BridgeSnapshot.rc_link (bridge thread only)."""
+        base = min(self.transit_us) if self.transit_us else 0
+        delay_ms = [(t - base) / 1000.0 for t in self.transit_us]
+        jitter_ms = [j / 1000.0 for j in self.jitter_us]
+        # A late fill can outlive the gap it filled in the window
+        window_loss = max(0.0, 1.0 - len(self.gaps) / self.gap_sum) if self.gap_sum else 0.0
+        return {
+            "enveloped": self.accepted > 0,
+            "accepted": self.accepted,
+            "lost": self.lost,
+            "loss_pct": round(100.0 * window_loss, 2),
+            "duplicates": self.duplicates,
+            "reordered": self.reordered,
+            "bare_frames": self.bare_frames,
+            "malformed": self.malformed,
+            "sessions": self.sessions,
+            "delay_ms": _percentiles(delay_ms),
+            "jitter_ms": _percentiles(jitter_ms),
+            "rfc3550_jitter_ms": round(self.rfc3550_jitter_us / 1000.0, 3),
+            "paths": {name: ps.snapshot() for name, ps in self.paths.items()},
+        }
 
-# ─── TELEMETRY HELPERS ──────────────────────────────────────────────────────
-def get_pi_temp():
-    try:
-        r = subprocess.check_output(["vcgencmd", "measure_temp"]).decode()
-        return r.replace("temp=", "").strip()
-    except:
-        return "N/A"
+METRIC_RAW_CAP = 600        # Raw samples kept per metric (60 s at 10 Hz)
+METRIC_SEC_CAP = 1800       # 1 s rollups (30 min)
+METRIC_MIN_CAP = 1440       # 1 min rollups (24 h)
+METRIC_MAX_SERIES = 48      # Metric names accepted before new ones are ignored
+METRIC_MAX_POINTS = 5000    # Upper bound on points in one /api/metrics response
 
-def get_pi_volts():
-    try:
-        r = subprocess.check_output(["vcgencmd", "measure_volts"]).decode()
-        return r.replace("volt=", "").strip()
-    except:
-        return "N/A"
+def _wall_offset() -> float:
+    """Seconds to add to a time.monotonic() value to get Unix time as of now."""
+    return time.time() - time.monotonic()
 
-def get_ram_usage():
-    try:
-        r = subprocess.check_output(["free", "-h"]).decode().splitlines()[1]
-        # Parse 'Mem: Total Used Free ...'
-        parts = r.split()
-        return f"{parts[2]}/{parts[1]}"
-    except:
-        return "N/A"
-
-def get_throttled_state():
-    try:
-        r = subprocess.check_output(["vcgencmd", "get_throttled"]).decode()
-        val = int(r.split("=")[1], 16)
-        if val == 0: return "OK"
-        msgs = []
-        if val & 0x1: msgs.append("Under-voltage")
-        if val & 0x2: msgs.append("Freq-capped")
-        if val & 0x4: msgs.append("Throttled")
-        if val & 0x8: msgs.append("Soft-temp-limit")
-        return ", ".join(msgs)
-    except:
-        return "Unknown"
+class _RingColumns:
+    """Fixed-capacity columns of doubles, appended in time order ("t" first, monotonic)."""
 
-@dataclass
-class SharedState:
+    def __init__(self, capacity: int, names: tuple):
+        self.capacity = capacity
+        self.names = names
+        self.cols = [array.array("d", bytes(8 * capacity)) for _ in names]
+        self.count = 0             # Total rows ever appended
+
+    def append(self, *values):
+        i = self.count % self.capacity
+        for col, value in zip(self.cols, values):
+            col[i] = value
+        self.count += 1
+
+    def oldest(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        return self.cols[0][max(0, self.count - self.capacity) % self.capacity]
+
+    def columns_since(self, t_from: float) -> list:
+        """Copies of the columns for rows with t >= t_from, oldest first (binary search on t).
+
+        Array slices only, so this is cheap enough to run under MetricsStore.lock.
+        """
+        cap, t = self.capacity, self.cols[0]
+        lo, hi = max(0, self.count - cap), self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if t[mid % cap] < t_from:
+                lo = mid + 1
+            else:
+                hi = mid
+        start, end = lo % cap, lo % cap + (self.count - lo)
+        if end <= cap:
+            return [col[start:end] for col in self.cols]
+        return [col[start:] + col[:end - cap] for col in self.cols]
+
+class MetricSeries:
+    """One metric: raw samples plus 1 s and 1 min rollups (avg/min/max/count).
+
+    Each tier is a fixed-size ring, so memory per metric is constant no matter
+    how long the mission runs; older data survives only at coarser resolution.
+    Times are time.monotonic(), so a wall-clock step (NTP setting the clock of
+    an RTC-less Pi after boot) cannot put a ring out of order or split a
+    bucket; queries add a wall-clock offset only to the points they return.
+    """
+    TIERS = (0.0, 1.0, 60.0)
+
+    def __init__(self):
+        self.raw = _RingColumns(METRIC_RAW_CAP, ("t", "v"))
+        self.rollups = {
+            1.0: _RingColumns(METRIC_SEC_CAP, ("t", "avg", "min", "max", "n")),
+            60.0: _RingColumns(METRIC_MIN_CAP, ("t", "avg", "min", "max", "n")),
+        }
+        self.open: dict = {}       # resolution -> [bucket start, sum, min, max, n] of the current bucket
+        self.latest = (0.0, math.nan)
+
+    def add(self, t: float, value: float):
+        self.raw.append(t, value)
+        self.latest = (t, value)
+        for res, ring in self.rollups.items():
+            bucket = t - (t % res)
+            acc = self.open.get(res)
+            if acc is not None and acc[0] == bucket:
+                acc[1] += value
+                acc[2] = min(acc[2], value)
+                acc[3] = max(acc[3], value)
+                acc[4] += 1
+                continue
+            if acc is not None:
+                ring.append(acc[0], acc[1] / acc[4], acc[2], acc[3], acc[4])
+            self.open[res] = [bucket, value, value, value, 1]
+
+    def query(self, t_from: float, step: float, offset: float = 0.0) -> tuple:
+        """Points [t + offset, avg, min, max] since t_from at `step` seconds (0 = raw).
+
+        Uses the finest tier not finer than `step` that still holds
+        everything since t_from (falling back to coarser tiers for old
+        ranges) and re-buckets to `step` when that is coarser than the tier.
+        Returns (resolution used, points).
+        """
+        return self.points(self.select(t_from, step), step, offset)
+
+    def select(self, t_from: float, step: float) -> tuple:
+        """The first half of query(): pick the tier and copy out its data since t_from.
+
+        Returns (resolution, columns, open bucket or None) for points().
+        """
+        fitting = [res for res in self.TIERS if res <= step] or [0.0]
+        coarser = [res for res in self.TIERS if res not in fitting]
+        res = next((r for r in fitting + coarser if self._covers(r, t_from)), self.TIERS[-1])
+        acc = self.open.get(res) if res != 0.0 else None
+        if acc is not None and acc[0] >= t_from:
+            acc = (acc[0], acc[1] / acc[4], acc[2], acc[3], acc[4])
+        else:
+            acc = None
+        return res, self._ring(res).columns_since(t_from), acc
+
+    @classmethod
+    def points(cls, selected: tuple, step: float, offset: float = 0.0) -> tuple:
+        """The second half of query(): rows from select(), re-bucketed and formatted."""
+        res, cols, acc = selected
+        if res == 0.0:
+            rows = [(t, v, v, v, 1) for t, v in zip(*cols)]
+        else:
+            rows = list(zip(*cols))
+            if acc is not None:
+                rows.append(acc)
+        if step > res:
+            rows = cls._rebucket(rows, step)
+        return res, [[round(t + offset, 3), avg, lo, hi] for t, avg, lo, hi, _ in rows[-METRIC_MAX_POINTS:]]
+
+    def _ring(self, res: float) -> _RingColumns:
+        return self.raw if res == 0.0 else self.rollups[res]
+
+    def _covers(self, res: float, t_from: float) -> bool:
+        """True if the tier still holds everything recorded since t_from."""
+        ring = self._ring(res)
+        return ring.count <= ring.capacity or ring.oldest() <= t_from
+
+    @staticmethod
+    def _rebucket(rows: list, step: float) -> list:
+        out = []
+        for t, avg, lo, hi, n in rows:
+            bucket = t - (t % step)
+            if out and out[-1][0] == bucket:
+                b = out[-1]
+                b[1] += avg * n
+                b[2] = min(b[2], lo)
+                b[3] = max(b[3], hi)
+                b[4] += n
+            else:
+                out.append([bucket, avg * n, lo, hi, n])
+        return [(b[0], b[1] / b[4], b[2], b[3], b[4]) for b in out]
+
+class MetricsStore:
+    """Named numeric time series for the dashboard charts (see MetricSeries).
+
+    Samples are recorded at time.monotonic(); query() and latest() take and
+    return Unix times, converted with the wall clock's offset at the call.
+    """
+
+    def __init__(self):
+        self.series: dict = {}
+        self.lock = threading.Lock()
+        self.rejected = 0          # Samples for new names beyond METRIC_MAX_SERIES
+
+    def record(self, name: str, value: float, t: Optional[float] = None):
+        self.record_many(((name, value),), t)
+
+    def record_many(self, items, t: Optional[float] = None):
+        """Record (name, value) pairs taken at the same monotonic time under one lock acquisition."""
+        t = time.monotonic() if t is None else t
+        with self.lock:
+            for name, value in items:
+                value = float(value)
+                if not math.isfinite(value):
+                    continue
+                series = self.series.get(name)
+                if series is None:
+                    if len(self.series) >= METRIC_MAX_SERIES:
+                        self.rejected += 1
+                        continue
+                    series = self.series[name] = MetricSeries()
+                series.add(t, value)
+
+    def query(self, name: str, t_from: float, step: float) -> Optional[tuple]:
+        """MetricSeries.query() with t_from and the point times in Unix time.
+
+        Only the copy of the selected columns runs under the lock, which the
+        bridge thread takes for every ESP32 IBUS line; formatting runs after.
+        """
+        offset = _wall_offset()
+        with self.lock:
+            series = self.series.get(name)
+            if series is None:
+                return None
+            selected = series.select(t_from - offset, step)
+        return MetricSeries.points(selected, step, offset)
+
+    def latest(self) -> dict:
+        offset = _wall_offset()
+        with self.lock:
+            return {name: {"t": round(s.latest[0] + offset, 3), "value": s.latest[1]}
+                    for name, s in self.series.items()}
+
+# ── ESP32 UART line parsing ─────────────────────────────────────────────────
+# The firmware's debug output (esp32_receiver.ino) is "<TAG>: <payload>";
+# tags with a parser below become typed records, everything is still logged.
+ESP32_BOOT_KEEP = 32        # BOOT lines kept from the most recent boot
+ESP32_CHANNEL_METRICS = tuple(f"esp32_ch{i}" for i in range(1, 15))
+
+@dataclass(frozen=True)
+class IbusLine:
+    """IBUS: CH1=%u ... CH14=%u – the channels the ESP32 last decoded."""
+    channels: tuple
+
+@dataclass(frozen=True)
+class CalLine:
+    """CAL: load valid=%d roll=.. pitch=.. yaw=.. / CAL: save roll=.. (w=../../.. ok=%d)"""
+    action: str                  # "load" or "save"
+    roll: float
+    pitch: float
+    yaw: float
+    valid: Optional[bool] = None     # load only
+    ok: Optional[bool] = None        # save only
+
+@dataclass(frozen=True)
+class BootLine:
+    """BOOT: <message>; ok is True/False when the message ends in OK/FAILED."""
+    message: str
+    ok: Optional[bool] = None
+
+_CAL_RE = re.compile(
+    r"(load|save)(?: valid=(\d))? roll=(-?\d+(?:\.\d+)?) pitch=(-?\d+(?:\.\d+)?)"
+    r" yaw=(-?\d+(?:\.\d+)?)(?: \(w=\d+/\d+/\d+ ok=(\d)\))?$")
+
+def parse_ibus_line(payload: str) -> Optional[IbusLine]:
+    fields = payload.split()
+    if len(fields) != 14 or not fields[0].startswith("CH1="):
+        return None
+    return IbusLine(tuple(int(f[f.index("=") + 1:]) for f in fields))
+
+def parse_cal_line(payload: str) -> Optional[CalLine]:
+    m = _CAL_RE.match(payload)
+    if m is None:
+        return None          # e.g. "prefs not ready, using zeros"
+    action, valid, roll, pitch, yaw, ok = m.groups()
+    return CalLine(action, float(roll), float(pitch), float(yaw),
+                   valid=None if valid is None else valid == "1",
+                   ok=None if ok is None else ok == "1")
+
+def parse_boot_line(payload: str) -> BootLine:
+    if payload.endswith(" OK"):
+        return BootLine(payload, True)
+    if payload.endswith(" FAILED"):
+        return BootLine(payload, False)
+    return BootLine(payload)
+
+class Esp32LineParser:
+    """Dispatches an ESP32 line to the parser registered for its tag.
+
+    One dict lookup on the text before ": " picks the parser, which does a
+    single split or regex match. parse() returns None for untagged lines,
+    tags without a parser and payloads the parser rejects.
+    """
+
+    def __init__(self):
+        self.parsers = {"IBUS": parse_ibus_line, "CAL": parse_cal_line, "BOOT": parse_boot_line}
+
+    def register(self, tag: str, parser):
+        """Add or replace the parser for "<tag>: ..." lines; parser(payload) -> record or None."""
+        self.parsers[tag] = parser
+
+    def parse(self, line: str):
+        tag, sep, payload = line.partition(": ")
+        parser = self.parsers.get(tag) if sep else None
+        if parser is None:
+            return None
+        try:
+            return parser(payload)
+        except ValueError:
+            return None
+
+@dataclass(frozen=True)
+class Esp32Snapshot:
+    """What the ESP32 last reported about itself, published by the bridge thread."""
+    channels: tuple = ()
+    channels_time: float = 0.0       # time.monotonic() of the last IBUS line
+    calibration: dict = field(default_factory=dict)
+    boots: int = 0                   # "BOOT: setup start" lines seen (ESP32 resets)
+    boot_messages: tuple = ()        # BOOT lines since the last setup start
+    boot_failures: tuple = ()        # ... of those, the ones that ended in FAILED
+    parsed: int = 0
+    unparsed: int = 0
+
+class Esp32Tracker:
+    """Turns ESP32 lines into current-state fields and metrics.
+
+    Lives in the bridge thread: feed() parses a line, folds the record into
+    private state and records numeric values in the metrics store. publish()
+    swaps a new Esp32Snapshot into SharedState.esp32, once per UART chunk
+    rather than per line.
+    """
+
+    def __init__(self, state: "SharedState", parser: Optional[Esp32LineParser] = None):
+        self.state = state
+        self.parser = parser or Esp32LineParser()
+        self.channels: tuple = ()
+        self.channels_time = 0.0
+        self.calibration: dict = {}
+        self.boots = 0
+        self.boot_messages: Deque[str] = collections.deque(maxlen=ESP32_BOOT_KEEP)
+        self.boot_failures: List[str] = []
+        self.parsed = 0
+        self.unparsed = 0
+        self._dirty = False            # Fed since the last publish()
+
+    def feed(self, line: str):
+        record = self.parser.parse(line)
+        if record is None:
+            self.unparsed += 1
+            self._dirty = True
+        else:
+            self.feed_record(record)
+        return record
+
+    def feed_record(self, record):
+        """Apply a record that arrived already typed (a binary link frame)."""
+        self.parsed += 1
+        self._apply(record)
+        self._dirty = True
+
+    def _apply(self, record):
+        metrics = self.state.metrics
+        if isinstance(record, IbusLine):
+            self.channels = record.channels
+            self.channels_time = time.monotonic()
+            metrics.record_many(zip(ESP32_CHANNEL_METRICS, record.channels))
+        elif isinstance(record, CalLine):
+            self.calibration = asdict(record)
+            metrics.record_many((("esp32_cal_roll", record.roll), ("esp32_cal_pitch", record.pitch),
+                                 ("esp32_cal_yaw", record.yaw)))
+        elif isinstance(record, BootLine):
+            if record.message == "setup start":
+                self.boots += 1
+                self.boot_messages.clear()
+                self.boot_failures = []
+            self.boot_messages.append(record.message)
+            if record.ok is False:
+                self.boot_failures.append(record.message)
+
+    def publish(self):
+        """Swap in a new Esp32Snapshot if anything was fed since the last one."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        self.state.esp32 = Esp32Snapshot(
+            channels=self.channels,
+            channels_time=self.channels_time,
+            calibration=self.calibration,
+            boots=self.boots,
+            boot_messages=tuple(self.boot_messages),
+            boot_failures=tuple(self.boot_failures),
+            parsed=self.parsed,
+            unparsed=self.unparsed,
+        )
+
+class LogRing:
+    """Fixed-capacity log buffer indexed by monotonically increasing log id.
+
+    Entries live in a preallocated list as (id, ts, src, msg) tuples; the
+    entry with id n sits at slot (n - 1) % capacity, so "everything since
+    id N" is located by arithmetic and copied out as at most two list slices
+    (references only) under the lock. Dicts for JSON are built afterwards,
+    outside it. Polling cost depends on how many lines are new, not on the
+    capacity. Every append notifies `cond`, so long-poll and SSE readers
+    wake as soon as a line arrives.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = max(1, capacity)
+        self.slots: list = [None] * self.capacity
+        self.next_id = 1
+        self.lock = threading.Lock()
+        self.cond = threading.Condition(self.lock)
+
+    def append(self, src: str, msg: str) -> int:
+        ts = now_ts()
+        with self.lock:
+            log_id = self.next_id
+            self.slots[(log_id - 1) % self.capacity] = (log_id, ts, src, msg)
+            self.next_id = log_id + 1
+            self.cond.notify_all()
+        return log_id
+
+    def extend(self, src: str, msgs: List[str]) -> int:
+        """Append several lines from one source under a single lock acquisition."""
+        ts = now_ts()
+        cap, slots = self.capacity, self.slots
+        with self.lock:
+            log_id = self.next_id
+            for msg in msgs:
+                slots[(log_id - 1) % cap] = (log_id, ts, src, msg)
+                log_id += 1
+            self.next_id = log_id
+            self.cond.notify_all()
+        return log_id - 1
+
+    def wait_newer(self, since_id: int, timeout: float) -> bool:
+        """Block up to timeout for an entry with id > since_id. Returns True if one exists."""
+        with self.cond:
+            return self.cond.wait_for(lambda: self.next_id - 1 > since_id, timeout)
+
+    def since(self, since_id: int, limit: Optional[int] = None) -> List[dict]:
+        """Entries with id > since_id, oldest first; at most the newest `limit` of them."""
+        cap = self.capacity
+        with self.lock:
+            end = self.next_id                       # one past the newest id
+            start = max(since_id + 1, end - cap, 1)  # oldest id still in the ring
+            if limit is not None:
+                start = max(start, end - limit)
+            if start >= end:
+                return []
+            lo, hi = (start - 1) % cap, (end - 1) % cap
+            if lo < hi:
+                rows = self.slots[lo:hi]
+            else:
+                rows = self.slots[lo:] + self.slots[:hi]
+        return [{"id": i, "ts": ts, "src": src, "msg": msg} for i, ts, src, msg in rows]
+
+    def __len__(self) -> int:
+        return min(self.next_id - 1, self.capacity)
+
+
+@dataclass(frozen=True)
+class BridgeSnapshot:
+    """Immutable copy of the bridge counters, published by the bridge thread.
+
+    The bridge owns its counters privately and swaps a new snapshot into
+    SharedState.bridge after each batch of work; a reference assignment is
+    atomic, so readers such as /api/status never take a lock the hot path
+    needs. version increases with every publish.
+    """
+    version: int = 0
+    published: float = 0.0
     last_rc_time: float = 0.0
-    last_rc_sender: str = ""       
+    last_rc_sender: str = ""
     packets_rx: int = 0
     packets_uart_tx: int = 0
     uart_rx_lines: int = 0
     uart_open: bool = False
+    rc_dropped: int = 0            # Enveloped datagrams dropped as duplicate or reordered
+    rc_coalesced: int = 0          # Fresh frames superseded by a newer one in the same drain
+    rc_max_batch: int = 0          # Most datagrams drained in one wakeup
+    uart_stale_dropped: int = 0    # iBUS frames replaced while the UART TX queue was backed up
+    uart_queue_bytes: int = 0      # Kernel TX queue depth before the last iBUS write
+    rc_link: dict = field(default_factory=dict)   # RcLinkStats.snapshot(), refreshed at most every RC_LINK_PUBLISH_SEC
+    failsafe: dict = field(default_factory=dict)  # Pi-side failsafe state and transition counters
+    uart_link: dict = field(default_factory=dict) # Baud/mode, framing counters and UartFlowStats, same cadence
+
+@dataclass(frozen=True)
+class LinkSnapshot:
+    """Cached state of the Ethernet link, published by LinkMonitor."""
+    interface: str = ""
+    up: bool = False
+    state: dict = field(default_factory=dict)     # read_link_state() fields
+    flaps: int = 0
+    last_change: float = 0.0                      # time.monotonic() of the last up/down transition
+    events: tuple = ()                            # Recent transitions, oldest first
+
+@dataclass
+class SharedState:
+    # Bridge counters: written only by the bridge thread, read lock-free
+    bridge: BridgeSnapshot = field(default_factory=BridgeSnapshot)
+    # Ethernet link: written only by LinkMonitor, read lock-free
+    link: LinkSnapshot = field(default_factory=LinkSnapshot)
+    # Latest Pi health reading: written only by SystemMonitor, read lock-free
+    telemetry: TelemetrySample = field(default_factory=TelemetrySample)
+    # Numeric history for /api/metrics
+    metrics: MetricsStore = field(default_factory=MetricsStore)
+    # Parsed ESP32 output: written only by the bridge thread (Esp32Tracker), read lock-free
+    esp32: Esp32Snapshot = field(default_factory=Esp32Snapshot)
+    # Frames sent on RC loss: replaced whole by /api/failsafe, read by the bridge thread
+    failsafe_profile: FailsafeProfile = field(default_factory=FailsafeProfile)
     # GPIO State
     blink_active: bool = False
     momentary_active: bool = False
@@ -501,47 +1068,186 @@ class SharedState:
     # GPIO Switch States (3 simple on/off pins)
     switch_states: List[bool] = field(default_factory=lambda: [False, False, False])
 
-    logs: Deque[dict] = field(default_factory=lambda: collections.deque(maxlen=1000))
-    next_log_id: int = 1
-    lock: threading.Lock = field(default_factory=threading.Lock)
+    logs: LogRing = field(default_factory=LogRing)
+    lock: threading.Lock = field(default_factory=threading.Lock)       # GPIO state
 
     def add_log(self, src: str, msg: str):
-        with self.lock:
-            self.logs.append({
-                "id": self.next_log_id,
-                "ts": now_ts(),
-                "src": src,
-                "msg": msg,
-            })
-            self.next_log_id += 1
-
-    def get_logs_since(self, since_id: int) -> List[dict]:
-        with self.lock:
-            return [entry for entry in self.logs if entry["id"] > since_id]
+        self.logs.append(src, msg)
+
+    def add_logs(self, src: str, msgs: List[str]):
+        self.logs.extend(src, msgs)
+
+    def get_logs_since(self, since_id: int, limit: Optional[int] = None, wait: float = 0.0) -> List[dict]:
+        """Entries newer than since_id; with wait > 0, long-poll until one arrives."""
+        if wait > 0:
+            self.logs.wait_newer(since_id, wait)
+        return self.logs.since(since_id, limit)
 
 class SystemMonitor:
-    def __init__(self, state: SharedState):
+    """Samples TelemetryCollector at rate_hz and publishes SharedState.telemetry.
+
+    The summary line and power warnings still go to the dashboard log every
+    TELEMETRY_LOG_SEC, whatever the sampling rate.
+    """
+
+    def __init__(self, state: SharedState, interface: str = "eth0", rate_hz: float = 1.0):
         self.state = state
+        self.collector = TelemetryCollector(interface)
+        self.interval = 1.0 / min(10.0, max(1.0, rate_hz))
+        self._bridge_prev: Optional[tuple] = None
         self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.thread.start()
 
     def _monitor_loop(self):
+        next_log = time.monotonic()
+        deadline = time.monotonic()
         while True:
-            temp = get_pi_temp()
-            volts = get_pi_volts()
-            ram = get_ram_usage()
-            throttled = get_throttled_state()
+            sample = self.collector.sample()
+            self.state.telemetry = sample
+            self._record(sample)
+            now = time.monotonic()
+            if now >= next_log:
+                next_log = now + TELEMETRY_LOG_SEC
+                self._log(sample)
+            deadline += self.interval
+            time.sleep(max(0.0, deadline - time.monotonic()))
+
+    def _record(self, sample: TelemetrySample):
+        """Feed this sample, and rates derived from the bridge counters, to the metrics store."""
+        now = time.monotonic()
+        items = [(name, value) for name in TELEMETRY_METRICS if (value := getattr(sample, name)) is not None]
+        bridge = self.state.bridge
+        prev, self._bridge_prev = self._bridge_prev, (now, bridge.packets_rx, bridge.packets_uart_tx,
+                                                      bridge.uart_stale_dropped)
+        if prev is not None and now > prev[0]:
+            dt = now - prev[0]
+            items += [("packets_rx_rate", (bridge.packets_rx - prev[1]) / dt),
+                      ("uart_tx_rate", (bridge.packets_uart_tx - prev[2]) / dt),
+                      ("uart_stale_drop_rate", (bridge.uart_stale_dropped - prev[3]) / dt)]
+        items.append(("uart_queue_bytes", bridge.uart_queue_bytes))
+        write_p99 = bridge.uart_link.get("tx_path", {}).get("write_us", {}).get("p99")
+        if write_p99 is not None:
+            items.append(("uart_write_us_p99", write_p99))
+        if bridge.last_rc_time > 0:
+            items.append(("last_rc_age_sec", now - bridge.last_rc_time))
+        # One lock acquisition for the whole sample
+        self.state.metrics.record_many(items, now)
+
+    def _log(self, sample: TelemetrySample):
+        temp = f"{sample.cpu_temp_c:.1f}'C" if sample.cpu_temp_c is not None else "N/A"
+        volts = f"{sample.core_volts:.4f}V" if sample.core_volts is not None else "N/A"
+        if sample.mem_total_kb and sample.mem_available_kb is not None:
+            ram = f"{(sample.mem_total_kb - sample.mem_available_kb) // 1024}M/{sample.mem_total_kb // 1024}M"
+        else:
+            ram = "N/A"
+        cpu = f"{sample.cpu_pct:.0f}%" if sample.cpu_pct is not None else "N/A"
+        throttled = decode_throttled(sample.throttled)
+
+        msg = f"Temp: {temp} | Volts: {volts} | RAM: {ram} | CPU: {cpu} | Pwr: {throttled}"
 
-            msg = f"Temp: {temp} | Volts: {volts} | RAM: {ram} | Pwr: {throttled}"
+        # Log warnings if system is stressed
+        if throttled not in ("OK", "Unknown"):
+            self.state.add_log("SYS", f"⚠ POWER WARNING: {throttled}")
 
-            # Log warnings if system is stressed
-            if throttled not in ("OK", "Unknown"):
-                self.state.add_log("SYS", f"⚠ POWER WARNING: {throttled}")
+        # Regular info log
+        self.state.add_log("SYS", msg)
 
-            # Regular info log
-            self.state.add_log("SYS", msg)
+class LinkMonitor:
+    """Tracks the Ethernet link in the background and publishes LinkSnapshot.
+
+    Subscribes to rtnetlink link notifications (RTM_NEWLINK/RTM_DELLINK) so
+    an up/down transition is picked up as it happens, and re-reads sysfs
+    every LINK_REFRESH_SEC for the error counters. Transitions are logged
+    and kept in a short event list. Without netlink it falls back to the
+    periodic sysfs read alone.
+    """
+    RTMGRP_LINK = 0x1
+    RTM_NEWLINK = 16
+    RTM_DELLINK = 17
+    NLMSG_HEADER = struct.Struct("=IHHII")
+    IFINFOMSG = struct.Struct("=BxHiII")
+
+    def __init__(self, state: SharedState, interface: str):
+        self.state = state
+        self.interface = interface
+        self.events: Deque[dict] = collections.deque(maxlen=LINK_EVENTS_MAX)
+        self.flaps = 0
+        self.last_change = 0.0
+        self.nl_sock = None
+        try:
+            self.nl_sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            self.nl_sock.bind((0, self.RTMGRP_LINK))
+            self.nl_sock.setblocking(False)
+        except (AttributeError, OSError) as e:
+            self.nl_sock = None
+            state.add_log("SYS", f"Link monitor: netlink unavailable ({e}), polling sysfs")
+        self._publish(read_link_state(interface))
+        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
+        self.thread.start()
+
+    def _ifindex(self) -> Optional[int]:
+        try:
+            return socket.if_nametoindex(self.interface)
+        except OSError:
+            return None
+
+    def _drain_netlink(self) -> bool:
+        """Consume pending notifications; True if one concerns our interface."""
+        ifindex = self._ifindex()
+        relevant = False
+        while True:
+            try:
+                data = self.nl_sock.recv(65536)
+            except BlockingIOError:
+                return relevant
+            except OSError:
+                return True     # ENOBUFS: notifications were lost, re-read to be safe
+            offset = 0
+            while offset + self.NLMSG_HEADER.size <= len(data):
+                length, msg_type = self.NLMSG_HEADER.unpack_from(data, offset)[:2]
+                if length < self.NLMSG_HEADER.size:
+                    break
+                if msg_type in (self.RTM_NEWLINK, self.RTM_DELLINK):
+                    index = self.IFINFOMSG.unpack_from(data, offset + self.NLMSG_HEADER.size)[2]
+                    # Interface not present yet: any link message may be it appearing
+                    relevant = relevant or ifindex is None or index == ifindex
+                offset += (length + 3) & ~3
+
+    def _publish(self, link: dict):
+        self.state.link = LinkSnapshot(
+            interface=self.interface,
+            up=link["up"],
+            state=link,
+            flaps=self.flaps,
+            last_change=self.last_change,
+            events=tuple(self.events),
+        )
 
-            time.sleep(10) # Log every 10 seconds
+    def _monitor_loop(self):
+        next_refresh = time.monotonic() + LINK_REFRESH_SEC
+        while True:
+            timeout = max(0.0, next_refresh - time.monotonic())
+            notified = False
+            if self.nl_sock is not None:
+                ready, _, _ = select.select([self.nl_sock], [], [], timeout)
+                notified = bool(ready) and self._drain_netlink()
+            else:
+                time.sleep(timeout)
+            now = time.monotonic()
+            if not notified and now < next_refresh:
+                continue
+            if now >= next_refresh:
+                next_refresh = now + LINK_REFRESH_SEC
+            link = read_link_state(self.interface)
+            previous = self.state.link
+            if link["up"] != previous.up:
+                self.flaps += 1
+                self.last_change = time.monotonic()
+                self.events.append({"ts": now_ts(), "time": round(time.time(), 3), "up": link["up"],
+                                    "operstate": link["operstate"], "carrier": link["carrier"]})
+                detail = f"{link['speed_mbps']} Mb/s {link['duplex']}" if link["up"] else f"operstate={link['operstate']}"
+                self.state.add_log("SYS", f"Link {self.interface} {'UP' if link['up'] else 'DOWN'} ({detail})")
+            self._publish(link)
 
 class ServoFilter:
     """Moving-average + deadband filter to stabilize servo PWM output.
@@ -717,141 +1423,1194 @@ class GpioController:
             if self.pwm2: self.pwm2.stop()
             GPIO.cleanup()
 
-def bridge_loop(state: SharedState, args):
-    """
-    Main relay loop: UDP iBUS receiver → UART TX | UART RX → Logs
+class ControlChannel:
+    """Latest-value mailbox between dashboard control commands and GpioController.
+
+    Level commands (LEVEL_COMMANDS: servo angles, switch states) are keyed by
+    actuator ("servo", 1), ("switch", 3), ... and only the newest pending value
+    per key is kept: a slider drag that outruns the worker overwrites its own
+    backlog instead of queueing behind it. Edge commands (momentary, blink) are
+    never merged: a press and release arriving together are both applied, in
+    order, so the pulse still happens. Commands
+    carrying a per-client sequence number that is not newer than the last one
+    accepted for that actuator are rejected as stale. A single worker thread
+    applies what is pending, so GpioController sees commands in order and one
+    at a time.
     """
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    try:
-        sock.bind((args.listen_ip, args.listen_port))
-        sock.setblocking(False)
-        print(f"✓ UDP bound to {args.listen_ip}:{args.listen_port}")
-        state.add_log("PI", f"UDP listening {args.listen_ip}:{args.listen_port}")
-    except OSError as e:
-        print(f"✗ FATAL: Cannot bind UDP {args.listen_ip}:{args.listen_port}: {e}")
-        state.add_log("PI", f"ERROR: UDP bind failed: {e}")
-        return
 
-    # ── UART setup ──────────────────────────────────────────────────────────────
-    uart_dev = None
+    LEVEL_COMMANDS = ("servo", "switch")
+
+    def __init__(self, gpio: "GpioController"):
+        self.gpio = gpio
+        self.cond = threading.Condition()
+        # (kind, id) for level commands, (kind, id, n) for edges -> (value, perf_counter at receive);
+        # insertion order is apply order
+        self.pending: dict = {}
+        self.last_seq: dict = {}      # (client, kind, id) -> newest accepted seq
+        self.received = 0
+        self.applied = 0
+        self.coalesced = 0            # Superseded by a newer value before being applied
+        self.stale = 0                # Rejected: seq not newer than one already accepted
+        self.latency_us: Deque[float] = collections.deque(maxlen=256)   # receive → applied
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def parse(msg: dict):
+        """Validate a command dict into (kind, id, value); raises ValueError."""
+        kind = msg.get("cmd")
+        if kind == "servo":
+            actuator = int(msg.get("id", 0))
+            if actuator not in (1, 2):
+                raise ValueError("invalid servo id")
+            return kind, actuator, int(msg.get("value", 90))
+        if kind in ("momentary", "blink"):
+            return kind, 0, bool(msg.get("value", False))
+        if kind == "switch":
+            actuator = int(msg.get("id", 0))
+            if actuator < 1 or actuator > len(SWITCH_PINS):
+                raise ValueError("invalid switch id")
+            return kind, actuator, bool(msg.get("value", False))
+        raise ValueError(f"unknown command {kind!r}")
+
+    def submit(self, kind: str, actuator: int, value, seq: Optional[int] = None, client=None) -> bool:
+        """Queue a command. Returns False if it was stale and dropped."""
+        with self.cond:
+            self.received += 1
+            if seq is not None:
+                seq_key = (client, kind, actuator)
+                last = self.last_seq.get(seq_key)
+                if last is not None and seq <= last:
+                    self.stale += 1
+                    return False
+                self.last_seq[seq_key] = seq
+            if kind in self.LEVEL_COMMANDS:
+                key = (kind, actuator)
+                if key in self.pending:
+                    self.coalesced += 1
+            else:
+                key = (kind, actuator, self.received)
+            self.pending[key] = (value, time.perf_counter())
+            self.cond.notify()
+        return True
+
+    def forget(self, client):
+        """Drop sequence state for a disconnected client."""
+        with self.cond:
+            for key in [k for k in self.last_seq if k[0] == client]:
+                del self.last_seq[key]
+
+    def _worker(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.pending)
+                batch, self.pending = self.pending, {}
+            for (kind, actuator, *_), (value, received) in batch.items():
+                try:
+                    self._apply(kind, actuator, value)
+                except Exception as e:
+                    self.gpio.state.add_log("GPIO", f"Control {kind} {actuator} error: {e}")
+                self.latency_us.append((time.perf_counter() - received) * 1e6)
+                self.applied += 1
+
+    def _apply(self, kind: str, actuator: int, value):
+        if kind == "servo":
+            self.gpio.set_servo(actuator, value)
+        elif kind == "momentary":
+            self.gpio.set_momentary(value)
+        elif kind == "blink":
+            self.gpio.set_blink(value)
+        elif kind == "switch":
+            self.gpio.set_switch(actuator, value)
+
+    def snapshot(self) -> dict:
+        return {
+            "received": self.received,
+            "applied": self.applied,
+            "coalesced": self.coalesced,
+            "stale": self.stale,
+            "apply_latency_us": _percentiles(list(self.latency_us)),
+        }
+
+# ── Batched UDP receive ─────────────────────────────────────────────────────
+class _IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+def _load_recvmmsg():
+    if not sys.platform.startswith("linux"):
+        return None
     try:
-        uart_dev = serial.Serial(args.uart_port, args.baud, timeout=0)
-        print(f"✓ UART open: {args.uart_port} @ {args.baud}")
-        state.add_log("PI", f"UART open {args.uart_port} @ {args.baud}")
-        with state.lock:
-            state.uart_open = True
-    except Exception as e:
-        print(f"✗ WARNING: Cannot open UART {args.uart_port}: {e}")
-        state.add_log("PI", f"UART error: {e}")
-        with state.lock:
-            state.uart_open = False
+        libc = ctypes.CDLL(None, use_errno=True)
+        fn = libc.recvmmsg
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+    fn.restype = ctypes.c_int
+    return fn
+
+_recvmmsg = _load_recvmmsg()
+_MSG_DONTWAIT = getattr(socket, "MSG_DONTWAIT", 0x40)
+_SOCKADDR_LEN = 16      # sockaddr_in
+# Kernel receive timestamp per datagram (CLOCK_REALTIME timespec in a control message);
+# SO_TIMESTAMPNS_OLD, the value the Linux headers define it as for native-width longs
+_SO_TIMESTAMPNS = getattr(socket, "SO_TIMESTAMPNS", 35)
+_CMSG_HDR = struct.Struct("@Nii")              # cmsg_len, cmsg_level, cmsg_type
+_CMSG_DATA = socket.CMSG_LEN(0)
+_CONTROL_LEN = socket.CMSG_SPACE(16)           # One timespec of up to two 64-bit fields
+
+
+def _timespec_ns(data: bytes) -> Optional[int]:
+    if len(data) >= 16:
+        sec, nsec = struct.unpack_from("=qq", data)
+    elif len(data) >= 8:
+        sec, nsec = struct.unpack_from("=ii", data)   # 32-bit time_t and long
+    else:
+        return None
+    return sec * 1_000_000_000 + nsec
+
+class DatagramBatchReader:
+    """Drain every queued datagram from a non-blocking UDP socket in one pass.
+
+    Uses recvmmsg(2) through ctypes where libc provides it, so a backlog after
+    a network stall costs one syscall per max_batch datagrams; otherwise falls
+    back to a recvmsg() loop until EAGAIN. Buffers are preallocated once per
+    socket. At most max_drain datagrams are taken per call so a flood cannot
+    starve the rest of the bridge. IPv4 sockets only (the bridge binds AF_INET).
+
+    Each datagram carries the kernel's receive time (SO_TIMESTAMPNS), mapped
+    to time.monotonic_ns(), so datagrams read from several sockets in one
+    wakeup can still be put in arrival order. Where the kernel gives no
+    timestamp the time of the read stands in.
+    """
+
+    def __init__(self, sock: socket.socket, max_batch: int = 64, bufsize: int = 2048,
+                 use_recvmmsg: bool = True, max_drain: int = 1024):
+        self.sock = sock
+        self.max_batch = max_batch
+        self.max_drain = max_drain
+        self.bufsize = bufsize
+        self.syscalls = 0
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, _SO_TIMESTAMPNS, 1)
+        except OSError:
+            pass                                # Read time only
+        self.use_recvmmsg = use_recvmmsg and _recvmmsg is not None
+        if self.use_recvmmsg:
+            self._bufs = [ctypes.create_string_buffer(bufsize) for _ in range(max_batch)]
+            self._names = [ctypes.create_string_buffer(_SOCKADDR_LEN) for _ in range(max_batch)]
+            self._controls = [ctypes.create_string_buffer(_CONTROL_LEN) for _ in range(max_batch)]
+            self._iovs = (_IoVec * max_batch)()
+            self._msgs = (_MMsgHdr * max_batch)()
+            for i in range(max_batch):
+                self._iovs[i].iov_base = ctypes.addressof(self._bufs[i])
+                self._iovs[i].iov_len = bufsize
+                hdr = self._msgs[i].msg_hdr
+                hdr.msg_name = ctypes.addressof(self._names[i])
+                hdr.msg_iov = ctypes.pointer(self._iovs[i])
+                hdr.msg_iovlen = 1
+                hdr.msg_control = ctypes.addressof(self._controls[i])
+
+    def read(self) -> List[tuple]:
+        """Return [(data, (ip, port), recv_ns), ...] for everything currently queued, oldest first."""
+        read_ns = time.monotonic_ns()
+        offset = read_ns - time.time_ns()       # Kernel timestamps are CLOCK_REALTIME
+        if self.use_recvmmsg:
+            return self._read_recvmmsg(read_ns, offset)
+        out = []
+        sock = self.sock
+        while len(out) < self.max_drain:
+            try:
+                data, ancdata, _, addr = sock.recvmsg(self.bufsize, _CONTROL_LEN)
+            except (BlockingIOError, InterruptedError):
+                break
+            finally:
+                self.syscalls += 1
+            recv_ns = read_ns
+            for level, kind, cdata in ancdata:
+                if level == socket.SOL_SOCKET and kind == _SO_TIMESTAMPNS:
+                    ts = _timespec_ns(cdata)
+                    if ts is not None:
+                        recv_ns = ts + offset
+            out.append((data, addr, recv_ns))
+        return out
+
+    def _read_recvmmsg(self, read_ns: int, offset: int) -> List[tuple]:
+        out = []
+        fd = self.sock.fileno()
+        msgs = self._msgs
+        while True:
+            for i in range(self.max_batch):
+                msgs[i].msg_hdr.msg_namelen = _SOCKADDR_LEN
+                msgs[i].msg_hdr.msg_controllen = _CONTROL_LEN
+            n = _recvmmsg(fd, msgs, self.max_batch, _MSG_DONTWAIT, None)
+            self.syscalls += 1
+            if n < 0:
+                err = ctypes.get_errno()
+                if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                    break
+                raise OSError(err, os.strerror(err))
+            for i in range(n):
+                name = self._names[i].raw
+                addr = (socket.inet_ntoa(name[4:8]), struct.unpack_from("!H", name, 2)[0])
+                out.append((ctypes.string_at(self._bufs[i], msgs[i].msg_len), addr,
+                            self._recv_ns(i, msgs[i].msg_hdr.msg_controllen, read_ns, offset)))
+            if n < self.max_batch or len(out) >= self.max_drain:
+                break
+        return out
+
+    def _recv_ns(self, i: int, controllen: int, read_ns: int, offset: int) -> int:
+        # The timestamp is the only control message enabled, so it is the first one
+        if controllen >= _CMSG_DATA:
+            control = ctypes.string_at(self._controls[i], controllen)
+            length, level, kind = _CMSG_HDR.unpack_from(control)
+            if level == socket.SOL_SOCKET and kind == _SO_TIMESTAMPNS:
+                ts = _timespec_ns(control[_CMSG_DATA:length])
+                if ts is not None:
+                    return ts + offset
+        return read_ns
+
+
+UART_LINE_MAX = 256        # Bytes kept for an unterminated ESP32 line before it is dropped
+
+def _trim_overlong(segment):
+    # A run of more than UART_LINE_MAX bytes without a newline is discarded
+    # each time it reaches UART_LINE_MAX + 1 bytes; only the remainder is kept
+    n = len(segment)
+    return segment[n - n % (UART_LINE_MAX + 1):] if n > UART_LINE_MAX else segment
+
+def split_uart_lines(carry: bytearray, chunk: bytes) -> List[str]:
+    """Complete, non-empty lines from carry + chunk; carry keeps the unterminated tail.
+
+    Works on whole chunks with bytes.split() instead of byte by byte. CR is
+    ignored and the UART_LINE_MAX overflow guard behaves exactly like the
+    previous per-byte loop, which cleared its buffer at 257 bytes.
+    """
+    if b"\r" in chunk:
+        chunk = chunk.replace(b"\r", b"")
+    if b"\n" not in chunk:
+        carry += chunk
+        if len(carry) > UART_LINE_MAX:
+            carry[:] = _trim_overlong(carry)
+        return []
+    parts = (carry + chunk).split(b"\n")
+    carry[:] = _trim_overlong(parts.pop())
+    lines = []
+    for part in parts:
+        if line := _trim_overlong(part).decode("ascii", errors="replace").strip():
+            lines.append(line)
+    return lines
+
+# ── Pi ↔ ESP32 binary link frames ───────────────────────────────────────────
+# Sync 0xA5 0x5A, payload length (u8), message type (u8), payload, then
+# CRC-16/CCITT (init 0xFFFF, little-endian) over length + type + payload.
+# 0xA5 never occurs in the ESP32's ASCII debug output, so frames can share
+# the upstream byte stream with text lines. Downstream, IBusBM skips
+# anything that does not start with its 0x20 0x40 header.
+LINK_SYNC = b"\xa5\x5a"
+LINK_CRC = struct.Struct("<H")
+LINK_OVERHEAD = len(LINK_SYNC) + 2 + LINK_CRC.size
+LINK_MSG_BAUD_REQUEST = 0x01   # Pi → ESP32: u32 baud; ESP32 acks at the current rate, then switches
+LINK_MSG_BAUD_ACK = 0x02       # ESP32 → Pi: u32 baud it switches to (anything else = refused)
+LINK_MSG_PING = 0x03           # Pi → ESP32: u32 nonce, echoed back as PONG
+LINK_MSG_PONG = 0x04
+LINK_MSG_CHANNELS = 0x10       # ESP32 → Pi: 14 × u16, the binary form of an "IBUS:" line
+LINK_MSG_CAL = 0x11            # ESP32 → Pi: u8 valid + 3 × f32 roll/pitch/yaw ("CAL: load")
+LINK_MSG_TEXT = 0x12           # ESP32 → Pi: one ASCII log line
+
+LINK_U32 = struct.Struct("<I")
+LINK_CHANNELS = struct.Struct("<14H")
+LINK_CAL = struct.Struct("<B3f")
+
+LINK_NEGOTIATE_SEC = 0.5       # Request → ack → ping → pong must finish within this
+LINK_KEEPALIVE_SEC = 2.0       # PING interval at the negotiated rate; two misses fall back
+LINK_RETRY_SEC = 30.0          # Wait before asking again after a failed or lost negotiation
+UART_RATE_WINDOW_SEC = 1.0     # Window of the per-direction byte rates
+
+def pack_link_frame(msg_type: int, payload: bytes = b"") -> bytes:
+    body = bytes((len(payload), msg_type)) + payload
+    return LINK_SYNC + body + LINK_CRC.pack(binascii.crc_hqx(body, 0xFFFF))
+
+class UartDemux:
+    """Separates binary link frames from ASCII lines in the ESP32's output.
+
+    Text between frames goes through split_uart_lines() with its usual
+    carry-over; a frame cut off at the end of a chunk is kept until the
+    rest arrives. Frames with a bad CRC are skipped one byte at a time so a
+    corrupted header cannot swallow following data.
+    """
 
-    last_rx_time = 0.0
-    last_no_rx_log_sec = -10
-    uart_line_buf = bytearray()
+    def __init__(self):
+        self.line_buf = bytearray()
+        self.pending = b""         # Start of an incomplete frame
+        self.frames = 0
+        self.crc_errors = 0
+
+    def feed(self, chunk: bytes):
+        """Returns (lines, [(msg_type, payload), ...])."""
+        data = self.pending + chunk if self.pending else chunk
+        self.pending = b""
+        if LINK_SYNC[0] not in data:
+            return split_uart_lines(self.line_buf, data), []
+        lines, frames = [], []
+        pos, end = 0, len(data)
+        while True:
+            i = data.find(LINK_SYNC[0], pos)
+            if i < 0:
+                lines += split_uart_lines(self.line_buf, data[pos:])
+                break
+            if i > pos:
+                lines += split_uart_lines(self.line_buf, data[pos:i])
+            if end - i < 4:
+                if data[i + 1:i + 2] in (b"", LINK_SYNC[1:]):
+                    self.pending = bytes(data[i:])
+                    break
+                pos = i + 1
+                continue
+            if data[i + 1] != LINK_SYNC[1]:
+                pos = i + 1                      # Stray 0xA5: not ASCII, drop it
+                continue
+            length = data[i + 2]
+            frame_end = i + LINK_OVERHEAD + length
+            if frame_end > end:
+                self.pending = bytes(data[i:])
+                break
+            body = data[i + 2:frame_end - LINK_CRC.size]
+            if binascii.crc_hqx(body, 0xFFFF) != LINK_CRC.unpack_from(data, frame_end - LINK_CRC.size)[0]:
+                self.crc_errors += 1
+                pos = i + 1
+                continue
+            frames.append((data[i + 3], bytes(body[2:])))
+            self.frames += 1
+            pos = frame_end
+        return lines, frames
+
+class UartFlowStats:
+    """Bytes per UART direction, with rates and line utilisation over UART_RATE_WINDOW_SEC."""
+
+    def __init__(self):
+        self.tx_bytes = 0
+        self.rx_bytes = 0
+        self.samples: Deque[tuple] = collections.deque([(time.monotonic(), 0, 0)])
+
+    def snapshot(self, now: float, baud: int) -> dict:
+        samples = self.samples
+        samples.append((now, self.tx_bytes, self.rx_bytes))
+        # Keep the newest sample that is at least one window old as the base
+        while len(samples) > 2 and now - samples[1][0] >= UART_RATE_WINDOW_SEC:
+            samples.popleft()
+        t0, tx0, rx0 = samples[0]
+        dt = now - t0
+        capacity = baud / 10.0       # 8N1: ten bit times per byte
+        tx_rate = (self.tx_bytes - tx0) / dt if dt > 0 else 0.0
+        rx_rate = (self.rx_bytes - rx0) / dt if dt > 0 else 0.0
+        return {
+            "tx_bytes": self.tx_bytes,
+            "rx_bytes": self.rx_bytes,
+            "tx_bytes_s": round(tx_rate, 1),
+            "rx_bytes_s": round(rx_rate, 1),
+            "tx_util_pct": round(100.0 * tx_rate / capacity, 2),
+            "rx_util_pct": round(100.0 * rx_rate / capacity, 2),
+        }
+
+class UartTxStats:
+    """iBUS write-path accounting: kernel TX queue depth, deferred/dropped frames, write() latency."""
+
+    def __init__(self, window: int = 500):
+        self.queue_bytes = 0           # TIOCOUTQ before the last write attempt
+        self.queue_max = 0
+        self.deferred = 0              # Frames held back because the queue was not empty
+        self.stale_dropped = 0         # Held frames replaced by a newer one before reaching the wire
+        self.write_errors = 0
+        self.write_us: Deque[float] = collections.deque(maxlen=window)
+        self.queue: Deque[int] = collections.deque(maxlen=window)
+
+    def on_queue(self, queued: int):
+        self.queue_bytes = queued
+        self.queue.append(queued)
+        if queued > self.queue_max:
+            self.queue_max = queued
+
+    def snapshot(self) -> dict:
+        return {
+            "queue_bytes": {"last": self.queue_bytes, "max": self.queue_max, **_percentiles(self.queue)},
+            "deferred": self.deferred,
+            "stale_dropped": self.stale_dropped,
+            "write_errors": self.write_errors,
+            "write_us": _percentiles(self.write_us),
+        }
 
-    print(f"✓ Bridge loop running – awaiting raw iBUS frames on UDP {args.listen_port}...")
+LOG_API_LIMIT = 1000       # Default max lines per /api/logs response (newest win)
+LOG_WAIT_MAX_SEC = 25.0    # Upper bound for /api/logs?wait= long-polls
+EVENTS_STATUS_SEC = 0.5    # Min interval between status deltas on /api/events
+EVENTS_KEEPALIVE_SEC = 15.0
+
+RC_LOST_SEC = 0.5          # Matches the ESP32 IBusBM RC_LOST window
+RC_WAIT_LOG_SEC = 5.0      # Repeat interval for "waiting"/"lost" log lines
+RC_LINK_PUBLISH_SEC = 0.25  # Max age of the rc_link summary in BridgeSnapshot
+# Dashboard requests run on Flask threads in this process; the bridge thread waits
+# up to one GIL switch interval (Python's default is 5 ms) each time it wakes behind one
+GIL_SWITCH_INTERVAL_SEC = 0.0005
+RC_INTERVAL_DEFAULT = 0.02  # Failsafe frame interval before any RC rate is measured (pc_rc_sender 50 Hz)
+RC_INTERVAL_MIN = 0.007     # Native iBUS frame period
+RC_INTERVAL_MAX = 0.1
+# pc_rc_sender.py --mode delta sends still sticks only as keepalives this far apart: a
+# failsafe timeout must stay well above it or the thrusters flip to neutral between them
+RC_SENDER_KEEPALIVE_SEC = 0.2
+
+
+class RcBridge:
+    """
+    UDP iBUS receiver → UART TX | UART RX → Logs, driven by one selector.
+
+    run() blocks in selectors (epoll on Linux) on the UDP sockets, the UART
+    file descriptor and a wake pipe, so UDP→UART forwarding and ESP32 output
+    are handled the moment they arrive and the thread sleeps when idle. The
+    RC-lost watchdog and its log lines are deadlines in a small heap that set
+    the selector timeout, instead of being re-checked on every pass.
+    """
 
-    while True:
-        # Read incoming UDP packets (raw 32-byte iBUS frames)
-        readable, _, _ = select.select([sock], [], [], 0.02)
-        if readable:
+    def __init__(self, state: SharedState, args):
+        self.state = state
+        self.args = args
+        self.socks = {}              # socket → "ip:port" label of its listen address
+        self.readers = {}            # socket → DatagramBatchReader
+        self.uart_dev = None
+        self.uart_demux = UartDemux()
+        self.uart_flow = UartFlowStats()
+        self.uart_tx = UartTxStats()
+        self._uart_pending = None      # Newest iBUS frame waiting for the TX queue to drain
+        self._uart_drain_armed = False
+        self.esp32 = Esp32Tracker(state)
+        # Link mode: "base" at --baud, "negotiating", or "fast" at --link-baud
+        self.uart_baud = args.baud
+        self.link_mode = "base"
+        self.link_negotiations = 0
+        self.link_fallbacks = 0
+        self.link_negotiate_ms = None  # Request → verified pong of the last successful switch
+        self.link_unknown_frames = 0
+        self._link_epoch = 0           # Invalidates timers of an earlier negotiation
+        self._link_started = 0.0
+        self._link_nonce = 0
+        self._link_pong_time = 0.0
+        self.last_rx_time = 0.0
+        self.wakeups = 0
+        # Bridge-owned counters, published to state.bridge by _publish()
+        self.packets_rx = 0
+        self.packets_uart_tx = 0
+        self.uart_rx_lines = 0
+        self.uart_open = False
+        self.last_rc_sender = ""
+        self.rc_dropped = 0
+        self.rc_coalesced = 0
+        self.rc_max_batch = 0
+        self.rc_link = RcLinkStats()
+        # Pi-side failsafe: after failsafe_sec without an iBUS frame, send the
+        # configured profile at the measured RC rate until real frames return
+        self.failsafe_sec = getattr(args, "failsafe_ms", 0) / 1000.0
+        self.last_frame_time = 0.0     # Last fresh iBUS frame (not just any datagram)
+        self.rc_interval = RC_INTERVAL_DEFAULT
+        self.failsafe_active = False
+        self.failsafe_entries = 0
+        self.failsafe_frames = 0
+        self.failsafe_total_sec = 0.0
+        self.failsafe_entry_gap_ms = None   # RC silence when the last failsafe engaged
+        self.failsafe_last_sec = None       # Length of the last completed failsafe period
+        self._failsafe_since = 0.0
+        self._failsafe_epoch = 0
+        self._failsafe_next = 0.0
+        self._version = 0
+        self._link_snapshot = {}
+        self._uart_snapshot = {}
+        self._link_published = 0.0
+        self.timers = []             # heap of (deadline, seq, callback)
+        self._timer_seq = 0
+        self.selector = None
+        self._running = False
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+
+    # ── setup ───────────────────────────────────────────────────────────────
+    def open(self) -> bool:
+        """Bind the UDP sockets and open the UART. Returns False if no socket bound."""
+        state, args = self.state, self.args
+        # One socket per listen address; redundant links from the PC sender may
+        # arrive on different ports/NICs and are deduplicated by sequence number
+        listen_addrs = [(args.listen_ip, args.listen_port)] + [
+            parse_listen_addr(spec, args.listen_port) for spec in args.extra_listen
+        ]
+        for listen_ip, listen_port in listen_addrs:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             try:
-                data, addr = sock.recvfrom(2048)
-                if data:
-                    now = time.monotonic()
-                    last_rx_time = now
-
-                    sender = f"{addr[0]}:{addr[1]}"
-
-                    with state.lock:
-                        state.last_rc_time = now
-                        state.last_rc_sender = sender
-                        state.packets_rx += 1
-                        pkt_count = state.packets_rx  # read count safely inside lock
-
-                    # Forward raw 32-byte binary iBUS frame directly to ESP32.
-                    # IBusBM on the ESP32 expects binary iBUS protocol, not ASCII text.
-                    if uart_dev and len(data) == IBUS_FRAME_LEN and data[:2] == IBUS_HEADER:
-                        with suppress(Exception):
-                            uart_dev.write(data)
-                            with state.lock:
-                                state.packets_uart_tx += 1
-
-                    # Use lock-safe local copy for log rate checks
-                    if pkt_count == 1:
-                        print(f"✓ First raw iBUS packet received from {addr[0]}")
-                        state.add_log("RC", f"First UDP frame from {sender}")
-                    elif pkt_count % 50 == 0:
-                        state.add_log("RC", f"Relayed {pkt_count} iBUS frames to ESP32")
+                sock.bind((listen_ip, listen_port))
+                sock.setblocking(False)
+                self.socks[sock] = f"{listen_ip}:{listen_port}"
+                self.readers[sock] = DatagramBatchReader(sock)
+                print(f"✓ UDP bound to {listen_ip}:{listen_port}")
+                state.add_log("PI", f"UDP listening {listen_ip}:{listen_port}")
+            except OSError as e:
+                sock.close()
+                print(f"✗ ERROR: Cannot bind UDP {listen_ip}:{listen_port}: {e}")
+                state.add_log("PI", f"ERROR: UDP bind failed: {e}")
+        if not self.socks:
+            print("✗ FATAL: No UDP listen socket could be bound")
+            return False
+
+        # ── UART setup ──────────────────────────────────────────────────────────
+        try:
+            self.uart_dev = serial.Serial(args.uart_port, args.baud, timeout=0)
+            print(f"✓ UART open: {args.uart_port} @ {args.baud}")
+            state.add_log("PI", f"UART open {args.uart_port} @ {args.baud}")
+            self.uart_open = True
+        except Exception as e:
+            print(f"✗ WARNING: Cannot open UART {args.uart_port}: {e}")
+            state.add_log("PI", f"UART error: {e}")
+            self.uart_open = False
+        self._publish(link=True)
+        return True
+
+    def _publish(self, link: bool = False):
+        """Swap a fresh immutable snapshot of the counters into state.bridge."""
+        now = time.monotonic()
+        # Percentiles cost a sort, so the link summary is refreshed at a lower rate
+        if link or now - self._link_published >= RC_LINK_PUBLISH_SEC:
+            self._link_snapshot = self.rc_link.snapshot()
+            self._uart_snapshot = self._uart_link_summary(now)
+            self._link_published = now
+        self._version += 1
+        self.state.bridge = BridgeSnapshot(
+            version=self._version,
+            published=now,
+            last_rc_time=self.last_rx_time,
+            last_rc_sender=self.last_rc_sender,
+            packets_rx=self.packets_rx,
+            packets_uart_tx=self.packets_uart_tx,
+            uart_rx_lines=self.uart_rx_lines,
+            uart_open=self.uart_open,
+            rc_dropped=self.rc_dropped,
+            rc_coalesced=self.rc_coalesced,
+            rc_max_batch=self.rc_max_batch,
+            uart_stale_dropped=self.uart_tx.stale_dropped,
+            uart_queue_bytes=self.uart_tx.queue_bytes,
+            rc_link=self._link_snapshot,
+            uart_link=self._uart_snapshot,
+            failsafe=self._failsafe_summary(now),
+        )
+
+    def _failsafe_summary(self, now: float) -> dict:
+        return {
+            "enabled": self.failsafe_sec > 0,
+            "timeout_ms": round(self.failsafe_sec * 1000.0, 1),
+            "active": self.failsafe_active,
+            "active_sec": round(now - self._failsafe_since, 3) if self.failsafe_active else 0.0,
+            "entries": self.failsafe_entries,
+            "frames": self.failsafe_frames,
+            "total_sec": round(self.failsafe_total_sec + (now - self._failsafe_since if self.failsafe_active else 0.0), 3),
+            "entry_gap_ms": self.failsafe_entry_gap_ms,
+            "last_sec": self.failsafe_last_sec,
+            "interval_ms": round(self.rc_interval * 1000.0, 2),
+        }
+
+    def _uart_link_summary(self, now: float) -> dict:
+        demux = self.uart_demux
+        summary = {
+            "baud": self.uart_baud,
+            "mode": self.link_mode,
+            "negotiations": self.link_negotiations,
+            "fallbacks": self.link_fallbacks,
+            "negotiate_ms": self.link_negotiate_ms,
+            "frames": demux.frames,
+            "crc_errors": demux.crc_errors,
+            "unknown_frames": self.link_unknown_frames,
+        }
+        summary.update(self.uart_flow.snapshot(now, self.uart_baud))
+        summary["tx_path"] = self.uart_tx.snapshot()
+        return summary
+
+    def close(self):
+        for sock in self.socks:
+            sock.close()
+        self.socks.clear()
+        if self.uart_dev:
+            with suppress(Exception):
+                self.uart_dev.close()
+        if self.selector:
+            self.selector.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def stop(self):
+        """Ask run() to return; safe to call from another thread."""
+        self._running = False
+        with suppress(OSError):
+            os.write(self._wake_w, b"\0")
+
+    # ── event handlers ──────────────────────────────────────────────────────
+    def handle_udp(self, socks):
+        """Drain every ready socket and forward only the newest fresh iBUS frame.
+
+        After a network stall the kernel queue can hold many frames; replaying
+        them all would drive the thrusters through old stick positions, so
+        every fresh frame but the last is counted as coalesced instead.
+        """
+        state = self.state
+        batch = []
+        for sock in socks:
+            try:
+                datagrams = self.readers[sock].read()
             except Exception as e:
                 state.add_log("PI", f"UDP receive error: {e}")
+                continue
+            if datagrams:
+                batch.append((sock, datagrams))
+        if not batch:
+            return
+        now = time.monotonic()
+        # Arrival order across all sockets, by kernel receive time: the first copy of a
+        # redundant frame wins whichever socket happens to be read first
+        arrivals = [(recv_ns, self.socks[sock], data, addr)
+                    for sock, datagrams in batch for data, addr, recv_ns in datagrams]
+        if len(batch) > 1:
+            arrivals.sort(key=lambda arrival: arrival[0])
+
+        newest = None          # Last fresh, forwardable iBUS frame of the batch
+        fresh_frames = 0
+        last_fresh_addr = None
+        rc_link = self.rc_link
+        pkt_before = self.packets_rx
+        for recv_ns, listen, data, addr in arrivals:
+            # Bare frame or versioned envelope (seq + sender timestamp)
+            unpacked = unpack_rc_datagram(data)
+            frame = data if unpacked is None else unpacked[3]
+            if unpacked is None:
+                # Not iBUS at all (e.g. a manual test packet) – still proves
+                # the link is alive, but is never forwarded
+                rc_link.malformed += 1
+                fresh = True
+            elif unpacked[1] is None:
+                rc_link.bare_frames += 1
+                fresh = True
+            else:
+                # First copy of a sequence number wins, whichever link it used
+                session, seq, sender_ts_us, _ = unpacked
+                fresh = rc_link.on_envelope(session, seq, sender_ts_us, recv_ns // 1000,
+                                            f"{addr[0]} → {listen}")
+            # Duplicates and late (reordered) datagrams never reach the UART –
+            # replaying an older stick position is worse than skipping it
+            if not fresh:
+                self.rc_dropped += 1
+                continue
+            last_fresh_addr = addr
+            if len(frame) == IBUS_FRAME_LEN and frame[:2] == IBUS_HEADER:
+                fresh_frames += 1
+                newest = frame
+        self.packets_rx += len(arrivals)
+        if fresh_frames > 1:
+            self.rc_coalesced += fresh_frames - 1
+        self.rc_max_batch = max(self.rc_max_batch, self.packets_rx - pkt_before)
+        pkt_count = self.packets_rx
+
+        if last_fresh_addr is not None:
+            if self.last_rx_time == 0:
+                # First frame: swap the "waiting" log timer for the RC-lost watchdog
+                self._schedule(now + RC_LOST_SEC, self._check_rc_lost)
+            self.last_rx_time = now
+            self.last_rc_sender = f"{last_fresh_addr[0]}:{last_fresh_addr[1]}"
+
+        # Forward raw 32-byte binary iBUS frame directly to ESP32.
+        # IBusBM on the ESP32 expects binary iBUS protocol, not ASCII text.
+        if newest is not None:
+            self._on_rc_frame(now)
+        if self.uart_dev and newest is not None:
+            self._uart_write_frame(newest, now)
+        self._publish()
+
+        if pkt_before == 0:
+            addr = batch[0][1][0][1]
+            print(f"✓ First raw iBUS packet received from {addr[0]}")
+            state.add_log("RC", f"First UDP frame from {addr[0]}:{addr[1]}")
+        if pkt_count // 50 != pkt_before // 50:
+            state.add_log("RC", f"Relayed {pkt_count} iBUS frames to ESP32")
+
+    def _uart_write_frame(self, frame: bytes, now: float) -> bool:
+        """Write an iBUS frame only once the kernel TX queue is empty; True if it was written now.
+
+        A frame written behind another would reach the ESP32 after a stick
+        position that is already out of date, and under sustained overload the
+        queue (and the delay) would grow without bound. Instead the frame is
+        held in a single slot, replaced by any newer frame, and written when
+        the queue has drained, so at most the frame in the UART FIFO is ahead
+        of it.
+        """
+        uart_dev, tx = self.uart_dev, self.uart_tx
+        try:
+            queued = uart_dev.out_waiting      # TIOCOUTQ
+        except Exception:
+            queued = 0
+        tx.on_queue(queued)
+        if self._uart_pending is not None and self._uart_pending is not frame:
+            tx.stale_dropped += 1              # Superseded before it reached the wire
+            self._uart_pending = None
+        if queued:
+            tx.deferred += 1
+            self._uart_pending = frame
+            if not self._uart_drain_armed:
+                self._uart_drain_armed = True
+                self._schedule(now + queued * 10.0 / self.uart_baud, self._uart_drain)
+            return False
+        self._uart_pending = None
+        t0 = time.perf_counter_ns()
+        try:
+            uart_dev.write(frame)
+        except Exception:
+            tx.write_errors += 1
+            return False
+        tx.write_us.append((time.perf_counter_ns() - t0) / 1000.0)
+        self.packets_uart_tx += 1
+        self.uart_flow.tx_bytes += len(frame)
+        return True
+
+    def _uart_drain(self, now: float):
+        self._uart_drain_armed = False
+        frame = self._uart_pending
+        if frame is not None and self.uart_dev:
+            written = self._uart_write_frame(frame, now)
+            if written and self.failsafe_active and frame is self.state.failsafe_profile.frame:
+                self.failsafe_frames += 1      # A held failsafe frame that made it out after all
+            self._publish()
+
+    def handle_uart_rx(self, chunk: bytes):
+        """Split ESP32 output into lines and link frames; log the lines."""
+        self.uart_flow.rx_bytes += len(chunk)
+        lines, frames = self.uart_demux.feed(chunk)
+        for msg_type, payload in frames:
+            if msg_type == LINK_MSG_TEXT:
+                if line := payload.decode("ascii", errors="replace").strip():
+                    lines.append(line)
+            else:
+                self._on_link_frame(msg_type, payload)
+        if lines:
+            self.state.add_logs("ESP32", lines)
+            for line in lines:
+                self.esp32.feed(line)
+            self.uart_rx_lines += len(lines)
+        self.esp32.publish()
+
+    def _on_uart_readable(self):
+        try:
+            chunk = self.uart_dev.read(self.uart_dev.in_waiting or 1)
+        except Exception as e:
+            # A dead fd stays readable forever – stop watching it instead of spinning
+            self.selector.unregister(self.uart_dev.fileno())
+            self.state.add_log("PI", f"UART read error, RX disabled: {e}")
+            return
+        if chunk:
+            self.handle_uart_rx(chunk)
+            self._publish()
+
+    # ── failsafe ────────────────────────────────────────────────────────────
+    def _on_rc_frame(self, now: float):
+        """A fresh iBUS frame arrived: track the RC rate and leave failsafe."""
+        if self.last_frame_time:
+            gap = now - self.last_frame_time
+            if not self.failsafe_active and gap < RC_INTERVAL_MAX:
+                # Smoothed so one late frame does not change the failsafe rate much
+                self.rc_interval += (max(gap, RC_INTERVAL_MIN) - self.rc_interval) / 8.0
+        elif self.failsafe_sec > 0:
+            self._schedule(now + self.failsafe_sec, self._check_failsafe)
+        self.last_frame_time = now
+        if self.failsafe_active:
+            self.failsafe_active = False
+            self._failsafe_epoch += 1
+            period = now - self._failsafe_since
+            self.failsafe_total_sec += period
+            self.failsafe_last_sec = round(period, 3)
+            self.state.add_log("PI", f"RC frames back – failsafe ended after {period:.2f}s")
+            self._schedule(now + self.failsafe_sec, self._check_failsafe)
+            self._publish(link=True)
+
+    def _check_failsafe(self, now: float):
+        # Re-armed lazily like _check_rc_lost: one timer per failsafe_sec of steady RC
+        due = self.last_frame_time + self.failsafe_sec
+        if now < due:
+            self._schedule(due, self._check_failsafe)
+            return
+        self.failsafe_active = True
+        self.failsafe_entries += 1
+        self._failsafe_since = now
+        self._failsafe_epoch += 1
+        self.failsafe_entry_gap_ms = round((now - self.last_frame_time) * 1000.0, 1)
+        self.state.add_log("PI", f"⚠ No RC frame for {self.failsafe_entry_gap_ms:.0f} ms – "
+                                 f"sending failsafe frames to ESP32")
+        self._failsafe_next = now
+        epoch = self._failsafe_epoch
+        self._failsafe_tick(now, epoch)
+
+    def _failsafe_tick(self, now: float, epoch: int):
+        if epoch != self._failsafe_epoch:
+            return               # Real frames came back (or a newer failsafe period started)
+        if self.uart_dev:
+            # Counted only once written: a frame held back by TX backpressure has not reached the ESP32
+            if self._uart_write_frame(self.state.failsafe_profile.frame, now):
+                self.failsafe_frames += 1
+        # Absolute ticks so the failsafe stream keeps the RC rate without drifting
+        self._failsafe_next = max(self._failsafe_next + self.rc_interval, now)
+        self._schedule(self._failsafe_next, lambda t: self._failsafe_tick(t, epoch))
+        self._publish()
+
+    # ── link negotiation ────────────────────────────────────────────────────
+    def _on_link_frame(self, msg_type: int, payload: bytes):
+        """Binary frame from the ESP32 (LINK_MSG_TEXT is handled as a line)."""
+        try:
+            if msg_type == LINK_MSG_CHANNELS:
+                self.esp32.feed_record(IbusLine(LINK_CHANNELS.unpack(payload)))
+            elif msg_type == LINK_MSG_CAL:
+                valid, roll, pitch, yaw = LINK_CAL.unpack(payload)
+                self.esp32.feed_record(CalLine("load", roll, pitch, yaw, valid=bool(valid)))
+            elif msg_type == LINK_MSG_BAUD_ACK:
+                self._on_baud_ack(LINK_U32.unpack(payload)[0])
+            elif msg_type == LINK_MSG_PONG:
+                self._on_pong(LINK_U32.unpack(payload)[0])
+            else:
+                self.link_unknown_frames += 1
+        except struct.error:
+            self.link_unknown_frames += 1
+
+    def _link_send(self, msg_type: int, payload: bytes = b""):
+        frame = pack_link_frame(msg_type, payload)
+        with suppress(Exception):
+            self.uart_dev.write(frame)
+            self.uart_flow.tx_bytes += len(frame)
+
+    def _set_baud(self, baud: int):
+        # Let queued bytes leave at the old rate before the divisor changes
+        with suppress(Exception):
+            self.uart_dev.flush()
+            self.uart_dev.baudrate = baud
+        self.uart_baud = baud
+
+    def _start_negotiation(self, now: float):
+        """Ask the ESP32 to move to --link-baud; stays at --baud unless every step succeeds."""
+        if not self.uart_dev or self.link_mode != "base":
+            return
+        self._link_epoch += 1
+        self.link_negotiations += 1
+        self.link_mode = "negotiating"
+        self._link_started = now
+        self._link_send(LINK_MSG_BAUD_REQUEST, LINK_U32.pack(self.args.link_baud))
+        epoch = self._link_epoch
+        self._schedule(now + LINK_NEGOTIATE_SEC, lambda t: self._negotiation_timeout(t, epoch))
+
+    def _on_baud_ack(self, baud: int):
+        if self.link_mode != "negotiating":
+            return
+        if baud != self.args.link_baud:
+            self._link_fallback(time.monotonic(), f"ESP32 refused {self.args.link_baud} baud")
+            return
+        # The ESP32 switched right after its ack; prove the new rate both ways
+        self._set_baud(baud)
+        self._link_nonce += 1
+        self._link_send(LINK_MSG_PING, LINK_U32.pack(self._link_nonce))
+
+    def _on_pong(self, nonce: int):
+        if nonce != self._link_nonce:
+            return
+        now = time.monotonic()
+        self._link_pong_time = now
+        if self.link_mode == "negotiating":
+            self.link_mode = "fast"
+            self.link_negotiate_ms = round((now - self._link_started) * 1000.0, 2)
+            self.state.add_log("PI", f"UART link at {self.uart_baud} baud "
+                                     f"(negotiated in {self.link_negotiate_ms} ms)")
+            epoch = self._link_epoch
+            self._schedule(now + LINK_KEEPALIVE_SEC, lambda t: self._link_keepalive(t, epoch))
+            self._publish(link=True)
+
+    def _negotiation_timeout(self, now: float, epoch: int):
+        if epoch == self._link_epoch and self.link_mode == "negotiating":
+            # Old firmware ignores the request: stay at --baud
+            self._link_fallback(now, f"no answer to {self.args.link_baud} baud request")
+
+    def _link_keepalive(self, now: float, epoch: int):
+        if epoch != self._link_epoch or self.link_mode != "fast":
+            return
+        if now - self._link_pong_time > 2 * LINK_KEEPALIVE_SEC:
+            # The ESP32 reverts to --baud on its own once pings stop, e.g. after a reset
+            self._link_fallback(now, f"no pong at {self.uart_baud} baud")
+            return
+        self._link_nonce += 1
+        self._link_send(LINK_MSG_PING, LINK_U32.pack(self._link_nonce))
+        self._schedule(now + LINK_KEEPALIVE_SEC, lambda t: self._link_keepalive(t, epoch))
+
+    def _link_fallback(self, now: float, reason: str):
+        self._link_epoch += 1
+        self.link_fallbacks += 1
+        self.link_mode = "base"
+        if self.uart_baud != self.args.baud:
+            self._set_baud(self.args.baud)
+        self.state.add_log("PI", f"UART link stays at {self.args.baud} baud: {reason}")
+        self._schedule(now + LINK_RETRY_SEC, self._start_negotiation)
+        self._publish(link=True)
+
+    # ── deadlines ───────────────────────────────────────────────────────────
+    def _schedule(self, deadline: float, callback):
+        self._timer_seq += 1
+        heapq.heappush(self.timers, (deadline, self._timer_seq, callback))
+
+    def _run_due_timers(self) -> Optional[float]:
+        """Fire expired deadlines; return seconds until the next one (None if none)."""
+        timers = self.timers
+        while timers:
+            now = time.monotonic()
+            deadline, _, callback = timers[0]
+            if deadline > now:
+                return deadline - now
+            heapq.heappop(timers)
+            callback(now)
+        return None
+
+    def _log_waiting(self, now: float):
+        if self.last_rx_time == 0:
+            self.state.add_log("PI", "⚠ Waiting for first RC frame from PC sender...")
+            self._schedule(now + RC_WAIT_LOG_SEC, self._log_waiting)
+
+    def _check_rc_lost(self, now: float):
+        # Re-armed lazily from the last frame time, so a steady RC stream costs
+        # one timer pop per RC_LOST_SEC rather than a heap push per packet
+        lost_at = self.last_rx_time + RC_LOST_SEC
+        if now < lost_at:
+            self._schedule(lost_at, self._check_rc_lost)
+            return
+        # RC signal lost. With --failsafe-ms the Pi is already streaming the
+        # failsafe profile; otherwise nothing is sent and the ESP32's own
+        # RC_LOST_US (500 ms) watchdog takes over when frames stop arriving.
+        self._log_rc_lost(now)
+
+    def _log_rc_lost(self, now: float):
+        if now - self.last_rx_time < RC_LOST_SEC:
+            # Link came back – resume watching for the next loss
+            self._schedule(self.last_rx_time + RC_LOST_SEC, self._check_rc_lost)
+            return
+        if self.failsafe_active:
+            self.state.add_log("PI", f"⚠ RC signal lost – sending failsafe frames ({self.failsafe_frames} so far)")
+        else:
+            self.state.add_log("PI", "⚠ RC signal lost – nothing forwarded, ESP32 failsafe takes over")
+        self._publish(link=True)
+        self._schedule(now + RC_WAIT_LOG_SEC, self._log_rc_lost)
+
+    # ── loops ───────────────────────────────────────────────────────────────
+    def run(self):
+        """Event loop: sleep in the selector until a socket, the UART or a deadline is due."""
+        self.selector = selectors.DefaultSelector()
+        for sock in self.socks:
+            self.selector.register(sock, selectors.EVENT_READ, "udp")
+        if self.uart_dev:
+            self.selector.register(self.uart_dev.fileno(), selectors.EVENT_READ, self._on_uart_readable)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._schedule(time.monotonic(), self._log_waiting)
+        link_baud = getattr(self.args, "link_baud", 0)
+        if self.uart_dev and link_baud and link_baud != self.args.baud:
+            self._schedule(time.monotonic(), self._start_negotiation)
+        self._running = True
+
+        print(f"✓ Bridge loop running – awaiting raw iBUS frames on UDP {self.args.listen_port}...")
+
+        while self._running:
+            timeout = self._run_due_timers()
+            events = self.selector.select(timeout)
+            self.wakeups += 1
+            udp_ready = []
+            for key, _ in events:
+                if key.data is None:
+                    with suppress(OSError):
+                        os.read(self._wake_r, 64)
+                elif key.data == "udp":
+                    udp_ready.append(key.fileobj)
+                else:
+                    key.data()
+            if udp_ready:
+                # All links drained together so only the newest frame is forwarded
+                self.handle_udp(udp_ready)
+
+
+def bridge_loop(state: SharedState, args):
+    """
+    Main relay loop: UDP iBUS receiver → UART TX | UART RX → Logs
+    """
+    bridge = RcBridge(state, args)
+    if not bridge.open():
+        return
+    bridge.run()
+
+@dataclass(frozen=True)
+class StaticAsset:
+    mimetype: str
+    encodings: dict        # content-coding ("identity", "gzip", "br") -> body bytes
+    etag: str
+    last_modified: int
+    cache_control: str
+
+
+class DashboardAssets:
+    """Dashboard files loaded, rendered and compressed once at startup.
+
+    index.html is a Jinja template rendered a single time with versioned
+    URLs for the CSS/JS (?v=<content hash>), so those can be cached by the
+    browser indefinitely while the page itself is revalidated with
+    ETag/Last-Modified and usually answered with 304. Every asset is kept
+    as identity, gzip and (when the brotli module is installed) br bodies;
+    a request only picks one by Accept-Encoding.
+    """
+
+    def __init__(self, root: str = STATIC_DIR):
+        self.assets: dict = {}
+        names = sorted(n for n in os.listdir(root) if n != "index.html")
+        for name in names:
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                self._add(name, f.read(), os.path.getmtime(path),
+                          f"public, max-age={ASSET_MAX_AGE}, immutable")
+        index = os.path.join(root, "index.html")
+        with open(index, encoding="utf-8") as f:
+            template = Template(f.read())
+        html = template.render(asset_url=self.url).encode()
+        newest = max([os.path.getmtime(index)] + [a.last_modified for a in self.assets.values()])
+        self._add("index.html", html, newest, "no-cache")
+
+    def _add(self, name: str, body: bytes, mtime: float, cache_control: str):
+        encodings = {"identity": body, "gzip": gzip.compress(body, 9, mtime=0)}
+        if brotli is not None:
+            encodings["br"] = brotli.compress(body)
+        self.assets[name] = StaticAsset(
+            mimetype=mimetypes.guess_type(name)[0] or "application/octet-stream",
+            encodings=encodings,
+            etag=hashlib.sha1(body).hexdigest()[:16],
+            last_modified=int(mtime),
+            cache_control=cache_control,
+        )
+
+    def url(self, name: str) -> str:
+        return f"/static/{name}?v={self.assets[name].etag}"
+
+    def response(self, name: str) -> Response:
+        asset = self.assets.get(name)
+        if asset is None:
+            abort(404)
+        # If-None-Match wins over If-Modified-Since when both are sent
+        if request.if_none_match:
+            fresh = request.if_none_match.contains_weak(asset.etag)
+        else:
+            since = request.if_modified_since
+            fresh = since is not None and since.timestamp() >= asset.last_modified
+        if fresh:
+            resp = Response(status=304)
+        else:
+            accepted = request.accept_encodings
+            coding = next((c for c in ("br", "gzip") if c in asset.encodings and accepted[c]), "identity")
+            resp = Response(asset.encodings[coding], mimetype=asset.mimetype)
+            if coding != "identity":
+                resp.headers["Content-Encoding"] = coding
+        # Weak ETag: the same tag covers every content-coding of the asset
+        resp.set_etag(asset.etag, weak=True)
+        resp.headers["Last-Modified"] = http_date(asset.last_modified)
+        resp.headers["Cache-Control"] = asset.cache_control
+        resp.headers["Vary"] = "Accept-Encoding"
+        return resp
 
-        # Read incoming UART logs from ESP32
-        if uart_dev:
-            with suppress(Exception):
-                if available := uart_dev.in_waiting:
-                    chunk = uart_dev.read(available)
-                    for b in chunk:
-                        if b == ord('\n'):
-                            if line_str := uart_line_buf.decode('ascii', errors='replace').strip():
-                                state.add_log("ESP32", line_str)
-                                with state.lock:
-                                    state.uart_rx_lines += 1
-                            uart_line_buf.clear()
-                        elif b != ord('\r'):
-                            uart_line_buf.append(b)
-                            if len(uart_line_buf) > 256:
-                                uart_line_buf.clear()  # Prevent memory leak on missing newlines
-
-        now_mono = time.monotonic()
-        if last_rx_time == 0:
-            bucket = int(now_mono) // 5
-            if bucket != last_no_rx_log_sec:
-                last_no_rx_log_sec = bucket
-                state.add_log("PI", "⚠ Waiting for first RC frame from PC sender...")
-        elif (now_mono - last_rx_time) > 0.5:
-            # RC signal lost – stop forwarding frames.
-            # ESP32 IBusBM has a built-in RC_LOST_US (500 ms) watchdog;
-            # it enters failsafe automatically when frames stop arriving.
-            bucket = int(now_mono) // 5
-            if bucket != last_no_rx_log_sec:
-                last_no_rx_log_sec = bucket
-                state.add_log("PI", "⚠ RC signal lost – sent NO_SIGNAL to ESP32")
 
 def create_app(state: SharedState, gpio: GpioController, args):
-    app = Flask(__name__)
+    # Flask's own static route would bypass the precompressed copies
+    app = Flask(__name__, static_folder=None)
+    assets = DashboardAssets()
+    # Servo/GPIO commands from /ws/control go through the coalescing channel;
+    # the REST endpoints below still call GpioController directly
+    control = ControlChannel(gpio) if gpio is not None else None
 
     @app.get("/")
     def dashboard():
-        # Dynamically determine the host for the video feed based on how the dashboard was accessed
-        host = request.host.split(':')[0]
-        video_url = f"http://{host}:8081/video_feed"
-        return render_template_string(DASHBOARD_HTML, video_url=video_url)
+        return assets.response("index.html")
 
+    @app.get("/static/<path:name>")
+    def static_asset(name):
+        return assets.response(name)
 
-    @app.get("/api/status")
-    def api_status():
-        # Snapshot shared state under lock, then do I/O outside
+    def build_status() -> dict:
+        # Bridge counters come from its latest immutable snapshot – no lock;
+        # only the GPIO fields still live under state.lock
+        bridge = state.bridge
+        last_rc_time = bridge.last_rc_time
         with state.lock:
-            last_rc_time = state.last_rc_time
-            snap = {
-                "packets_rx": state.packets_rx,
-                "packets_uart_tx": state.packets_uart_tx,
-                "uart_rx_lines": state.uart_rx_lines,
-                "uart_open": state.uart_open,
-                "last_rc_sender": state.last_rc_sender,
-                "blink_active": state.blink_active,
-                "relay_state": state.relay_state,
-            }
-        last_age = (time.monotonic() - last_rc_time) if last_rc_time > 0 else 9999.0
+            blink_active = state.blink_active
+            relay_state = state.relay_state
+        now = time.monotonic()
+        rc_link = dict(bridge.rc_link)
+        rc_link["paths"] = {
+            name: {**ps, "last_arrival_age_sec": round(now - ps["last_arrival"], 3) if ps["last_arrival"] else None}
+            for name, ps in rc_link.get("paths", {}).items()
+        }
+        snap = {
+            "packets_rx": bridge.packets_rx,
+            "packets_uart_tx": bridge.packets_uart_tx,
+            "uart_rx_lines": bridge.uart_rx_lines,
+            "uart_open": bridge.uart_open,
+            "last_rc_sender": bridge.last_rc_sender,
+            "rc_dropped": bridge.rc_dropped,
+            "rc_coalesced": bridge.rc_coalesced,
+            "rc_max_batch": bridge.rc_max_batch,
+            "rc_link": rc_link,
+            "uart_link": bridge.uart_link,
+            "failsafe": {**bridge.failsafe, "channels": list(state.failsafe_profile.channels)},
+            "blink_active": blink_active,
+            "relay_state": relay_state,
+        }
+        last_age = (now - last_rc_time) if last_rc_time > 0 else 9999.0
         # Use 2.0 s threshold: gives headroom for the 500 ms JS poll interval
         # and any network/OS scheduling jitter without false "SIGNAL LOST" flicker.
         snap["link_alive"] = last_age < 2.0
         snap["last_rc_age_sec"] = round(last_age, 3)
-        snap["ethernet_up"] = check_ethernet_up(args.eth_interface)
-        return jsonify(snap)
+        # Cached by LinkMonitor; no subprocess per request
+        link = state.link
+        snap["ethernet_up"] = link.up
+        snap["ethernet"] = {
+            "interface": link.interface or args.eth_interface,
+            **link.state,
+            "flaps": link.flaps,
+            "last_change_age_sec": round(now - link.last_change, 3) if link.last_change else None,
+            "events": list(link.events),
+        }
+        snap["telemetry"] = asdict(state.telemetry)
+        esp32 = state.esp32
+        snap["esp32"] = {
+            "channels": list(esp32.channels),
+            "channels_age_sec": round(now - esp32.channels_time, 3) if esp32.channels_time else None,
+            "calibration": esp32.calibration,
+            "boots": esp32.boots,
+            "boot_messages": list(esp32.boot_messages),
+            "boot_failures": list(esp32.boot_failures),
+            "parsed": esp32.parsed,
+            "unparsed": esp32.unparsed,
+        }
+        if control is not None:
+            snap["control"] = control.snapshot()
+        return snap
+
+    @app.get("/api/status")
+    def api_status():
+        return jsonify(build_status())
 
     @app.get("/api/logs")
     def api_logs():
@@ -859,7 +2618,122 @@ def create_app(state: SharedState, gpio: GpioController, args):
             since = int(request.args.get("since", "0"))
         except ValueError:
             since = 0
-        return jsonify({"logs": state.get_logs_since(since)})
+        try:
+            limit = max(1, int(request.args.get("limit", LOG_API_LIMIT)))
+        except ValueError:
+            limit = LOG_API_LIMIT
+        # ?wait=N turns this into a long-poll: block until a newer line exists
+        try:
+            wait = min(max(0.0, float(request.args.get("wait", "0"))), LOG_WAIT_MAX_SEC)
+        except ValueError:
+            wait = 0.0
+        return jsonify({"logs": state.get_logs_since(since, limit, wait)})
+
+    @app.get("/api/metrics")
+    def api_metrics():
+        """History of one metric: ?name=&from=&step=.
+
+        from is a Unix time, or seconds before now when negative (default
+        -300). step is the bucket width in seconds; 0 returns raw samples.
+        Points are [t, avg, min, max]. Without name, lists the metrics and
+        their latest values.
+        """
+        name = request.args.get("name")
+        if not name:
+            return jsonify({"metrics": state.metrics.latest()})
+        try:
+            t_from = float(request.args.get("from", "-300"))
+            step = max(0.0, float(request.args.get("step", "1")))
+        except ValueError:
+            return jsonify({"error": "from and step must be numbers"}), 400
+        if t_from < 0:
+            t_from += time.time()
+        result = state.metrics.query(name, t_from, step)
+        if result is None:
+            return jsonify({"error": f"unknown metric {name!r}"}), 404
+        resolution, points = result
+        return jsonify({"name": name, "from": t_from, "step": max(step, resolution),
+                        "resolution": resolution, "points": points})
+
+    @app.get("/api/events")
+    def api_events():
+        """Server-Sent Events: log lines as they are added, status as deltas.
+
+        `logs` events carry the new lines and set the SSE id to the newest
+        log id, so a reconnecting EventSource resumes via Last-Event-ID.
+        `status` events carry only the fields that changed since the last
+        one, at most every EVENTS_STATUS_SEC.
+        """
+        try:
+            since = int(request.headers.get("Last-Event-ID") or request.args.get("since", "0"))
+        except ValueError:
+            since = 0
+
+        def stream(since: int):
+            last_status = {}
+            next_status = 0.0
+            last_sent = time.monotonic()
+            yield "retry: 2000\n\n"
+            while True:
+                now = time.monotonic()
+                state.logs.wait_newer(since, max(0.0, min(next_status, last_sent + EVENTS_KEEPALIVE_SEC) - now))
+                logs = state.get_logs_since(since, LOG_API_LIMIT)
+                if logs:
+                    since = logs[-1]["id"]
+                    last_sent = time.monotonic()
+                    yield f"event: logs\nid: {since}\ndata: {json.dumps(logs)}\n\n"
+                now = time.monotonic()
+                if now >= next_status:
+                    next_status = now + EVENTS_STATUS_SEC
+                    status = build_status()
+                    delta = {k: v for k, v in status.items() if last_status.get(k) != v}
+                    last_status = status
+                    if delta:
+                        last_sent = now
+                        yield f"event: status\ndata: {json.dumps(delta)}\n\n"
+                if now - last_sent >= EVENTS_KEEPALIVE_SEC:
+                    # Comment line: keeps proxies open and detects dead clients
+                    last_sent = now
+                    yield ": keepalive\n\n"
+
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        return Response(stream_with_context(stream(since)), mimetype="text/event-stream", headers=headers)
+
+    @app.route("/api/failsafe", methods=["GET", "PUT"])
+    def api_failsafe():
+        """Channel values the bridge streams after RC loss (--failsafe-ms).
+
+        PUT {"channels": [14 values]} replaces the profile,
+        {"channels": {"3": 1500, ...}} changes single channels (1-based) and
+        {"reset": true} restores FAILSAFE_NEUTRAL. Values are RC_CHANNEL_MIN..
+        RC_CHANNEL_MAX; the new frame is used from the next failsafe tick.
+        """
+        if request.method == "PUT":
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                return jsonify({"error": "expected a JSON object"}), 400
+            try:
+                with state.lock:
+                    if data.get("reset"):
+                        channels = FAILSAFE_NEUTRAL
+                    else:
+                        update = data.get("channels")
+                        channels = list(state.failsafe_profile.channels)
+                        if isinstance(update, dict):
+                            for ch, value in update.items():
+                                if not 1 <= int(ch) <= 14:
+                                    raise ValueError(f"no channel {ch}")
+                                channels[int(ch) - 1] = value
+                        elif isinstance(update, list):
+                            channels = update
+                        else:
+                            raise ValueError("expected channels as a list or {channel: value}")
+                    # One reference swap: the bridge sees either the old or the new frame
+                    state.failsafe_profile = make_failsafe_profile(channels)
+            except (TypeError, ValueError) as e:
+                return jsonify({"error": str(e)}), 400
+            state.add_log("PI", f"Failsafe profile set: {list(state.failsafe_profile.channels)}")
+        return jsonify({"channels": list(state.failsafe_profile.channels), **state.bridge.failsafe})
 
     @app.post("/api/servo/<int:id>")
     def set_servo(id):
@@ -899,6 +2773,42 @@ def create_app(state: SharedState, gpio: GpioController, args):
             states = list(state.switch_states)
         return jsonify({"switches": states})
 
+    if WEBSOCKET_AVAILABLE and control is not None:
+        sock = Sock(app)
+
+        @sock.route("/ws/control")
+        def ws_control(ws):
+            """Persistent control channel: one JSON command per message.
+
+            {"seq": 17, "cmd": "servo", "id": 1, "value": 95}
+            cmd is servo | momentary | blink | switch. Every message is
+            answered with {"ack": seq, "ok": bool}; switch acks also carry
+            the new state. seq is per connection and must increase.
+            """
+            client = object()
+            try:
+                while True:
+                    raw = ws.receive()
+                    seq = None
+                    try:
+                        msg = json.loads(raw)
+                        seq = msg.get("seq")
+                        kind, actuator, value = ControlChannel.parse(msg)
+                        if seq is not None:
+                            seq = int(seq)
+                    except (ValueError, TypeError, AttributeError) as e:
+                        ws.send(json.dumps({"ack": seq, "ok": False, "error": str(e)}))
+                        continue
+                    if control.submit(kind, actuator, value, seq, client):
+                        reply = {"ack": seq, "ok": True}
+                        if kind == "switch":
+                            reply.update(id=actuator, state=value)
+                    else:
+                        reply = {"ack": seq, "ok": False, "error": "stale"}
+                    ws.send(json.dumps(reply))
+            finally:
+                control.forget(client)
+
     return app
 
 
@@ -906,12 +2816,37 @@ def main():
     parser = argparse.ArgumentParser(description="Pi Transparent UDP-to-UART Relay")
     parser.add_argument("--listen-ip", default="0.0.0.0")
     parser.add_argument("--listen-port", type=int, default=5000)
+    parser.add_argument("--extra-listen", action="append", default=[], metavar="[IP:]PORT",
+                        help="Additional UDP listen address for a redundant RC link (repeatable)")
     parser.add_argument("--uart-port", default="/dev/serial0")
     parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--link-baud", type=int, default=0,
+                        help="Negotiate this UART rate with the ESP32, falling back to --baud (default: off)")
+    parser.add_argument("--failsafe-ms", type=float, default=0.0,
+                        help="Send the failsafe profile after this long without an RC frame; 0 = leave it to the "
+                             "ESP32's 500 ms timeout. Must exceed twice the sender's keepalive (400 ms for "
+                             "pc_rc_sender.py --mode delta) unless the sender runs fixed-rate (default: 0)")
+    parser.add_argument("--failsafe-channels", default="",
+                        help="14 comma-separated failsafe channel values (default: all 1500); "
+                             "editable at runtime via /api/failsafe")
     parser.add_argument("--eth-interface", default="eth0")
     parser.add_argument("--web-host", default="0.0.0.0")
     parser.add_argument("--web-port", type=int, default=8080)
+    parser.add_argument("--telemetry-hz", type=float, default=1.0,
+                        help="Pi telemetry sampling rate, 1-10 Hz (default: 1)")
+    parser.add_argument("--log-capacity", type=int, default=1000,
+                        help="Log lines kept in memory for the dashboard (default: 1000)")
     args = parser.parse_args()
+    if 0 < args.failsafe_ms < 2000.0 * RC_SENDER_KEEPALIVE_SEC:
+        print(f"[WARN] --failsafe-ms {args.failsafe_ms:g} is below twice the delta-mode sender keepalive "
+              f"({RC_SENDER_KEEPALIVE_SEC * 1000:.0f} ms): only use it with a fixed-rate sender, or still "
+              f"sticks will alternate with the failsafe profile")
+    profile = FailsafeProfile()
+    if args.failsafe_channels:
+        try:
+            profile = make_failsafe_profile(args.failsafe_channels.split(","))
+        except ValueError as e:
+            parser.error(f"--failsafe-channels: {e}")
 
     print("\\n" + "="*60)
     print("UNDERWATER ROVER SYSTEM (TRANSPARENT UART RELAY) - STARTING")
@@ -921,13 +2856,16 @@ def main():
     print(f"   Dashboard:    http://0.0.0.0:{args.web_port}")
     print(f"\\n⚡ UART:")
     print(f"   Port:         {args.uart_port} @ {args.baud} baud")
+    print("   Failsafe:     " + (f"after {args.failsafe_ms:g} ms" if args.failsafe_ms > 0 else "ESP32 timeout only"))
     print("="*60 + "\\n")
 
-    state = SharedState()
+    sys.setswitchinterval(GIL_SWITCH_INTERVAL_SEC)
+    state = SharedState(logs=LogRing(args.log_capacity), failsafe_profile=profile)
     gpio = GpioController(state)
 
     # Start System Monitor
-    sys_mon = SystemMonitor(state)
+    sys_mon = SystemMonitor(state, args.eth_interface, args.telemetry_hz)
+    LinkMonitor(state, args.eth_interface)   # Daemon thread; publishes to state.link
 
     bridge_thread = threading.Thread(target=bridge_loop, args=(state, args), daemon=True)
 
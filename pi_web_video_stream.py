@@ -1,11 +1,32 @@
 import argparse
+import ctypes
+import fcntl
+import glob
 import io
+import mmap
+import os
+import select
 import socket
+import struct
+import termios
 import time
-from threading import Lock
+from collections import deque
+from dataclasses import dataclass
+from fractions import Fraction
+from threading import Condition, Lock, Thread
 
 import cv2
-from flask import Flask, Response
+import numpy as np
+from flask import Flask, Response, jsonify, request
+
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+ENCODERS = ("auto", "picamera2", "v4l2m2m", "opencv")
+H264_ENCODERS = ("auto", "picamera2", "v4l2m2m", "libx264", "off")
 
 
 def try_picamera2(width: int, height: int, fps: int):
@@ -18,8 +39,9 @@ def try_picamera2(width: int, height: int, fps: int):
         # Mode 0 (640x480) only uses a center crop and cannot be overridden by ScalerCrop.
         full_sensor_mode = cam.sensor_modes[1]
 
+        # RGB888 is stored B,G,R: OpenCV's and the encoders' native layout, no conversion per frame
         config = cam.create_video_configuration(
-            main={"size": (width, height), "format": "XBGR8888"},
+            main={"size": (width, height), "format": "RGB888"},
             raw={"size": full_sensor_mode["size"]},
             controls={"FrameDurationLimits": (int(1e6 / fps), int(1e6 / fps))},
         )
@@ -32,13 +54,804 @@ def try_picamera2(width: int, height: int, fps: int):
         return None
 
 
+class SyntheticCapture:
+    """cv2.VideoCapture-like moving test pattern, for running the stream without a camera."""
+
+    def __init__(self, width: int = 640, height: int = 480, fps: float = 20.0, count: int = 30,
+                 paced: bool = True):
+        rng = np.random.default_rng(1)
+        y, x = np.mgrid[0:height, 0:width]
+        self.frames = []
+        for i in range(count):
+            # Moving gradient plus noise: roughly the JPEG cost of a real scene
+            base = ((x + 8 * i) % 256).astype(np.uint8)
+            frame = np.dstack([base, ((y + 4 * i) % 256).astype(np.uint8), (base // 2 + y // 4).astype(np.uint8)])
+            self.frames.append(np.ascontiguousarray(frame + rng.integers(0, 16, frame.shape, dtype=np.uint8)))
+        self.interval = 1.0 / fps
+        self.paced = paced
+        self.next_time = time.monotonic()
+        self.index = 0
+        self.reads = 0
+
+    def isOpened(self) -> bool:
+        return True
+
+    def set(self, prop, value) -> bool:
+        return True
+
+    def read(self, image=None):
+        """Next frame; like VideoCapture.read(image), written into image when it fits."""
+        if self.paced:
+            # A read returns the next frame, never earlier than its frame period
+            now = time.monotonic()
+            if self.next_time > now:
+                time.sleep(self.next_time - now)
+            self.next_time = max(self.next_time + self.interval, time.monotonic() - self.interval)
+            self.index = (self.index + 1) % len(self.frames)
+            frame = self.frames[self.index]
+        else:
+            frame = self.frames[int(time.monotonic() / self.interval) % len(self.frames)]
+        self.reads += 1
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    def release(self) -> None:
+        pass
+
+
+# ── Encoder backends ─────────────────────────────────────────────────────────
+# Frame encoders take a BGR frame and return the encoded bytes; push encoders
+# (push = True) are fed by the camera itself and hand finished frames to a
+# callback between start() and stop(). CameraStream runs them only while their
+# hub has viewers.
+
+class OpenCVJpegEncoder:
+    """Software JPEG on the CPU: always available, the fallback for every other backend."""
+
+    name = "opencv"
+    push = False
+
+    def __init__(self, quality: int = 80):
+        self.params = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
+
+    def encode(self, frame) -> bytes | None:
+        ok, jpeg = cv2.imencode(".jpg", frame, self.params)
+        return jpeg.tobytes() if ok else None
+
+    def close(self) -> None:
+        pass
+
+
+V4L2_BUF_TYPE_VIDEO_CAPTURE_MPLANE = 9
+V4L2_BUF_TYPE_VIDEO_OUTPUT_MPLANE = 10
+V4L2_MEMORY_MMAP = 1
+V4L2_FIELD_NONE = 1
+V4L2_CID_JPEG_COMPRESSION_QUALITY = 0x009D0903
+V4L2_CID_MPEG_VIDEO_BITRATE = 0x009909CF
+V4L2_CID_MPEG_VIDEO_REPEAT_SEQ_HEADER = 0x009909E2
+V4L2_CID_MPEG_VIDEO_FORCE_KEY_FRAME = 0x009909E5
+V4L2_CID_MPEG_VIDEO_H264_I_PERIOD = 0x00990A66
+
+
+def v4l2_fourcc(code: str) -> int:
+    return int.from_bytes(code.encode("ascii"), "little")
+
+
+class _V4l2PlanePixFormat(ctypes.Structure):
+    _pack_ = 1
+    _fields_ = [("sizeimage", ctypes.c_uint32), ("bytesperline", ctypes.c_uint32),
+                ("reserved", ctypes.c_uint16 * 6)]
+
+
+class _V4l2PixFormatMplane(ctypes.Structure):
+    _pack_ = 1
+    _fields_ = [("width", ctypes.c_uint32), ("height", ctypes.c_uint32), ("pixelformat", ctypes.c_uint32),
+                ("field", ctypes.c_uint32), ("colorspace", ctypes.c_uint32),
+                ("plane_fmt", _V4l2PlanePixFormat * 8), ("num_planes", ctypes.c_uint8),
+                ("flags", ctypes.c_uint8), ("ycbcr_enc", ctypes.c_uint8), ("quantization", ctypes.c_uint8),
+                ("xfer_func", ctypes.c_uint8), ("reserved", ctypes.c_uint8 * 7)]
+
+
+class _V4l2FormatUnion(ctypes.Union):
+    # _align: the kernel union holds pointers (struct v4l2_window), which sets its alignment
+    _fields_ = [("pix_mp", _V4l2PixFormatMplane), ("raw_data", ctypes.c_uint8 * 200), ("_align", ctypes.c_void_p)]
+
+
+class _V4l2Format(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_uint32), ("fmt", _V4l2FormatUnion)]
+
+
+class _V4l2RequestBuffers(ctypes.Structure):
+    _fields_ = [("count", ctypes.c_uint32), ("type", ctypes.c_uint32), ("memory", ctypes.c_uint32),
+                ("reserved", ctypes.c_uint32 * 2)]
+
+
+class _V4l2PlaneM(ctypes.Union):
+    _fields_ = [("mem_offset", ctypes.c_uint32), ("userptr", ctypes.c_ulong), ("fd", ctypes.c_int32)]
+
+
+class _V4l2Plane(ctypes.Structure):
+    _fields_ = [("bytesused", ctypes.c_uint32), ("length", ctypes.c_uint32), ("m", _V4l2PlaneM),
+                ("data_offset", ctypes.c_uint32), ("reserved", ctypes.c_uint32 * 11)]
+
+
+class _V4l2Timecode(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_uint32), ("flags", ctypes.c_uint32), ("frames", ctypes.c_uint8),
+                ("seconds", ctypes.c_uint8), ("minutes", ctypes.c_uint8), ("hours", ctypes.c_uint8),
+                ("userbits", ctypes.c_uint8 * 4)]
+
+
+class _V4l2BufferM(ctypes.Union):
+    _fields_ = [("offset", ctypes.c_uint32), ("userptr", ctypes.c_ulong),
+                ("planes", ctypes.POINTER(_V4l2Plane)), ("fd", ctypes.c_int32)]
+
+
+class _V4l2Buffer(ctypes.Structure):
+    _fields_ = [("index", ctypes.c_uint32), ("type", ctypes.c_uint32), ("bytesused", ctypes.c_uint32),
+                ("flags", ctypes.c_uint32), ("field", ctypes.c_uint32),
+                ("timestamp", ctypes.c_long * 2), ("timecode", _V4l2Timecode), ("sequence", ctypes.c_uint32),
+                ("memory", ctypes.c_uint32), ("m", _V4l2BufferM), ("length", ctypes.c_uint32),
+                ("reserved2", ctypes.c_uint32), ("request_fd", ctypes.c_int32)]
+
+
+class _V4l2Control(ctypes.Structure):
+    _fields_ = [("id", ctypes.c_uint32), ("value", ctypes.c_int32)]
+
+
+def _vidioc(direction: int, nr: int, size: int) -> int:
+    return (direction << 30) | (size << 16) | (ord("V") << 8) | nr
+
+
+VIDIOC_S_FMT = _vidioc(3, 5, ctypes.sizeof(_V4l2Format))
+VIDIOC_REQBUFS = _vidioc(3, 8, ctypes.sizeof(_V4l2RequestBuffers))
+VIDIOC_QUERYBUF = _vidioc(3, 9, ctypes.sizeof(_V4l2Buffer))
+VIDIOC_QBUF = _vidioc(3, 15, ctypes.sizeof(_V4l2Buffer))
+VIDIOC_DQBUF = _vidioc(3, 17, ctypes.sizeof(_V4l2Buffer))
+VIDIOC_STREAMON = _vidioc(1, 18, ctypes.sizeof(ctypes.c_int))
+VIDIOC_STREAMOFF = _vidioc(1, 19, ctypes.sizeof(ctypes.c_int))
+VIDIOC_S_CTRL = _vidioc(3, 28, ctypes.sizeof(_V4l2Control))
+
+
+def find_m2m_encoder(kind: str = "encode_image") -> str | None:
+    """Path of the bcm2835-codec encoder node ("encode_image" = JPEG, "encode" = H.264), or None."""
+    for name_path in sorted(glob.glob("/sys/class/video4linux/video*/name")):
+        try:
+            with open(name_path) as f:
+                name = f.read().strip()
+        except OSError:
+            continue
+        if name.endswith("-" + kind):
+            device = "/dev/" + name_path.split("/")[-2]
+            if os.path.exists(device):
+                return device
+    return None
+
+
+class V4L2M2MEncoder:
+    """Hardware encode on a V4L2 memory-to-memory device (bcm2835-codec on the Pi 4).
+
+    One OUTPUT buffer takes the raw BGR frame and one CAPTURE buffer returns
+    the encoded one; both are mmap'd once, so a frame costs a copy in, a few
+    ioctls while the VideoCore encodes, and a copy out. codec "JPEG" uses the
+    encode_image node; "H264" the encode node, with SPS/PPS repeated on every
+    keyframe so a stream can be joined at any IDR.
+    """
+
+    name = "v4l2m2m"
+    push = False
+
+    def __init__(self, device: str, width: int, height: int, codec: str = "JPEG", quality: int = 80,
+                 bitrate: int = 0, gop: int = 0, timeout: float = 1.0):
+        self.device = device
+        self.codec = codec
+        self.timeout = timeout
+        self.fd = os.open(device, os.O_RDWR | os.O_NONBLOCK)
+        self.maps = []
+        try:
+            self._setup(width, height, codec, quality, bitrate, gop)
+        except OSError:
+            self.close()
+            raise
+
+    def _ioctl(self, request: int, arg) -> None:
+        fcntl.ioctl(self.fd, request, arg, True)
+
+    def _set_format(self, buf_type: int, width: int, height: int, pixfmt: str, bytesperline: int,
+                    sizeimage: int) -> _V4l2PixFormatMplane:
+        fmt = _V4l2Format(type=buf_type)
+        pix = fmt.fmt.pix_mp
+        pix.width, pix.height, pix.pixelformat = width, height, v4l2_fourcc(pixfmt)
+        pix.field = V4L2_FIELD_NONE
+        pix.num_planes = 1
+        pix.plane_fmt[0].bytesperline = bytesperline
+        pix.plane_fmt[0].sizeimage = sizeimage
+        self._ioctl(VIDIOC_S_FMT, fmt)
+        return fmt.fmt.pix_mp       # The driver's values: stride and buffer size may be padded
+
+    def _map_buffer(self, buf_type: int) -> mmap.mmap:
+        req = _V4l2RequestBuffers(count=1, type=buf_type, memory=V4L2_MEMORY_MMAP)
+        self._ioctl(VIDIOC_REQBUFS, req)
+        plane = _V4l2Plane()
+        buf = _V4l2Buffer(index=0, type=buf_type, memory=V4L2_MEMORY_MMAP, length=1)
+        buf.m.planes = ctypes.pointer(plane)
+        self._ioctl(VIDIOC_QUERYBUF, buf)
+        mapping = mmap.mmap(self.fd, plane.length, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE,
+                            offset=plane.m.mem_offset)
+        self.maps.append(mapping)
+        return mapping
+
+    def _queue(self, buf_type: int, bytesused: int = 0) -> None:
+        plane = _V4l2Plane(bytesused=bytesused)
+        buf = _V4l2Buffer(index=0, type=buf_type, memory=V4L2_MEMORY_MMAP, length=1)
+        buf.m.planes = ctypes.pointer(plane)
+        self._ioctl(VIDIOC_QBUF, buf)
+
+    def _dequeue(self, buf_type: int) -> int:
+        """Wait for the buffer to come back; returns its bytesused."""
+        plane = _V4l2Plane()
+        buf = _V4l2Buffer(type=buf_type, memory=V4L2_MEMORY_MMAP, length=1)
+        buf.m.planes = ctypes.pointer(plane)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._ioctl(VIDIOC_DQBUF, buf)
+                return plane.bytesused
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"{self.device}: encoder did not return a buffer")
+                select.select([self.fd], [self.fd], [], remaining)
+
+    def _set_control(self, control: int, value: int) -> bool:
+        try:
+            self._ioctl(VIDIOC_S_CTRL, _V4l2Control(id=control, value=value))
+            return True
+        except OSError:
+            return False                    # Not supported: the driver default stays
+
+    def _setup(self, width: int, height: int, codec: str, quality: int, bitrate: int, gop: int) -> None:
+        pix = self._set_format(V4L2_BUF_TYPE_VIDEO_OUTPUT_MPLANE, width, height, "BGR3",
+                               width * 3, width * height * 3)
+        self.stride = pix.plane_fmt[0].bytesperline
+        self._set_format(V4L2_BUF_TYPE_VIDEO_CAPTURE_MPLANE, width, height, codec, 0, width * height * 3 // 2)
+        if codec == "JPEG":
+            self._set_control(V4L2_CID_JPEG_COMPRESSION_QUALITY, quality)
+        else:
+            self._set_control(V4L2_CID_MPEG_VIDEO_REPEAT_SEQ_HEADER, 1)
+            if bitrate:
+                self._set_control(V4L2_CID_MPEG_VIDEO_BITRATE, bitrate)
+            if gop:
+                self._set_control(V4L2_CID_MPEG_VIDEO_H264_I_PERIOD, gop)
+        self.out_map = self._map_buffer(V4L2_BUF_TYPE_VIDEO_OUTPUT_MPLANE)
+        self.cap_map = self._map_buffer(V4L2_BUF_TYPE_VIDEO_CAPTURE_MPLANE)
+        self.size = (width, height)
+        self.out_bytes = self.stride * height
+        # The raw frame is written straight into the driver's buffer through this view
+        rows = np.frombuffer(self.out_map, dtype=np.uint8, count=self.out_bytes).reshape(height, self.stride)
+        self.out_view = rows[:, :width * 3].reshape(height, width, 3)
+        self._queue(V4L2_BUF_TYPE_VIDEO_CAPTURE_MPLANE)
+        for buf_type in (V4L2_BUF_TYPE_VIDEO_OUTPUT_MPLANE, V4L2_BUF_TYPE_VIDEO_CAPTURE_MPLANE):
+            self._ioctl(VIDIOC_STREAMON, ctypes.c_int(buf_type))
+        self.streaming = True
+
+    def encode(self, frame) -> bytes | None:
+        if frame.shape[1::-1] != self.size:
+            frame = cv2.resize(frame, self.size)
+        np.copyto(self.out_view, frame)
+        self._queue(V4L2_BUF_TYPE_VIDEO_OUTPUT_MPLANE, self.out_bytes)
+        data = b""
+        while True:
+            used = self._dequeue(V4L2_BUF_TYPE_VIDEO_CAPTURE_MPLANE)
+            data += self.cap_map[:used]
+            self._queue(V4L2_BUF_TYPE_VIDEO_CAPTURE_MPLANE)
+            # The H.264 encoder may hand back the stream headers in a buffer of their own
+            if self.codec == "JPEG" or not used or has_slice(data):
+                break
+        self._dequeue(V4L2_BUF_TYPE_VIDEO_OUTPUT_MPLANE)
+        return data or None
+
+    def request_keyframe(self) -> bool:
+        return self._set_control(V4L2_CID_MPEG_VIDEO_FORCE_KEY_FRAME, 1)
+
+    def close(self) -> None:
+        if getattr(self, "streaming", False):
+            for buf_type in (V4L2_BUF_TYPE_VIDEO_OUTPUT_MPLANE, V4L2_BUF_TYPE_VIDEO_CAPTURE_MPLANE):
+                try:
+                    self._ioctl(VIDIOC_STREAMOFF, ctypes.c_int(buf_type))
+                except OSError:
+                    pass
+            self.streaming = False
+        self.out_view = None
+        for mapping in self.maps:
+            mapping.close()
+        self.maps = []
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class Picamera2MjpegEncoder:
+    """picamera2's MJPEGEncoder: the camera's own request loop feeds the hardware JPEG block."""
+
+    name = "picamera2"
+    push = True
+
+    def __init__(self, cam, quality: int = 80):
+        from picamera2.encoders import MJPEGEncoder, Quality
+        self.cam = cam
+        self.encoder = MJPEGEncoder()
+        self.quality = (Quality.VERY_HIGH if quality >= 90 else Quality.HIGH if quality >= 75
+                        else Quality.MEDIUM if quality >= 50 else Quality.LOW)
+
+    def start(self, publish) -> None:
+        from picamera2.outputs import Output
+
+        class HubOutput(Output):
+            def outputframe(self, frame, keyframe=True, timestamp=None, *args, **kwargs):
+                publish(bytes(frame))
+
+        self.cam.start_encoder(self.encoder, HubOutput(), quality=self.quality)
+
+    def stop(self) -> None:
+        try:
+            self.cam.stop_encoder(self.encoder)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        self.stop()
+
+
+# ── H.264 and fragmented MP4 ─────────────────────────────────────────────────
+# H.264 encoders return Annex-B access units (start-code separated NAL units,
+# SPS/PPS repeated on keyframes); the same encode()/push interface as above.
+
+NAL_SLICE, NAL_IDR, NAL_SPS, NAL_PPS, NAL_AUD = 1, 5, 7, 8, 9
+H264_TIMESCALE = 90000
+
+
+def split_nal_units(data: bytes) -> list:
+    """NAL units of an Annex-B byte stream, start codes removed."""
+    units = []
+    start = data.find(b"\x00\x00\x01")
+    while start >= 0:
+        start += 3
+        end = data.find(b"\x00\x00\x01", start)
+        unit = data[start:] if end < 0 else data[start:end]
+        # A 4-byte start code leaves its leading zero on the previous unit; NAL units never end in 0x00
+        unit = unit.rstrip(b"\x00")
+        if unit:
+            units.append(unit)
+        start = end
+    return units
+
+
+def has_slice(data: bytes) -> bool:
+    return any(unit[0] & 0x1F in (NAL_SLICE, NAL_IDR) for unit in split_nal_units(data))
+
+
+@dataclass(frozen=True)
+class AccessUnit:
+    """One encoded frame, already in MP4 sample form (4-byte length prefixed NAL units)."""
+
+    sample: bytes
+    keyframe: bool
+    ts_us: int
+    sps: bytes
+    pps: bytes
+
+
+def make_access_unit(data: bytes, ts_us: int, sps: bytes = b"", pps: bytes = b"") -> AccessUnit:
+    """Annex-B access unit → AccessUnit; sps/pps are the last seen, replaced by any in data."""
+    parts = []
+    keyframe = False
+    for unit in split_nal_units(data):
+        kind = unit[0] & 0x1F
+        if kind == NAL_SPS:
+            sps = unit
+        elif kind == NAL_PPS:
+            pps = unit
+        elif kind != NAL_AUD:
+            keyframe = keyframe or kind == NAL_IDR
+            parts.append(struct.pack(">I", len(unit)) + unit)
+    return AccessUnit(b"".join(parts), keyframe, ts_us, sps, pps)
+
+
+def h264_codec_string(sps: bytes) -> str:
+    """RFC 6381 codecs parameter (avc1.PPCCLL) for MediaSource.isTypeSupported()."""
+    return f"avc1.{sps[1]:02x}{sps[2]:02x}{sps[3]:02x}"
+
+
+def _box(kind: bytes, *payload: bytes) -> bytes:
+    body = b"".join(payload)
+    return struct.pack(">I4s", 8 + len(body), kind) + body
+
+
+def _full_box(kind: bytes, version: int, flags: int, *payload: bytes) -> bytes:
+    return _box(kind, struct.pack(">I", (version << 24) | flags), *payload)
+
+
+_MATRIX = struct.pack(">9I", 0x10000, 0, 0, 0, 0x10000, 0, 0, 0, 0x40000000)
+
+
+class Fmp4Muxer:
+    """Fragmented MP4 for one viewer: an init segment, then one moof+mdat per frame.
+
+    One fragment per frame keeps the muxer from adding latency; decode times
+    come from the capture timestamps, relative to the viewer's first frame.
+    """
+
+    def __init__(self, width: int, height: int, fps: int):
+        self.width = width
+        self.height = height
+        self.duration = H264_TIMESCALE // max(fps, 1)
+        self.sequence = 0
+        self.start_us = None
+
+    def init_segment(self, sps: bytes, pps: bytes) -> bytes:
+        ftyp = _box(b"ftyp", b"iso5", struct.pack(">I", 512), b"iso5iso6avc1mp41")
+        avcc = bytes([1, sps[1], sps[2], sps[3], 0xFF, 0xE1]) + struct.pack(">H", len(sps)) + sps
+        avcc += bytes([1]) + struct.pack(">H", len(pps)) + pps
+        if sps[1] in (100, 110, 122, 144):
+            avcc += bytes([0xFD, 0xF8, 0xF8, 0])           # 4:2:0, 8-bit, no SPS extensions
+        avc1 = _box(b"avc1", bytes(6), struct.pack(">H", 1), bytes(16),
+                    struct.pack(">HHIIIH", self.width, self.height, 0x480000, 0x480000, 0, 1),
+                    bytes(32), struct.pack(">Hh", 0x18, -1), _box(b"avcC", avcc))
+        stbl = _box(b"stbl", _full_box(b"stsd", 0, 0, struct.pack(">I", 1), avc1),
+                    _full_box(b"stts", 0, 0, bytes(4)), _full_box(b"stsc", 0, 0, bytes(4)),
+                    _full_box(b"stsz", 0, 0, bytes(8)), _full_box(b"stco", 0, 0, bytes(4)))
+        dinf = _box(b"dinf", _full_box(b"dref", 0, 0, struct.pack(">I", 1), _full_box(b"url ", 0, 1)))
+        minf = _box(b"minf", _full_box(b"vmhd", 0, 1, bytes(8)), dinf, stbl)
+        mdia = _box(b"mdia",
+                    _full_box(b"mdhd", 0, 0, struct.pack(">IIIIHH", 0, 0, H264_TIMESCALE, 0, 0x55C4, 0)),
+                    _full_box(b"hdlr", 0, 0, bytes(4), b"vide", bytes(12), b"VideoHandler\x00"), minf)
+        tkhd = _full_box(b"tkhd", 0, 3, struct.pack(">IIIII", 0, 0, 1, 0, 0), bytes(8),
+                         struct.pack(">hhhH", 0, 0, 0, 0), _MATRIX,
+                         struct.pack(">II", self.width << 16, self.height << 16))
+        mvhd = _full_box(b"mvhd", 0, 0, struct.pack(">IIIIIH", 0, 0, 1000, 0, 0x10000, 0x100), bytes(10),
+                         _MATRIX, bytes(24), struct.pack(">I", 2))
+        mvex = _box(b"mvex", _full_box(b"trex", 0, 0, struct.pack(">IIIII", 1, 1, 0, 0, 0)))
+        return ftyp + _box(b"moov", mvhd, _box(b"trak", tkhd, mdia), mvex)
+
+    def fragment(self, unit: AccessUnit) -> bytes:
+        if self.start_us is None:
+            self.start_us = unit.ts_us
+        self.sequence += 1
+        decode_time = (unit.ts_us - self.start_us) * H264_TIMESCALE // 1000000
+        # depends on nothing (sync sample) / depends on others and not a sync sample
+        flags = 0x02000000 if unit.keyframe else 0x01010000
+
+        def moof(data_offset: int) -> bytes:
+            trun = _full_box(b"trun", 0, 0x000701,
+                             struct.pack(">IiIII", 1, data_offset, self.duration, len(unit.sample), flags))
+            traf = _box(b"traf", _full_box(b"tfhd", 0, 0x020000, struct.pack(">I", 1)),
+                        _full_box(b"tfdt", 1, 0, struct.pack(">Q", max(0, decode_time))), trun)
+            return _box(b"moof", _full_box(b"mfhd", 0, 0, struct.pack(">I", self.sequence)), traf)
+
+        header = moof(0)
+        return moof(len(header) + 8) + _box(b"mdat", unit.sample)
+
+
+class LibX264Encoder:
+    """Software H.264 through PyAV's libx264: the fallback when no hardware encoder opens."""
+
+    name = "libx264"
+    push = False
+
+    def __init__(self, width: int, height: int, fps: int, bitrate: int, gop: int):
+        if not AV_AVAILABLE:
+            raise RuntimeError("PyAV (python3-av) not installed")
+        self.ctx = av.CodecContext.create("libx264", "w")
+        self.ctx.width, self.ctx.height = width, height
+        self.ctx.pix_fmt = "yuv420p"
+        self.ctx.time_base = Fraction(1, max(fps, 1))
+        self.ctx.bit_rate = bitrate
+        self.ctx.gop_size = gop
+        # zerolatency: no lookahead or B-frames, one frame in, one access unit out
+        self.ctx.options = {"preset": "ultrafast", "tune": "zerolatency", "forced-idr": "1"}
+        self.size = (width, height)
+        self.pts = 0
+        self.keyframe = False
+        # One I420 conversion buffer and one input picture, reused for every frame: zerolatency
+        # x264 copies the picture in before encode() returns
+        self.i420 = np.empty((height * 3 // 2, width), dtype=np.uint8)
+        self.picture = av.VideoFrame(width, height, "yuv420p")
+        flat = self.i420.reshape(-1)
+        luma, chroma = width * height, width * height // 4
+        self.planes = [
+            (np.frombuffer(plane, dtype=np.uint8).reshape(h, plane.line_size)[:, :w],
+             flat[start:start + w * h].reshape(h, w))
+            for plane, start, w, h in zip(self.picture.planes, (0, luma, luma + chroma),
+                                          (width, width // 2, width // 2), (height, height // 2, height // 2))]
+
+    def encode(self, frame) -> bytes | None:
+        if frame.shape[1::-1] != self.size:
+            frame = cv2.resize(frame, self.size)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420, dst=self.i420)
+        for plane, src in self.planes:
+            np.copyto(plane, src)
+        picture = self.picture
+        picture.pts = self.pts
+        self.pts += 1
+        if self.keyframe:
+            picture.pict_type = av.video.frame.PictureType.I
+            self.keyframe = False
+        else:
+            picture.pict_type = av.video.frame.PictureType.NONE
+        return b"".join(bytes(packet) for packet in self.ctx.encode(picture)) or None
+
+    def request_keyframe(self) -> bool:
+        self.keyframe = True
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class Picamera2H264Encoder:
+    """picamera2's H264Encoder (V4L2 hardware on the Pi 4), fed by the camera's request loop."""
+
+    name = "picamera2"
+    push = True
+
+    def __init__(self, cam, bitrate: int, gop: int):
+        from picamera2.encoders import H264Encoder
+        self.cam = cam
+        self.encoder = H264Encoder(bitrate=bitrate, repeat=True, iperiod=gop)
+
+    def start(self, publish) -> None:
+        from picamera2.outputs import Output
+
+        class HubOutput(Output):
+            def outputframe(self, frame, keyframe=True, timestamp=None, *args, **kwargs):
+                publish(bytes(frame), timestamp)
+
+        self.cam.start_encoder(self.encoder, HubOutput())
+
+    def stop(self) -> None:
+        try:
+            self.cam.stop_encoder(self.encoder)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        self.stop()
+
+
+# ── Adaptive MJPEG delivery ──────────────────────────────────────────────────
+# (name, scale, JPEG quality; 0 = --quality). Tier 0 comes from the selected
+# encoder; lower tiers are encoded in software, and only while a client is on them.
+MJPEG_TIERS = (("full", 1.0, 0), ("low", 1.0, 50), ("half", 0.5, 40))
+ADAPT_WINDOW = 10              # Frames of congestion history per client
+ADAPT_DOWN = 3                 # Congested frames in the window that step a client down a tier
+ADAPT_UP = 40                  # Consecutive clean frames before trying the next tier up
+CLIENT_STATS_SEC = 5.0         # /stats window for per-client fps and latency
+
+
+@dataclass(frozen=True)
+class JpegFrame:
+    """One captured frame as JPEG in each tier (None where no client wanted it)."""
+
+    tiers: tuple
+    ts: float                  # Capture time, time.monotonic()
+
+    def pick(self, tier: int) -> bytes | None:
+        """JPEG in the requested tier, or the nearest one that was encoded (smaller first)."""
+        for i in sorted(range(len(self.tiers)), key=lambda i: (abs(i - tier), -i)):
+            if self.tiers[i] is not None:
+                return self.tiers[i]
+        return None
+
+
+def socket_outq(sock) -> int:
+    """Bytes in a TCP socket's send queue not yet taken by the peer (TIOCOUTQ); 0 if unknown."""
+    if sock is None:
+        return 0
+    try:
+        buf = fcntl.ioctl(sock.fileno(), termios.TIOCOUTQ, b"\0\0\0\0")
+        return struct.unpack("i", buf)[0]
+    except (OSError, ValueError):
+        return 0
+
+
+def _pct(values: list, p: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
+
+
+class MjpegClient:
+    """Delivery state of one /video_feed viewer: its tier, congestion history and stats.
+
+    A frame is congested when the previous one was still in the socket's send
+    queue as it arrived, or when writing it blocked for more than half a frame
+    period. ADAPT_DOWN congested frames out of the last ADAPT_WINDOW move the
+    client to a smaller tier; ADAPT_UP clean frames in a row move it back up.
+    The camera's tier count is passed on every frame, since it changes when a
+    push encoder falls back to OpenCV.
+    """
+
+    def __init__(self, addr: str):
+        self.addr = addr
+        self.tier = 0
+        self.connected = time.monotonic()
+        self.sent = 0
+        self.skipped = 0
+        self.congested = 0
+        self.tier_changes = 0
+        self.queue_max = 0
+        self.drain_bps = 1e6                  # Send-queue drain rate estimate, bytes/s
+        self.window = deque(maxlen=ADAPT_WINDOW)
+        self.calm = 0
+        self.history = deque(maxlen=512)      # (sent at, bytes, capture→sent s, write s)
+
+    def record(self, now: float, size: int, latency: float, write_s: float, congested: bool,
+               tier_count: int) -> None:
+        self.sent += 1
+        self.history.append((now, size, latency, write_s))
+        self.window.append(congested)
+        if congested:
+            self.congested += 1
+            self.calm = 0
+        else:
+            self.calm += 1
+        if self.tier >= tier_count:
+            self._set_tier(tier_count - 1)     # The encoder changed and no longer has this tier
+        elif sum(self.window) >= ADAPT_DOWN and self.tier < tier_count - 1:
+            self._set_tier(self.tier + 1)
+        elif self.calm >= ADAPT_UP and self.tier > 0:
+            self._set_tier(self.tier - 1)
+
+    def _set_tier(self, tier: int) -> None:
+        self.tier = tier
+        self.tier_changes += 1
+        self.window.clear()
+        self.calm = 0
+
+    def snapshot(self, now: float) -> dict:
+        recent = [h for h in self.history if now - h[0] <= CLIENT_STATS_SEC]
+        span = min(CLIENT_STATS_SEC, now - self.connected)
+        latency = [h[2] * 1000.0 for h in recent]
+        write = [h[3] * 1000.0 for h in recent]
+        return {
+            "addr": self.addr,
+            "tier": MJPEG_TIERS[self.tier][0],
+            "connected_s": round(now - self.connected, 1),
+            "fps": round((len(recent) - 1) / (recent[-1][0] - recent[0][0]), 1)
+                   if len(recent) > 1 and recent[-1][0] > recent[0][0] else 0.0,
+            "bytes_s": round(sum(h[1] for h in recent) / span) if span > 0 else 0,
+            "latency_ms": {k: None if v is None else round(v, 1)
+                           for k, v in (("p50", _pct(latency, 50)), ("p90", _pct(latency, 90)))},
+            "write_ms_p90": None if not write else round(_pct(write, 90), 1),
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "congested": self.congested,
+            "tier_changes": self.tier_changes,
+            "queue_bytes_max": self.queue_max,
+        }
+
+
+class FrameHub:
+    """Latest encoded frame, shared by every viewer.
+
+    The capture thread publishes each JpegFrame once; viewers wait for a
+    sequence number newer than the one they sent last, so a slow viewer skips
+    to the newest frame instead of queueing old ones, and nothing is encoded
+    twice.
+    """
+
+    def __init__(self, cond: Condition | None = None):
+        # cond may be shared between hubs so one wait can watch viewers of both
+        self.cond = cond or Condition()
+        self.frame = None
+        self.seq = 0
+        self.viewers = 0
+
+    def publish(self, frame) -> None:
+        with self.cond:
+            self.frame = frame
+            self.seq += 1
+            self.cond.notify_all()
+
+    def wait_next(self, seq: int, timeout: float) -> tuple:
+        """Block until a frame newer than seq exists; returns (seq, frame), frame None on timeout."""
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.seq != seq, timeout):
+                return seq, None
+            return self.seq, self.frame
+
+    def latest(self) -> tuple:
+        with self.cond:
+            return self.seq, self.frame
+
+    def join(self) -> int:
+        """Register a viewer; returns the current sequence number, the cursor to wait past."""
+        with self.cond:
+            self.viewers += 1
+            self.cond.notify_all()
+            return self.seq
+
+    def leave(self) -> None:
+        with self.cond:
+            self.viewers -= 1
+            self.cond.notify_all()
+
+    def wait_viewers(self, timeout: float) -> bool:
+        with self.cond:
+            return self.cond.wait_for(lambda: self.viewers > 0, timeout)
+
+
+class H264Hub(FrameHub):
+    """Access units of the current GOP, shared by every H.264 viewer.
+
+    A P-frame is useless without the frames before it, so unlike FrameHub a
+    viewer gets every unit after its sequence number; one that falls behind
+    a keyframe resumes at that keyframe. Memory is bounded by the GOP.
+    """
+
+    def __init__(self, cond: Condition | None = None):
+        super().__init__(cond)
+        self.gop: list = []
+
+    def publish(self, unit: AccessUnit) -> None:
+        with self.cond:
+            if unit.keyframe:
+                self.gop = []
+            self.gop.append(unit)
+            self.frame = unit
+            self.seq += 1
+            self.cond.notify_all()
+
+    def wait_units(self, seq: int, timeout: float) -> tuple:
+        """Block until units newer than seq exist; returns (seq, units), units empty on timeout."""
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.seq != seq, timeout):
+                return seq, []
+            first = self.seq - len(self.gop) + 1
+            return self.seq, self.gop[max(0, seq + 1 - first):]
+
+    def gop_start(self) -> int:
+        """Sequence number just before the current GOP's keyframe."""
+        with self.cond:
+            return self.seq - len(self.gop)
+
 
 class CameraStream:
-    def __init__(self, device: int, width: int, height: int, fps: int):
-        self.pi_cam = try_picamera2(width, height, fps)
-        self.capture = None
+    def __init__(self, device: int, width: int, height: int, fps: int, capture=None,
+                 encoder: str = "auto", quality: int = 80, h264: str = "off", bitrate: int = 1500000,
+                 gop: int = 40):
+        self.fps = max(fps, 1)
+        self.size = (width, height)
+        self.quality = quality
+        self.bitrate = bitrate
+        self.gop = max(gop, 1)
+        cond = Condition()
+        self.hub = FrameHub(cond)
+        self.h264_hub = H264Hub(cond)
+        self.frames = 0
+        self.clients = {}                      # id(MjpegClient) -> MjpegClient, for tiers and /stats
+        self.clients_lock = Lock()
+        self.tier_encoders = [None] + [OpenCVJpegEncoder(q) for _, _, q in MJPEG_TIERS[1:]]
+        self.tier_frames = [None] * len(MJPEG_TIERS)   # Reused resize targets of the scaled tiers
+        self.tier_encodes = [0] * len(MJPEG_TIERS)
+        self.h264_frames = 0
+        self.h264_bytes = 0
+        self.sps = self.pps = b""
+        self.errors = 0
+        self._pushing = {"jpeg": False, "h264": False}   # Push encoders currently started
+        self._thread = None
+        self._running = False
+
+        # capture: an already opened cv2.VideoCapture-like source (tests, benchmarks)
+        self.pi_cam = None if capture is not None else try_picamera2(width, height, fps)
+        self.capture = capture
 
-        if self.pi_cam is None:
+        if capture is not None:
+            print("[camera] Using supplied capture source")
+        elif self.pi_cam is None:
             # Fall back to OpenCV VideoCapture (USB webcam)
             self.capture = cv2.VideoCapture(device)
             if not self.capture.isOpened():
@@ -51,24 +864,275 @@ class CameraStream:
             print("[camera] Using picamera2 (CSI camera)")
 
         self.lock = Lock()
+        # Every capture for the frame encoders (opencv, v4l2m2m, libx264) lands in this buffer: no
+        # frame-sized allocation between camera and encoders. picamera2's push encoders, the default
+        # on a Pi with the CSI camera, never bring frames into Python and do not use it: the
+        # hardware encoder reads the ISP's buffers directly
+        self.frame_buf = np.empty((height, width, 3), dtype=np.uint8)
+        self.encoder = self._open_encoder(encoder)
+        print(f"[encoder] Using {self.encoder.name}")
+        self.h264 = self._open_h264(h264)
+        print(f"[h264] Using {self.h264.name}" if self.h264 else "[h264] H.264 stream disabled")
 
-    def read_jpeg(self) -> bytes | None:
+    def _open_encoder(self, kind: str):
+        """Open the requested backend; "auto" takes the first that works in ENCODERS order."""
+        if kind in ("auto", "picamera2") and self.pi_cam is not None:
+            try:
+                return Picamera2MjpegEncoder(self.pi_cam, self.quality)
+            except Exception as e:
+                if kind != "auto":
+                    raise RuntimeError(f"picamera2 encoder not available: {e}") from e
+                print(f"[encoder] picamera2 encoder not available: {e}")
+        elif kind == "picamera2":
+            raise RuntimeError("picamera2 encoder needs the CSI camera")
+        if kind in ("auto", "v4l2m2m"):
+            device = find_m2m_encoder("encode_image")
+            try:
+                if device is None:
+                    raise OSError("no V4L2 M2M JPEG encoder found")
+                return V4L2M2MEncoder(device, *self.size, quality=self.quality)
+            except OSError as e:
+                if kind != "auto":
+                    raise RuntimeError(f"V4L2 M2M encoder not available: {e}") from e
+                print(f"[encoder] V4L2 M2M encoder not available: {e}")
+        return OpenCVJpegEncoder(self.quality)
+
+    def _open_h264(self, kind: str):
+        """Open the H.264 backend, "auto" in H264_ENCODERS order; None when off or nothing opens."""
+        if kind == "off":
+            return None
+        if kind in ("auto", "picamera2") and self.pi_cam is not None:
+            try:
+                return Picamera2H264Encoder(self.pi_cam, self.bitrate, self.gop)
+            except Exception as e:
+                if kind != "auto":
+                    raise RuntimeError(f"picamera2 H.264 encoder not available: {e}") from e
+                print(f"[h264] picamera2 encoder not available: {e}")
+        elif kind == "picamera2":
+            raise RuntimeError("picamera2 H.264 encoder needs the CSI camera")
+        if kind in ("auto", "v4l2m2m"):
+            device = find_m2m_encoder("encode")
+            try:
+                if device is None:
+                    raise OSError("no V4L2 M2M H.264 encoder found")
+                return V4L2M2MEncoder(device, *self.size, codec="H264", bitrate=self.bitrate, gop=self.gop)
+            except OSError as e:
+                if kind != "auto":
+                    raise RuntimeError(f"V4L2 M2M H.264 encoder not available: {e}") from e
+                print(f"[h264] V4L2 M2M encoder not available: {e}")
+        try:
+            return LibX264Encoder(*self.size, self.fps, self.bitrate, self.gop)
+        except Exception as e:
+            if kind != "auto":
+                raise RuntimeError(f"libx264 encoder not available: {e}") from e
+            print(f"[h264] libx264 encoder not available: {e}")
+        return None
+
+    def read_frame(self):
+        """Next camera frame as BGR, or None.
+
+        The frame is frame_buf, overwritten by the next read: copy it to keep it.
+        Only the capture thread's frame encoders call this; with push encoders
+        on both streams it is not used at all.
+        """
         with self.lock:
             if self.pi_cam is not None:
-                frame = self.pi_cam.capture_array()   # XBGR8888: channels [R,G,B,X]
-                frame = cv2.cvtColor(frame, cv2.COLOR_RGBA2BGR)  # drop X, swap to BGR
+                from picamera2 import MappedArray
+                request = self.pi_cam.capture_request()
+                try:
+                    with MappedArray(request, "main") as mapped:
+                        if mapped.array.shape != self.frame_buf.shape:
+                            self.frame_buf = np.empty_like(mapped.array)
+                        np.copyto(self.frame_buf, mapped.array)
+                finally:
+                    request.release()
+                return self.frame_buf
+            ok, frame = self.capture.read(self.frame_buf)
+            if not ok:
+                return None
+            # A camera that ignored the size hints got a new array; read into that from now on
+            self.frame_buf = frame
+            return frame
+
+    def read_jpeg(self) -> bytes | None:
+        frame = self.read_frame()
+        if frame is None:
+            return None
+        return self.encoder.encode(frame)
+
+    @property
+    def tier_count(self) -> int:
+        # A push encoder never hands us the raw frame, so there is nothing to re-encode
+        return 1 if self.encoder.push else len(MJPEG_TIERS)
+
+    def add_client(self, client: MjpegClient) -> None:
+        with self.clients_lock:
+            self.clients[id(client)] = client
+
+    def remove_client(self, client: MjpegClient) -> None:
+        with self.clients_lock:
+            self.clients.pop(id(client), None)
+
+    def _wanted_tiers(self) -> set:
+        with self.clients_lock:
+            return {client.tier for client in self.clients.values()} or {0}
+
+    def encode_tiers(self, frame, wanted: set) -> tuple:
+        """JPEG of frame in each wanted tier; None for the others."""
+        out = []
+        for i, (_, scale, _) in enumerate(MJPEG_TIERS):
+            jpeg = None
+            if i in wanted:
+                if i == 0:
+                    jpeg = self.encoder.encode(frame)
+                else:
+                    if scale != 1.0:
+                        height, width = frame.shape[:2]
+                        size = (int(width * scale), int(height * scale))
+                        dst = self.tier_frames[i]
+                        if dst is None or dst.shape[1::-1] != size:
+                            dst = self.tier_frames[i] = np.empty((size[1], size[0], 3), dtype=np.uint8)
+                        frame_i = cv2.resize(frame, size, dst=dst, interpolation=cv2.INTER_AREA)
+                    else:
+                        frame_i = frame
+                    jpeg = self.tier_encoders[i].encode(frame_i)
+                if jpeg is not None:
+                    self.tier_encodes[i] += 1
+            out.append(jpeg)
+        return tuple(out)
+
+    def _publish(self, jpeg: bytes) -> None:
+        self.frames += 1
+        self.tier_encodes[0] += 1
+        self.hub.publish(JpegFrame((jpeg,), time.monotonic()))
+
+    def _publish_tiers(self, tiers: tuple, ts: float) -> None:
+        self.frames += 1
+        self.hub.publish(JpegFrame(tiers, ts))
+
+    def _publish_h264(self, data: bytes, ts_us: int | None = None) -> None:
+        if ts_us is None:
+            ts_us = time.monotonic_ns() // 1000
+        unit = make_access_unit(data, ts_us, self.sps, self.pps)
+        self.sps, self.pps = unit.sps, unit.pps
+        self.h264_frames += 1
+        self.h264_bytes += len(unit.sample)
+        self.h264_hub.publish(unit)
+
+    def h264_start_seq(self) -> int:
+        """Where a new H.264 viewer starts: a keyframe forced now, else the current GOP from its keyframe."""
+        request = getattr(self.h264, "request_keyframe", None)
+        if request is not None and request():
+            return self.h264_hub.seq
+        return self.h264_hub.gop_start()
+
+    def _start_push(self, encoder, publish) -> bool:
+        try:
+            encoder.start(publish)
+            return True
+        except Exception as e:
+            print(f"[encoder] {encoder.name} failed to start: {e}")
+            return False
+
+    def start(self) -> None:
+        """Start the capture thread: it captures for the frame encoders and runs the push encoders,
+        each only while its hub has viewers."""
+        self._running = True
+        self._thread = Thread(target=self._run, name="camera-capture", daemon=True)
+        self._thread.start()
+
+    def _watched(self) -> tuple:
+        """(JPEG, H.264) for the frame encoders that have viewers."""
+        return (not self.encoder.push and self.hub.viewers > 0,
+                self.h264 is not None and not self.h264.push and self.h264_hub.viewers > 0)
+
+    def _push_targets(self) -> list:
+        """(slot, encoder, hub, publish) for each push encoder in use."""
+        targets = []
+        if self.encoder.push:
+            targets.append(("jpeg", self.encoder, self.hub, self._publish))
+        if self.h264 is not None and self.h264.push:
+            targets.append(("h264", self.h264, self.h264_hub, self._publish_h264))
+        return targets
+
+    def _push_out_of_sync(self) -> bool:
+        return any((hub.viewers > 0) != self._pushing[slot] for slot, _, hub, _ in self._push_targets())
+
+    def _sync_push(self) -> None:
+        """Start push encoders that gained viewers and stop those that lost them.
+
+        Called without the hub condition held: the encoders' own threads publish
+        through it, and stopping one waits for its thread.
+        """
+        for slot, encoder, hub, publish in self._push_targets():
+            wanted = hub.viewers > 0
+            if wanted == self._pushing[slot]:
+                continue
+            if not wanted:
+                encoder.stop()
+                self._pushing[slot] = False
+            elif self._start_push(encoder, publish):
+                self._pushing[slot] = True
+            elif slot == "jpeg":
+                self.encoder = OpenCVJpegEncoder(self.quality)
             else:
+                self.h264 = self._open_h264("libx264") if AV_AVAILABLE else None
 
-                ok, frame = self.capture.read()
-                if not ok:
-                    return None
+    def _run(self) -> None:
+        interval = 1.0 / self.fps
+        deadline = time.monotonic()
+        while self._running:
+            # Nobody watching: leave the camera and encoders idle
+            with self.hub.cond:
+                self.hub.cond.wait_for(lambda: any(self._watched()) or self._push_out_of_sync(), 1.0)
+            self._sync_push()
+            jpeg_wanted, h264_wanted = self._watched()
+            if not (jpeg_wanted or h264_wanted):
+                deadline = time.monotonic()
+                continue
+            ts_us = time.monotonic_ns() // 1000
+            frame = self.read_frame()
+            if frame is None:
+                self.errors += 1
+            else:
+                if jpeg_wanted:
+                    tiers = self.encode_tiers(frame, self._wanted_tiers())
+                    if any(jpeg is not None for jpeg in tiers):
+                        self._publish_tiers(tiers, ts_us / 1e6)
+                    else:
+                        self.errors += 1
+                if h264_wanted:
+                    data = self.h264.encode(frame)
+                    if data:
+                        self._publish_h264(data, ts_us)
+            # Absolute deadlines: a camera that already blocks for a frame period is not slowed further
+            deadline = max(deadline + interval, time.monotonic())
+            time.sleep(max(0.0, deadline - time.monotonic()))
 
-        ok, jpeg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
-        if not ok:
-            return None
-        return jpeg.tobytes()
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self.clients_lock:
+            clients = [client.snapshot(now) for client in self.clients.values()]
+        return {
+            "encoder": self.encoder.name,
+            "h264": self.h264.name if self.h264 is not None else None,
+            "fps_target": self.fps,
+            "frames": self.frames,
+            "errors": self.errors,
+            "tiers": [{"name": name, "scale": scale, "quality": quality or self.quality, "encodes": count}
+                      for (name, scale, quality), count in zip(MJPEG_TIERS[:self.tier_count], self.tier_encodes)],
+            "mjpeg_clients": clients,
+            "h264_viewers": self.h264_hub.viewers,
+            "h264_frames": self.h264_frames,
+        }
 
     def close(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self.encoder.close()
+        if self.h264 is not None:
+            self.h264.close()
         with self.lock:
             if self.pi_cam is not None:
                 self.pi_cam.stop()
@@ -77,7 +1141,7 @@ class CameraStream:
                 self.capture.release()
 
 
-def build_app(camera: CameraStream, frame_delay: float) -> Flask:
+def build_app(camera: CameraStream) -> Flask:
     app = Flask(__name__)
 
     @app.route("/")
@@ -90,25 +1154,134 @@ def build_app(camera: CameraStream, frame_delay: float) -> Flask:
             "<p style='margin:0;opacity:0.8;'>Open this page from any device on the same Ethernet network.</p>"
             "</div>"
             "<img src='/video_feed' style='width:100%;height:auto;display:block;' />"
+            + ("<p style='padding:6px 14px;opacity:0.8;'><a style='color:#8cf;' href='/h264'>"
+               "Low-bandwidth H.264 view</a></p>" if camera.h264 is not None else "")
+            + "</body></html>"
+        )
+
+    @app.route("/h264")
+    def h264_player() -> str:
+        # MediaSource player for /video.mp4; it stays at the live edge instead of buffering
+        return (
+            "<html><head><title>Pi Camera Stream (H.264)</title></head>"
+            "<body style='margin:0;background:#111;color:#eee;font-family:Arial,sans-serif;'>"
+            "<video id='v' autoplay muted playsinline style='width:100%;height:auto;display:block;'></video>"
+            "<p id='s' style='padding:6px 14px;opacity:0.8;'></p>"
+            "<script>(async () => {"
+            "const v = document.getElementById('v'), s = document.getElementById('s');"
+            "const resp = await fetch('/video.mp4');"
+            "if (!resp.ok) { s.textContent = 'H.264 stream unavailable; use the MJPEG view at /'; return; }"
+            "const type = 'video/mp4; codecs=\"' + resp.headers.get('X-Video-Codec') + '\"';"
+            "if (!window.MediaSource || !MediaSource.isTypeSupported(type)) {"
+            " s.textContent = 'This browser cannot play ' + type + '; use the MJPEG view at /'; return; }"
+            "const ms = new MediaSource(); v.src = URL.createObjectURL(ms);"
+            "await new Promise(r => ms.addEventListener('sourceopen', r, {once: true}));"
+            "const sb = ms.addSourceBuffer(type), queue = [];"
+            "const pump = () => { if (!sb.updating && queue.length) sb.appendBuffer(queue.shift()); };"
+            "sb.addEventListener('updateend', () => {"
+            " const b = v.buffered;"
+            " if (b.length) { const end = b.end(b.length - 1);"
+            "  if (end - v.currentTime > 0.3) v.currentTime = end - 0.05;"
+            "  if (v.currentTime - b.start(0) > 10) { sb.remove(b.start(0), v.currentTime - 5); return; } }"
+            " pump(); });"
+            "const reader = resp.body.getReader();"
+            "for (;;) { const {value, done} = await reader.read(); if (done) break; queue.push(value); pump(); }"
+            "s.textContent = 'Stream ended';"
+            "})();</script>"
             "</body></html>"
         )
 
+    @app.route("/video.mp4")
+    def video_mp4() -> Response:
+        """H.264 as fragmented MP4: init segment, then one fragment per frame from a keyframe on."""
+        if camera.h264 is None:
+            return Response("H.264 stream disabled\n", status=404, mimetype="text/plain")
+        hub = camera.h264_hub
+        hub.join()
+        seq = camera.h264_start_seq()
+        # Wait for the first keyframe here so the response headers can name the codec
+        units = []
+        deadline = time.monotonic() + 3.0
+        while not units and time.monotonic() < deadline:
+            seq, fresh = hub.wait_units(seq, timeout=0.5)
+            keys = [i for i, unit in enumerate(fresh) if unit.keyframe]
+            if keys:
+                units = fresh[keys[0]:]
+        if not units:
+            hub.leave()
+            return Response("No H.264 keyframe from the encoder\n", status=503, mimetype="text/plain")
+        muxer = Fmp4Muxer(*camera.size, camera.fps)
+
+        def generate(seq: int, units: list):
+            yield muxer.init_segment(units[0].sps, units[0].pps)
+            while True:
+                for unit in units:
+                    yield muxer.fragment(unit)
+                seq, units = hub.wait_units(seq, timeout=1.0)
+
+        response = Response(generate(seq, units), mimetype="video/mp4",
+                            headers={"X-Video-Codec": h264_codec_string(units[0].sps), "Cache-Control": "no-store"})
+        # Also runs when the client goes away before the generator starts
+        response.call_on_close(hub.leave)
+        return response
+
     @app.route("/video_feed")
     def video_feed() -> Response:
+        hub = camera.hub
+        interval = 1.0 / camera.fps
+        # Werkzeug's server exposes the connection; elsewhere only write time shows backpressure
+        sock = request.environ.get("werkzeug.socket")
+        client = MjpegClient(request.remote_addr or "?")
+
         def generate():
-            while True:
-                frame = camera.read_jpeg()
-                if frame is None:
-                    time.sleep(frame_delay)
-                    continue
-                yield (
-                    b"--frame\r\n"
-                    b"Content-Type: image/jpeg\r\n\r\n" + frame + b"\r\n"
-                )
-                time.sleep(frame_delay)
+            # Runs per viewer but only waits and sends; capture and encode happen once in CameraStream._run
+            # Start at the hub's current frame: after an idle period that is the stale last frame
+            # from before capture stopped, so the first one sent is the next fresh capture
+            seq = hub.join()
+            camera.add_client(client)
+            try:
+                while True:
+                    seq_new, frame = hub.wait_next(seq, timeout=1.0)
+                    if frame is None:
+                        continue
+                    # Backpressure: while the previous frame is still in the send queue, hold
+                    # off and then take the newest frame, so at most one frame per client is
+                    # ever buffered and a slow link skips frames instead of adding latency
+                    queued = socket_outq(sock)
+                    congested = queued > 0
+                    if congested:
+                        client.queue_max = max(client.queue_max, queued)
+                        backlog, start = queued, time.monotonic()
+                        while queued > 0:
+                            time.sleep(min(interval, max(0.001, queued / client.drain_bps)))
+                            queued = socket_outq(sock)
+                        drained_s = max(time.monotonic() - start, 1e-3)
+                        client.drain_bps = 0.7 * client.drain_bps + 0.3 * backlog / drained_s
+                        seq_new, frame = hub.latest()
+                    client.skipped += max(0, seq_new - seq - 1)
+                    seq = seq_new
+                    jpeg = frame.pick(client.tier)
+                    t0 = time.monotonic()
+                    yield (
+                        b"--frame\r\n"
+                        b"Content-Type: image/jpeg\r\n\r\n" + jpeg + b"\r\n"
+                    )
+                    # Resumed once the server has written the part to the socket
+                    now = time.monotonic()
+                    write_s = now - t0
+                    client.record(now, len(jpeg), now - frame.ts, write_s, congested or write_s > interval / 2,
+                                  camera.tier_count)
+            finally:
+                camera.remove_client(client)
+                hub.leave()
 
         return Response(generate(), mimetype="multipart/x-mixed-replace; boundary=frame")
 
+    @app.route("/stats")
+    def stats() -> Response:
+        """Encoder, tier and per-viewer delivery stats (fps, capture→send latency, skips)."""
+        return jsonify(camera.stats())
+
     return app
 
 
@@ -131,19 +1304,34 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--width", type=int, default=640, help="Frame width")
     parser.add_argument("--height", type=int, default=480, help="Frame height")
     parser.add_argument("--fps", type=int, default=20, help="Target stream FPS")
+    parser.add_argument("--encoder", choices=ENCODERS, default="auto",
+                        help="JPEG encoder backend; auto = picamera2 hardware, then V4L2 M2M, then OpenCV")
+    parser.add_argument("--quality", type=int, default=80, help="JPEG quality 1-100")
+    parser.add_argument("--h264", choices=H264_ENCODERS, default="auto",
+                        help="H.264 backend for /video.mp4; auto = picamera2, V4L2 M2M, then libx264 (PyAV)")
+    parser.add_argument("--bitrate", type=int, default=1500000, help="H.264 bitrate in bits/s")
+    parser.add_argument("--gop", type=int, default=40, help="H.264 frames between keyframes")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Stream a generated test pattern instead of a camera")
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    frame_delay = 1.0 / max(args.fps, 1)
-    camera = CameraStream(args.device, args.width, args.height, args.fps)
-    app = build_app(camera, frame_delay)
+    capture = SyntheticCapture(args.width, args.height, args.fps) if args.synthetic else None
+    camera = CameraStream(args.device, args.width, args.height, args.fps, capture=capture,
+                          encoder=args.encoder, quality=args.quality, h264=args.h264, bitrate=args.bitrate,
+                          gop=args.gop)
+    camera.start()
+    app = build_app(camera)
     local_ip = get_local_ip()
 
     print("\nRaspberry Pi video web stream is running")
     print(f"Open on same Ethernet network: http://{local_ip}:{args.port}")
-    print(f"Localhost: http://127.0.0.1:{args.port}\n")
+    print(f"Localhost: http://127.0.0.1:{args.port}")
+    if camera.h264 is not None:
+        print(f"H.264 player: http://{local_ip}:{args.port}/h264")
+    print()
 
     try:
         app.run(host=args.host, port=args.port, threaded=True)
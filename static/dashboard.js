@@ -0,0 +1,163 @@
+let lastId = 0;
+const filterState = { ESP32: true, PI: true, RC: true, SYS: true, GPIO: true };
+let lastPktCount = 0, lastTime = Date.now();
+
+function tickClock() {
+  document.getElementById('sys-time').innerText = new Date().toLocaleTimeString('en-US',{hour12:false});
+}
+setInterval(tickClock, 1000); tickClock();
+
+function renderStatus(s) {
+    const badge = document.getElementById('link-badge');
+    const txt = document.getElementById('link-txt');
+    if (s.link_alive) { badge.className='sbadge live'; txt.innerText='LINK ACTIVE'; }
+    else { badge.className='sbadge lost'; txt.innerText='SIGNAL LOST'; }
+    document.getElementById('stat-rc').innerText = s.last_rc_age_sec < 900 ? s.last_rc_age_sec.toFixed(2)+'s' : '--';
+    const now = Date.now();
+    if (now - lastTime > 1000) {
+      const pps = Math.round((s.packets_rx - lastPktCount)*1000/(now-lastTime));
+      const safe = pps > 0 ? pps : 0;
+      document.getElementById('stat-pps').innerText = safe;
+      const pct = Math.min(100, Math.round(safe/60*100));
+      document.getElementById('sig-bar').style.width = pct+'%';
+      document.getElementById('sig-pct').innerText = pct+'%';
+      lastPktCount = s.packets_rx; lastTime = now;
+    }
+}
+
+function appendLogs(logs) {
+    const box = document.getElementById('console');
+    const atBottom = box.scrollHeight - box.scrollTop <= box.clientHeight + 5;
+    logs.forEach(item => {
+      if (item.id <= lastId) return;
+      lastId = item.id;
+      const row = document.createElement('div');
+      row.className = 'log-entry row-'+item.src;
+      let color = '#94a3b8';
+      if (item.msg.includes('ERR')||item.msg.includes('FAIL')) color = '#f87171';
+      else if (item.msg.includes('WARN')) color = '#fbbf24';
+      else if (item.msg.includes('OK')||item.msg.includes('open')) color = '#4ade80';
+      row.innerHTML = '<span class="ts">'+item.ts+'</span><span class="tag tag-'+item.src+'">'+item.src+'</span><span style="color:'+color+';flex:1">'+item.msg+'</span>';
+      if (!filterState[item.src] && filterState[item.src] !== undefined) row.style.display = 'none';
+      box.appendChild(row);
+    });
+    while (box.children.length > 200) box.removeChild(box.firstChild);
+    if (atBottom && logs.length > 0) box.scrollTop = box.scrollHeight;
+}
+
+async function refreshStatus() {
+  try {
+    const r = await fetch('/api/status');
+    renderStatus(await r.json());
+  } catch(e) {}
+}
+
+// Fallback when Server-Sent Events are unavailable: 500 ms status polling
+// plus a long-poll that returns as soon as a new log line exists.
+let polling = false;
+async function pollLogs() {
+  while (true) {
+    try {
+      const r = await fetch('/api/logs?wait=20&since='+lastId);
+      appendLogs((await r.json()).logs);
+    } catch(e) { await new Promise(res => setTimeout(res, 1000)); }
+  }
+}
+function startPolling() {
+  if (polling) return;
+  polling = true;
+  setInterval(refreshStatus, 500);
+  refreshStatus(); pollLogs();
+}
+
+// Push channel: log lines as they happen, status as deltas
+function startPush() {
+  if (!window.EventSource) { startPolling(); return; }
+  const status = {};
+  let opened = false, failures = 0;
+  const es = new EventSource('/api/events?since='+lastId);
+  es.onopen = () => { opened = true; failures = 0; };
+  es.addEventListener('logs', e => appendLogs(JSON.parse(e.data)));
+  es.addEventListener('status', e => { Object.assign(status, JSON.parse(e.data)); renderStatus(status); });
+  es.onerror = () => {
+    // EventSource reconnects by itself; give up only if it never worked
+    if (!opened && ++failures >= 3) { es.close(); startPolling(); }
+  };
+}
+
+function toggleSrc(src) {
+  filterState[src] = document.getElementById('f-'+src).checked;
+  document.querySelectorAll('.row-'+src).forEach(r => r.style.display = filterState[src] ? 'flex' : 'none');
+}
+// Control channel: one WebSocket for all servo/GPIO commands, REST if unavailable
+let ctl = null, ctlSeq = 0, ctlFailures = 0;
+function openControl() {
+  if (!window.WebSocket) return;
+  const ws = new WebSocket((location.protocol === 'https:' ? 'wss://' : 'ws://') + location.host + '/ws/control');
+  ws.onopen = () => { ctl = ws; ctlFailures = 0; };
+  ws.onmessage = e => {
+    const m = JSON.parse(e.data);
+    if (m.ok && m.id !== undefined && m.state !== undefined) setSwitchState(m.id, m.state);
+  };
+  ws.onclose = () => {
+    const wasOpen = ctl === ws;
+    ctl = null;
+    // Keep reconnecting a channel that worked; give up if the server has none
+    if (wasOpen || ++ctlFailures < 3) setTimeout(openControl, 2000);
+  };
+}
+function sendControl(cmd, id, value) {
+  if (!ctl || ctl.readyState !== WebSocket.OPEN) return false;
+  ctl.send(JSON.stringify({seq: ++ctlSeq, cmd, id, value}));
+  return true;
+}
+function setSwitchState(id, state) {
+  const el = document.getElementById('sw-state-'+id);
+  if (el) {
+    el.textContent = state ? 'ON' : 'OFF';
+    el.className = 'gpio-sw-state ' + (state ? 'on' : 'off');
+  }
+}
+
+function updateServo(id, val) {
+  document.getElementById('val-s'+id).innerText = val+'°';
+  if (sendControl('servo', id, parseInt(val))) return;
+  fetch('/api/servo/'+id, {method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({angle:parseInt(val)})});
+}
+function momentary(active) {
+  if (sendControl('momentary', 0, active)) return;
+  fetch('/api/gpio/momentary', {method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({active})});
+}
+function toggleBlink(active) {
+  if (sendControl('blink', 0, active)) return;
+  fetch('/api/gpio/blink', {method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({active})});
+}
+function toggleGpioSwitch(id, active) {
+  if (sendControl('switch', id, active)) return;
+  fetch('/api/gpio/switch/'+id, {method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({active})})
+    .then(r=>r.json()).then(d=>setSwitchState(id, d.state)).catch(()=>{});
+}
+function clearLogs() { document.getElementById('console').innerHTML = ''; }
+
+function camOk() {
+  const bar=document.getElementById('cam-status-bar'),dot=document.getElementById('cam-dot'),txt=document.getElementById('cam-status-txt');
+  bar.classList.remove('cam-err');
+  dot.style.background='var(--success)'; dot.style.boxShadow='0 0 8px var(--success)'; dot.style.animation='lp 1.5s infinite';
+  txt.innerText='LIVE';
+}
+function camError() {
+  const bar=document.getElementById('cam-status-bar'),dot=document.getElementById('cam-dot'),txt=document.getElementById('cam-status-txt');
+  bar.classList.add('cam-err');
+  dot.style.background='var(--danger)'; dot.style.boxShadow='0 0 8px var(--danger)'; dot.style.animation='none';
+  txt.innerText='OFFLINE';
+}
+function reconnectCam() {
+  const img = document.getElementById('cam-img');
+  img.src = img.src.split('?')[0]+'?t='+Date.now();
+}
+
+// The camera is served by pi_web_video_stream.py on the same host; set here so
+// index.html stays static and cacheable
+document.getElementById('cam-img').src = 'http://' + location.hostname + ':8081/video_feed';
+startPush();
+openControl();
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Benchmark: 20 ms select()-poll bridge loop vs selector-driven RcBridge.run().
+
+Runs pi_rover_system.RcBridge and PolledBridge, the same bridge driven by
+the previous loop, against a pseudo-terminal pair standing in for the ESP32
+UART and measures:
+
+  idle      – bridge thread CPU time and wakeups/s with no traffic
+  UDP→UART  – time from sendto() on loopback until the 32-byte frame can be
+              read from the pty master (what the ESP32 would see)
+  UART→log  – time from the "ESP32" writing a line into the pty until the
+              bridge hands it to SharedState.add_logs()
+  load CPU  – bridge thread CPU time while forwarding --hz frames/s
+
+Usage:
+  python3 tools/bench_bridge_loop.py
+  python3 tools/bench_bridge_loop.py --frames 2000 --hz 200 --idle 5
+"""
+import argparse
+import os
+import pty
+import select
+import socket
+import struct
+import sys
+import threading
+import time
+import types
+from contextlib import suppress
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pi_rover_system import IBUS_FRAME_LEN, RC_LOST_SEC, RcBridge, SharedState  # noqa: E402
+
+
+class PolledBridge(RcBridge):
+    """RcBridge driven by the previous loop, as the baseline for run()."""
+
+    def run(self):
+        """Previous loop: 20 ms select() on UDP, then poll UART and watchdog every pass."""
+        state = self.state
+        last_no_rx_log_sec = -10
+        self._running = True
+
+        print(f"✓ Bridge loop running – awaiting raw iBUS frames on UDP {self.args.listen_port}...")
+
+        while self._running:
+            # Read incoming UDP packets (raw 32-byte iBUS frames)
+            readable, _, _ = select.select(list(self.socks), [], [], 0.02)
+            self.wakeups += 1
+            if readable:
+                self.handle_udp(readable)
+            self.timers.clear()      # handle_udp() arms the selector watchdog; unused here
+
+            # Read incoming UART logs from ESP32
+            if self.uart_dev:
+                with suppress(Exception):
+                    if available := self.uart_dev.in_waiting:
+                        self.handle_uart_rx(self.uart_dev.read(available))
+                        self._publish()
+
+            now_mono = time.monotonic()
+            if self.last_rx_time == 0:
+                bucket = int(now_mono) // 5
+                if bucket != last_no_rx_log_sec:
+                    last_no_rx_log_sec = bucket
+                    state.add_log("PI", "⚠ Waiting for first RC frame from PC sender...")
+            elif (now_mono - self.last_rx_time) > RC_LOST_SEC:
+                bucket = int(now_mono) // 5
+                if bucket != last_no_rx_log_sec:
+                    last_no_rx_log_sec = bucket
+                    state.add_log("PI", "⚠ RC signal lost – nothing forwarded, ESP32 failsafe takes over")
+
+
+def build_frame(index: int) -> bytes:
+    """Valid iBUS frame whose first two channels encode a frame index."""
+    channels = [1000 + (index & 0x3FF), 1000 + ((index >> 10) & 0x3FF)] + [1500] * 12
+    body = b"\x20\x40" + struct.pack("<14H", *channels)
+    checksum = (0xFFFF - (sum(body) & 0xFFFF)) & 0xFFFF
+    return body + struct.pack("<H", checksum)
+
+
+def frame_index(frame: bytes) -> int:
+    ch1, ch2 = struct.unpack_from("<2H", frame, 2)
+    return (ch1 - 1000) | ((ch2 - 1000) << 10)
+
+
+def thread_cpu(thread: threading.Thread) -> float:
+    return time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int((len(ordered) - 1) * pct / 100.0 + 0.5))]
+
+
+def bench_loop(loop: str, args) -> dict:
+    master, slave = pty.openpty()
+    os.set_blocking(master, False)
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+
+    state = SharedState()
+    ns = types.SimpleNamespace(listen_ip="127.0.0.1", listen_port=port, extra_listen=[],
+                               uart_port=os.ttyname(slave), baud=115200)
+    bridge = (RcBridge if loop == "selector" else PolledBridge)(state, ns)
+    if not bridge.open():
+        raise SystemExit("bridge could not bind")
+
+    # Timestamp every ESP32 line as the bridge logs it
+    log_times = {}
+    add_logs = state.add_logs
+
+    def timed_add_logs(src, msgs):
+        now = time.perf_counter()
+        for msg in msgs:
+            if src == "ESP32" and msg.startswith("BENCH "):
+                log_times[int(msg.split()[1])] = now
+        add_logs(src, msgs)
+
+    state.add_logs = timed_add_logs
+
+    thread = threading.Thread(target=bridge.run, daemon=True)
+    thread.start()
+    time.sleep(0.2)
+
+    # ── idle ────────────────────────────────────────────────────────────────
+    cpu0, wake0, t0 = thread_cpu(thread), bridge.wakeups, time.perf_counter()
+    time.sleep(args.idle)
+    idle_elapsed = time.perf_counter() - t0
+    idle_cpu = (thread_cpu(thread) - cpu0) / idle_elapsed
+    idle_wakeups = (bridge.wakeups - wake0) / idle_elapsed
+
+    # ── UDP → UART and UART → log under load ────────────────────────────────
+    sent_at = {}
+    arrived_at = {}
+    line_sent_at = {}
+    done = threading.Event()
+
+    def drain_master():
+        buf = bytearray()
+        while not done.is_set():
+            try:
+                chunk = os.read(master, 4096)
+            except BlockingIOError:
+                time.sleep(0.0001)
+                continue
+            now = time.perf_counter()
+            buf += chunk
+            while len(buf) >= IBUS_FRAME_LEN:
+                start = buf.find(b"\x20\x40")
+                if start < 0 or len(buf) - start < IBUS_FRAME_LEN:
+                    break
+                arrived_at.setdefault(frame_index(bytes(buf[start:start + IBUS_FRAME_LEN])), now)
+                del buf[:start + IBUS_FRAME_LEN]
+
+    reader = threading.Thread(target=drain_master, daemon=True)
+    reader.start()
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    interval = 1.0 / args.hz
+    cpu0, t0 = thread_cpu(thread), time.perf_counter()
+    deadline = t0
+    for i in range(args.frames):
+        deadline += interval
+        while time.perf_counter() < deadline:
+            time.sleep(max(0.0, deadline - time.perf_counter() - 0.0005))
+        frame = build_frame(i)
+        sent_at[i] = time.perf_counter()
+        tx.sendto(frame, ("127.0.0.1", port))
+        if i % args.line_every == 0:
+            line_sent_at[i] = time.perf_counter()
+            os.write(master, f"BENCH {i}\r\n".encode())
+    time.sleep(0.2)
+    load_elapsed = time.perf_counter() - t0
+    load_cpu = (thread_cpu(thread) - cpu0) / load_elapsed
+    done.set()
+    reader.join(timeout=1.0)
+    tx.close()
+
+    bridge.stop()
+    thread.join(timeout=2.0)
+    bridge.close()
+    os.close(master)
+    os.close(slave)
+
+    fwd = [(arrived_at[i] - sent_at[i]) * 1e6 for i in sent_at if i in arrived_at]
+    rx = [(log_times[i] - line_sent_at[i]) * 1e6 for i in line_sent_at if i in log_times]
+    return {
+        "idle_cpu": idle_cpu,
+        "idle_wakeups": idle_wakeups,
+        "load_cpu": load_cpu,
+        "fwd": fwd,
+        "fwd_missing": len(sent_at) - len(fwd),
+        "rx": rx,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bridge loop latency/CPU benchmark on a pty pair")
+    parser.add_argument("--frames", type=int, default=1000, help="UDP frames to forward (default: 1000)")
+    parser.add_argument("--hz", type=float, default=100.0, help="UDP send rate (default: 100)")
+    parser.add_argument("--idle", type=float, default=3.0, help="Idle measurement window in seconds (default: 3)")
+    parser.add_argument("--line-every", type=int, default=5,
+                        help="Inject one ESP32 log line every N frames (default: 5)")
+    args = parser.parse_args()
+
+    results = {loop: bench_loop(loop, args) for loop in ("polled", "selector")}
+
+    print(f"\n{args.frames} frames @ {args.hz:g} Hz, idle window {args.idle:g}s")
+    print(f"{'loop':<10}{'idle CPU':>10}{'wakeups/s':>11}{'load CPU':>10}"
+          f"{'UDP→UART p50/p99 µs':>22}{'UART→log p50/p99 µs':>22}{'lost':>6}")
+    for loop, r in results.items():
+        fwd = f"{percentile(r['fwd'], 50):.0f}/{percentile(r['fwd'], 99):.0f}"
+        rx = f"{percentile(r['rx'], 50):.0f}/{percentile(r['rx'], 99):.0f}"
+        print(f"{loop:<10}{r['idle_cpu']:>9.2%}{r['idle_wakeups']:>11.1f}{r['load_cpu']:>9.2%}"
+              f"{fwd:>22}{rx:>22}{r['fwd_missing']:>6}")
+
+
+if __name__ == "__main__":
+    main()
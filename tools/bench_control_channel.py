@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark: servo commands over REST fetch() vs the /ws/control WebSocket.
+
+Serves the pi_rover_system Flask app on a loopback port with a simulated
+GpioController and replays a slider drag: one servo command every
+1000/--rate ms for --duration seconds.
+
+  rest  – one POST /api/servo/1 per command, fired without waiting on a
+          pool of --connections keep-alive connections (a browser issues
+          un-awaited fetch() calls over up to 6 connections per host)
+  ws    – one JSON message per command on a single WebSocket
+
+Each command carries a unique angle, so every GpioController.set_servo()
+call can be matched to the moment it was sent. Reports how many commands
+reached set_servo, how many arrived behind an older one (reordered), and
+command→set_servo latency.
+
+Usage:
+  python3 tools/bench_control_channel.py
+  python3 tools/bench_control_channel.py --rate 120 --duration 10
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import types
+from contextlib import suppress
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import simple_websocket  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+from bench_bridge_loop import percentile  # noqa: E402
+from pi_rover_system import GpioController, SharedState, create_app  # noqa: E402
+
+
+class TimedGpio(GpioController):
+    """Simulated GpioController that timestamps every set_servo() call."""
+
+    def __init__(self, state):
+        super().__init__(state)
+        self.applied = []
+
+    def set_servo(self, servo_id, angle):
+        self.applied.append((angle, time.perf_counter()))
+        super().set_servo(servo_id, angle)
+
+
+def drive_rest(port, sent_at, args):
+    jobs = queue.Queue()
+
+    def worker():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        while True:
+            angle = jobs.get()
+            if angle is None:
+                break
+            conn.request("POST", "/api/servo/1", body=json.dumps({"angle": angle}),
+                         headers={"Content-Type": "application/json"})
+            conn.getresponse().read()
+        conn.close()
+
+    workers = [threading.Thread(target=worker, daemon=True) for _ in range(args.connections)]
+    for w in workers:
+        w.start()
+    pace(lambda angle: jobs.put(angle), sent_at, args)
+    for _ in workers:
+        jobs.put(None)
+    for w in workers:
+        w.join(timeout=10.0)
+
+
+def drive_ws(port, sent_at, args):
+    ws = simple_websocket.Client.connect(f"ws://127.0.0.1:{port}/ws/control")
+
+    def drain():
+        # Acks are not needed here, but an unread socket would fill up
+        with suppress(simple_websocket.ConnectionClosed):
+            while True:
+                ws.receive()
+
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+    seq = iter(range(1, 1 << 30))
+    pace(lambda angle: ws.send(json.dumps({"seq": next(seq), "cmd": "servo", "id": 1, "value": angle})),
+         sent_at, args)
+    time.sleep(0.2)
+    ws.close()
+    reader.join(timeout=2.0)
+
+
+def pace(send, sent_at, args):
+    interval = 1.0 / args.rate
+    deadline = time.perf_counter()
+    for angle in range(1, int(args.rate * args.duration) + 1):
+        deadline += interval
+        while time.perf_counter() < deadline:
+            time.sleep(max(0.0, deadline - time.perf_counter() - 0.0005))
+        sent_at[angle] = time.perf_counter()
+        send(angle)
+
+
+def run(mode: str, args) -> dict:
+    state = SharedState()
+    gpio = TimedGpio(state)
+    app = create_app(state, gpio, types.SimpleNamespace(eth_interface="lo"))
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    sent_at = {}
+    (drive_ws if mode == "ws" else drive_rest)(server.server_port, sent_at, args)
+    time.sleep(0.3)
+    server.shutdown()
+
+    lat = [(t - sent_at[angle]) * 1000.0 for angle, t in gpio.applied]
+    reordered = sum(1 for prev, cur in zip(gpio.applied, gpio.applied[1:]) if cur[0] < prev[0])
+    final = gpio.applied[-1][0] if gpio.applied else None
+    return {"sent": len(sent_at), "applied": len(gpio.applied), "reordered": reordered,
+            "final_ok": final == len(sent_at), "lat": lat}
+
+
+def main():
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)   # no per-request access log
+    parser = argparse.ArgumentParser(description="Servo command REST vs WebSocket benchmark")
+    parser.add_argument("--rate", type=float, default=60.0, help="Slider commands per second (default: 60)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of dragging per run (default: 5)")
+    parser.add_argument("--connections", type=int, default=6,
+                        help="Concurrent REST connections, like a browser's per-host limit (default: 6)")
+    args = parser.parse_args()
+
+    results = {mode: run(mode, args) for mode in ("rest", "ws")}
+    print(f"\nslider drag: {args.rate:g} commands/s for {args.duration:g}s")
+    print(f"{'mode':<6}{'sent':>7}{'applied':>9}{'reordered':>11}{'final ok':>10}"
+          f"{'cmd→PWM p50 ms':>16}{'p99 ms':>9}{'max ms':>9}")
+    for mode, r in results.items():
+        lat = r["lat"]
+        print(f"{mode:<6}{r['sent']:>7}{r['applied']:>9}{r['reordered']:>11}{str(r['final_ok']):>10}"
+              f"{percentile(lat, 50):>16.2f}{percentile(lat, 99):>9.2f}"
+              f"{max(lat) if lat else float('nan'):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
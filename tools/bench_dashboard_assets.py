@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: inline dashboard template vs cached, precompressed static assets.
+
+Serves the dashboard on a loopback port two ways and loads it --loads times
+with http.client, sending "Accept-Encoding: gzip, br" like a browser:
+
+  inline  – the old route: static/ inlined back into one page and rendered
+            with render_template_string() on every request, uncompressed
+  assets  – pi_rover_system.create_app(): index.html rendered once at
+            startup, CSS/JS as versioned, precompressed static files
+
+A cold load fetches the page and everything it links; a warm load is what a
+browser with a primed cache sends (If-None-Match on the page, nothing for
+immutable CSS/JS). Reports document time-to-first-byte, full load time and
+bytes transferred.
+
+Usage:
+  python3 tools/bench_dashboard_assets.py
+  python3 tools/bench_dashboard_assets.py --loads 500
+"""
+import argparse
+import http.client
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from flask import Flask, render_template_string, request  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+from bench_bridge_loop import percentile  # noqa: E402
+from pi_rover_system import STATIC_DIR, SharedState, create_app  # noqa: E402
+
+ACCEPT = {"Accept-Encoding": "gzip, br"}
+
+
+def inline_app() -> Flask:
+    """The dashboard as it was served before: one template rendered per request."""
+    def read(name):
+        with open(os.path.join(STATIC_DIR, name), encoding="utf-8") as f:
+            return f.read()
+
+    page = read("index.html")
+    page = re.sub(r'<link rel="stylesheet"[^>]*>', lambda m: f"<style>\n{read('dashboard.css')}</style>", page)
+    page = re.sub(r'<script src="[^"]*"></script>', lambda m: f"<script>\n{read('dashboard.js')}</script>", page)
+    page = page.replace('<img id="cam-img" ', '<img id="cam-img" src="{{ video_url }}" ')
+    app = Flask(__name__)
+
+    @app.get("/")
+    def dashboard():
+        host = request.host.split(':')[0]
+        return render_template_string(page, video_url=f"http://{host}:8081/video_feed")
+
+    return app
+
+
+def fetch(conn, path, headers):
+    """GET path; returns (ttfb s, total s, wire bytes, response)."""
+    t0 = time.perf_counter()
+    conn.request("GET", path, headers=headers)
+    resp = conn.getresponse()
+    ttfb = time.perf_counter() - t0
+    body = resp.read()
+    header_bytes = sum(len(k) + len(v) + 4 for k, v in resp.getheaders())
+    return ttfb, time.perf_counter() - t0, len(body) + header_bytes, resp
+
+
+def load(conn, cache: dict) -> tuple:
+    """One page load; cache maps path -> ETag and is filled on a cold load."""
+    headers = dict(ACCEPT)
+    if cache.get("/"):
+        headers["If-None-Match"] = cache["/"]
+    ttfb, total, nbytes, resp = fetch(conn, "/", headers)
+    cache["/"] = resp.getheader("ETag")
+    for path in re.findall(r'(/static/[^"]+)', cache.setdefault("links", "")):
+        if path in cache:
+            continue          # immutable: served from the browser cache
+        _, t, n, _ = fetch(conn, path, ACCEPT)
+        total += t
+        nbytes += n
+        cache[path] = True
+    return ttfb, total, nbytes
+
+
+def run(name: str, app: Flask, args) -> dict:
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+
+    # Links the page references, found from an uncompressed fetch
+    conn.request("GET", "/")
+    links = conn.getresponse().read().decode()
+    results = {}
+    for phase in ("cold", "warm"):
+        ttfbs, totals, sizes = [], [], []
+        primed = {"links": links}
+        if phase == "warm":
+            load(conn, primed)
+        for _ in range(args.loads):
+            cache = dict(primed) if phase == "warm" else {"links": links}
+            ttfb, total, nbytes = load(conn, cache)
+            ttfbs.append(ttfb * 1000.0)
+            totals.append(total * 1000.0)
+            sizes.append(nbytes)
+        results[phase] = {"ttfb": ttfbs, "total": totals, "bytes": sum(sizes) / len(sizes)}
+    conn.close()
+    server.shutdown()
+    return results
+
+
+def main():
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)   # no per-request access log
+    parser = argparse.ArgumentParser(description="Dashboard page serving benchmark")
+    parser.add_argument("--loads", type=int, default=200, help="Page loads per phase (default: 200)")
+    args = parser.parse_args()
+
+    apps = {"inline": inline_app(),
+            "assets": create_app(SharedState(), None, types.SimpleNamespace(eth_interface="lo"))}
+    print(f"\n{args.loads} page loads per phase over loopback")
+    print(f"{'serving':<9}{'load':<6}{'TTFB p50 ms':>13}{'p99 ms':>9}{'load p50 ms':>13}{'bytes/load':>12}")
+    for name, app in apps.items():
+        for phase, r in run(name, app, args).items():
+            print(f"{name:<9}{phase:<6}{percentile(r['ttfb'], 50):>13.2f}{percentile(r['ttfb'], 99):>9.2f}"
+                  f"{percentile(r['total'], 50):>13.2f}{r['bytes']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark: dashboard update channels – 500 ms polling vs long-poll vs SSE.
+
+Serves the pi_rover_system Flask app on a loopback port and attaches 1, 5
+and 20 simulated dashboard viewers in each mode:
+
+  poll      – GET /api/status and /api/logs?since= every 500 ms (old dashboard)
+  longpoll  – /api/status every 500 ms plus /api/logs?wait= long-polls
+  sse       – one /api/events Server-Sent Events stream per viewer
+
+A producer thread adds a log line every --line-ms carrying its creation
+time; each viewer records how long the line took to reach it. Reports HTTP
+requests/s hitting the server and end-to-end log latency.
+
+Usage:
+  python3 tools/bench_dashboard_push.py
+  python3 tools/bench_dashboard_push.py --viewers 1,5,20 --duration 10
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from bench_bridge_loop import percentile  # noqa: E402
+from pi_rover_system import LogRing, SharedState, create_app  # noqa: E402
+
+
+def viewer_poll(port, stop, latencies, long_poll: bool):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    since = 0
+    next_status = 0.0
+    while not stop.is_set():
+        now = time.monotonic()
+        if now >= next_status:
+            conn.request("GET", "/api/status")
+            conn.getresponse().read()
+            next_status = now + 0.5
+        wait = f"&wait={max(0.05, next_status - time.monotonic()):.3f}" if long_poll else ""
+        conn.request("GET", f"/api/logs?since={since}{wait}")
+        logs = json.loads(conn.getresponse().read())["logs"]
+        seen = time.perf_counter()
+        for item in logs:
+            since = item["id"]
+            if item["msg"].startswith("BENCH "):
+                latencies.append((seen - float(item["msg"].split()[1])) * 1000.0)
+        if not long_poll:
+            stop.wait(max(0.0, next_status - time.monotonic()))
+    conn.close()
+
+
+def viewer_sse(port, stop, latencies):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.request("GET", "/api/events")
+    resp = conn.getresponse()
+    event = None
+    while not stop.is_set():
+        line = resp.readline()
+        if not line:
+            break
+        line = line.decode().rstrip("\n")
+        if line.startswith("event: "):
+            event = line[7:]
+        elif line.startswith("data: ") and event == "logs":
+            seen = time.perf_counter()
+            for item in json.loads(line[6:]):
+                if item["msg"].startswith("BENCH "):
+                    latencies.append((seen - float(item["msg"].split()[1])) * 1000.0)
+    conn.close()
+
+
+def run(mode: str, viewers: int, args) -> dict:
+    state = SharedState(logs=LogRing(1000))
+    ns = types.SimpleNamespace(eth_interface="lo")
+    app = create_app(state, None, ns)
+    requests = [0]
+
+    @app.before_request
+    def count_request():
+        requests[0] += 1
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    port = server.server_port
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    stop = threading.Event()
+    latencies = []
+    if mode == "sse":
+        targets = [(viewer_sse, (port, stop, latencies))] * viewers
+    else:
+        targets = [(viewer_poll, (port, stop, latencies, mode == "longpoll"))] * viewers
+    threads = [threading.Thread(target=fn, args=a, daemon=True) for fn, a in targets]
+    for t in threads:
+        t.start()
+    time.sleep(1.0)
+
+    requests[0] = 0
+    latencies.clear()
+    t0 = time.monotonic()
+    while time.monotonic() - t0 < args.duration:
+        state.add_log("ESP32", f"BENCH {time.perf_counter():.6f}")
+        time.sleep(args.line_ms / 1000.0)
+    elapsed = time.monotonic() - t0
+    req_rate = requests[0] / elapsed
+    lat = list(latencies)
+
+    stop.set()
+    state.add_log("PI", "bench done")   # wakes long-polls and SSE streams
+    for t in threads:
+        t.join(timeout=2.0)
+    server.shutdown()
+    return {"req_s": req_rate, "lat": lat}
+
+
+def main():
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)   # no per-request access log
+    parser = argparse.ArgumentParser(description="Dashboard polling vs push benchmark")
+    parser.add_argument("--viewers", default="1,5,20", help="Comma-separated viewer counts (default: 1,5,20)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run (default: 5)")
+    parser.add_argument("--line-ms", type=float, default=100.0, help="Log line interval in ms (default: 100)")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'viewers':>8}{'HTTP req/s':>12}{'log p50 ms':>12}{'p99 ms':>10}{'lines seen':>12}")
+    for viewers in (int(v) for v in args.viewers.split(",")):
+        for mode in ("poll", "longpoll", "sse"):
+            r = run(mode, viewers, args)
+            lat = r["lat"]
+            print(f"{mode:<10}{viewers:>8}{r['req_s']:>12.1f}{percentile(lat, 50):>12.1f}"
+                  f"{percentile(lat, 99):>10.1f}{len(lat):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ESP32 UART line parsing throughput.
+
+Feeds a mix of the firmware's line formats (IBUS channel dumps, CAL, BOOT
+and untagged text) through pi_rover_system.Esp32LineParser.parse() alone
+and through Esp32Tracker (parse + state update + metrics store, plus one
+snapshot publish() per --chunk lines, as RcBridge does per UART read), and
+compares the rate with how many such lines a 115200-baud UART can carry.
+
+Usage:
+  python3 tools/bench_esp32_parser.py
+  python3 tools/bench_esp32_parser.py --lines 200000 --baud 921600
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pi_rover_system import Esp32LineParser, Esp32Tracker, SharedState  # noqa: E402
+
+
+def make_lines(count: int) -> list:
+    rng = random.Random(1)
+    lines = []
+    for i in range(count):
+        kind = rng.random()
+        if kind < 0.90:
+            chans = " ".join(f"CH{c}={rng.randint(1000, 2000)}" for c in range(1, 15))
+            lines.append(f"IBUS: {chans}")
+        elif kind < 0.93:
+            lines.append(f"CAL: load valid=1 roll={rng.uniform(-5, 5):.2f} pitch={rng.uniform(-5, 5):.2f} "
+                         f"yaw={rng.uniform(-180, 180):.2f}")
+        elif kind < 0.96:
+            lines.append(rng.choice(["BOOT: setup start", "BOOT: IMU init OK", "BOOT: Depth init FAILED",
+                                     "BOOT: ESC1 attach ch=0 pin=25"]))
+        else:
+            lines.append(f"loop dt={rng.randint(1900, 2100)}us free heap {rng.randint(100000, 200000)}")
+    return lines
+
+
+def tracker_feed(chunk: int):
+    """Esp32Tracker.feed() for each line, publish() after every chunk lines."""
+    tracker = Esp32Tracker(SharedState())
+    fed = 0
+
+    def feed(line):
+        nonlocal fed
+        tracker.feed(line)
+        fed += 1
+        if fed % chunk == 0:
+            tracker.publish()
+    return feed
+
+
+def rate(fn, lines, repeat: int) -> float:
+    best = 0.0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for line in lines:
+            fn(line)
+        best = max(best, len(lines) / (time.perf_counter() - t0))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ESP32 line parser throughput benchmark")
+    parser.add_argument("--lines", type=int, default=50000, help="Lines per pass (default: 50000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes, best one reported (default: 3)")
+    parser.add_argument("--baud", type=int, default=115200, help="UART rate to compare against (default: 115200)")
+    parser.add_argument("--chunk", type=int, default=1,
+                        help="Lines per UART read, i.e. per snapshot publish (default: 1, the worst case)")
+    args = parser.parse_args()
+
+    lines = make_lines(args.lines)
+    avg_len = sum(len(line) + 2 for line in lines) / len(lines)   # + "\r\n"
+    uart_lines = args.baud / 10 / avg_len                          # 8N1: 10 bits per byte
+
+    results = {
+        "parse": rate(Esp32LineParser().parse, lines, args.repeat),
+        "tracker": rate(tracker_feed(max(1, args.chunk)), lines, args.repeat),
+    }
+    print(f"\n{args.lines} lines, avg {avg_len:.0f} bytes; {args.baud} baud carries at most {uart_lines:.0f} lines/s")
+    print(f"{'stage':<10}{'lines/s':>12}{'µs/line':>10}{'× UART rate':>13}{'CPU at UART rate':>18}")
+    for stage, lps in results.items():
+        print(f"{stage:<10}{lps:>12.0f}{1e6 / lps:>10.2f}{lps / uart_lines:>13.0f}{uart_lines / lps:>17.2%}")
+
+
+if __name__ == "__main__":
+    main()
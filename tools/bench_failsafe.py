@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark: how long the ESP32 keeps acting on a stale command after RC loss.
+
+Runs RcBridge on a pty pair, sends iBUS frames over UDP at --rc-hz with a
+moving stick, then stops the sender for --outage-ms, --outages times. A
+reader on the pty master timestamps every frame the bridge writes and checks
+its checksum. Per --failsafe-ms setting it reports:
+
+  engage ms  – last real frame → first failsafe frame on the UART
+  hold ms    – how long the last real command stays in effect: until the
+               first failsafe frame, or the ESP32's own 500 ms RC_LOST_US
+               timeout when the Pi sends nothing (--failsafe-ms 0)
+  fs Hz      – failsafe frame rate during the outage, vs the RC rate
+  bad        – frames with a wrong checksum or not matching the profile
+  resume ms  – sender back → first real frame on the UART
+
+Usage:
+  python3 tools/bench_failsafe.py
+  python3 tools/bench_failsafe.py --settings 0,50,100,200 --outage-ms 1000
+"""
+import argparse
+import os
+import pty
+import select
+import socket
+import sys
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_bridge_loop import build_frame, percentile  # noqa: E402
+from pi_rover_system import (FAILSAFE_NEUTRAL, IBUS_FRAME_LEN, IBUS_HEADER, RcBridge,  # noqa: E402
+                             SharedState, parse_ibus_frame)
+
+ESP32_RC_LOST_SEC = 0.5
+
+
+def read_frames(master: int, out: list, stop: threading.Event):
+    buf = b""
+    while not stop.is_set():
+        ready, _, _ = select.select([master], [], [], 0.05)
+        if not ready:
+            continue
+        now = time.monotonic()
+        buf += os.read(master, 4096)
+        while True:
+            start = buf.find(IBUS_HEADER)
+            if start < 0 or len(buf) - start < IBUS_FRAME_LEN:
+                break
+            out.append((now, buf[start:start + IBUS_FRAME_LEN]))
+            buf = buf[start + IBUS_FRAME_LEN:]
+
+
+def run(failsafe_ms: float, args) -> dict:
+    master, slave = pty.openpty()
+    state = SharedState()
+    ns = types.SimpleNamespace(listen_ip="127.0.0.1", listen_port=0, extra_listen=[],
+                               uart_port=os.ttyname(slave), baud=115200, failsafe_ms=failsafe_ms)
+    bridge = RcBridge(state, ns)
+    bridge.open()
+    port = next(iter(bridge.socks)).getsockname()[1]
+    frames, stop = [], threading.Event()
+    reader = threading.Thread(target=read_frames, args=(master, frames, stop), daemon=True)
+    reader.start()
+    thread = threading.Thread(target=bridge.run, daemon=True)
+    thread.start()
+
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    interval = 1.0 / args.rc_hz
+    index = 0
+    outages = []                      # (last real send, resume send)
+
+    def send_for(seconds: float):
+        nonlocal index
+        deadline = time.monotonic()
+        end = deadline + seconds
+        while deadline < end:
+            index += 1
+            tx.sendto(build_frame(index), ("127.0.0.1", port))
+            deadline += interval
+            time.sleep(max(0.0, deadline - time.monotonic()))
+
+    send_for(0.5)
+    for _ in range(args.outages):
+        last_sent = time.monotonic()
+        time.sleep(args.outage_ms / 1000.0)
+        outages.append((last_sent, time.monotonic()))
+        send_for(0.3)
+    time.sleep(0.05)
+    bridge.stop()
+    thread.join(timeout=2.0)
+    stop.set()
+    reader.join(timeout=1.0)
+    bridge.close()
+    os.close(master)
+    os.close(slave)
+    tx.close()
+
+    failsafe = list(FAILSAFE_NEUTRAL)
+    decoded = [(t, parse_ibus_frame(frame)) for t, frame in frames]
+    bad = sum(1 for _, channels in decoded if channels is None)
+    real = [t for t, channels in decoded if channels is not None and channels != failsafe]
+    engage, hold, rates, resume = [], [], [], []
+    for lost_at, back_at in outages:
+        last_real = max((t for t in real if t <= lost_at + 0.005), default=lost_at)
+        during = [(t, channels) for t, channels in decoded if last_real < t < back_at]
+        fs = [t for t, channels in during if channels == failsafe]
+        bad += len(during) - len(fs)      # Anything but the profile while the sender is silent
+        if fs:
+            engage.append((fs[0] - last_real) * 1000.0)
+            hold.append((fs[0] - last_real) * 1000.0)
+            if len(fs) > 1:
+                rates.append((len(fs) - 1) / (fs[-1] - fs[0]))
+        else:
+            hold.append(min(ESP32_RC_LOST_SEC, back_at - last_real) * 1000.0)
+        after = [t for t in real if t >= back_at]
+        if after:
+            resume.append((after[0] - back_at) * 1000.0)
+    return {"engage": engage, "hold": hold, "rates": rates, "resume": resume, "bad": bad,
+            "entries": state.bridge.failsafe["entries"], "frames": state.bridge.failsafe["frames"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pi-side RC failsafe benchmark")
+    parser.add_argument("--rc-hz", type=float, default=50.0, help="RC frames per second (default: 50)")
+    parser.add_argument("--outage-ms", type=float, default=600.0, help="Length of each RC outage (default: 600)")
+    parser.add_argument("--outages", type=int, default=5, help="Outages per setting (default: 5)")
+    parser.add_argument("--settings", default="0,100", help="Comma-separated --failsafe-ms values (default: 0,100)")
+    args = parser.parse_args()
+
+    print(f"\nRC {args.rc_hz:g} Hz, {args.outages} outages of {args.outage_ms:g} ms")
+    print(f"{'failsafe':>9}{'entries':>9}{'frames':>8}{'engage p50 ms':>15}{'hold max ms':>13}"
+          f"{'fs Hz':>8}{'bad':>5}{'resume p50 ms':>15}")
+    for setting in (float(v) for v in args.settings.split(",")):
+        r = run(setting, args)
+        rate = sum(r["rates"]) / len(r["rates"]) if r["rates"] else float("nan")
+        print(f"{setting:>7g}ms{r['entries']:>9}{r['frames']:>8}{percentile(r['engage'], 50):>15.1f}"
+              f"{max(r['hold']):>13.1f}{rate:>8.1f}{r['bad']:>5}{percentile(r['resume'], 50):>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
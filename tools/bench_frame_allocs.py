@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-frame allocations and time on the capture → encode path.
+
+Drives pi_web_video_stream.py's capture thread steps by hand, frame by frame,
+on SyntheticCapture's test pattern, and runs each stage under tracemalloc:
+
+  capture – CameraStream.read_frame(): the BGR frame the encoders take
+  tiers   – encode_tiers() with all MJPEG_TIERS wanted (OpenCV JPEG)
+  h264    – LibX264Encoder.encode() (needs PyAV)
+
+in two pipelines:
+
+  copy  – the path before preallocated buffers: picamera2's capture_array()
+          copy of an XBGR8888 frame plus cv2.cvtColor() to BGR, a fresh
+          array per scaled tier, a new PyAV frame per H.264 encode
+  reuse – the current one: captures land in CameraStream.frame_buf, scaled
+          tiers in tier_frames, H.264 input in the encoder's I420 picture
+
+Per stage it reports, over --frames frames after a warm-up:
+
+  peak KB    – tracemalloc high-water mark above the stage's start, per frame
+  out KB     – the stage's result (JPEGs, access unit): allocated by design
+  scratch KB – peak minus out: memory the stage needed only in passing
+  ms         – wall time per frame, from a separate run without tracemalloc
+
+and the traced memory the whole run left behind (should stay ~0). tracemalloc
+sees Python objects and NumPy arrays, including OpenCV's outputs; scratch
+inside OpenCV, libav and x264 (the copy pipeline's bgr24 → yuv420p
+conversion, for one) is outside it and shows only in ms.
+
+Exits with status 1 when a reuse-pipeline stage needs more than 1/8 of a
+frame of scratch in any frame, so it doubles as a check.
+
+Usage:
+  python3 tools/bench_frame_allocs.py
+  python3 tools/bench_frame_allocs.py --width 1280 --height 720 --frames 200
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import cv2  # noqa: E402
+
+import pi_web_video_stream as video  # noqa: E402
+from bench_bridge_loop import percentile  # noqa: E402
+
+ALL_TIERS = set(range(len(video.MJPEG_TIERS)))
+
+
+class CopyPipeline:
+    """The stages as they were: every step returns a newly allocated array."""
+
+    def __init__(self, camera):
+        self.camera = camera
+        # picamera2 delivered XBGR8888, channels [R,G,B,X]
+        self.xbgr = [cv2.cvtColor(f, cv2.COLOR_BGR2RGBA) for f in camera.capture.frames]
+        self.index = 0
+
+    def capture(self):
+        self.index = (self.index + 1) % len(self.xbgr)
+        frame = self.xbgr[self.index].copy()                  # capture_array()
+        return cv2.cvtColor(frame, cv2.COLOR_RGBA2BGR)
+
+    def tiers(self, frame) -> tuple:
+        out = []
+        for i, (_, scale, _) in enumerate(video.MJPEG_TIERS):
+            encoder = self.camera.encoder if i == 0 else self.camera.tier_encoders[i]
+            if scale != 1.0:
+                height, width = frame.shape[:2]
+                frame_i = cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+            else:
+                frame_i = frame
+            out.append(encoder.encode(frame_i))
+        return tuple(out)
+
+    def h264(self, frame) -> bytes | None:
+        encoder = self.camera.h264
+        picture = video.av.VideoFrame.from_ndarray(frame, format="bgr24")
+        picture.pts = encoder.pts
+        encoder.pts += 1
+        return b"".join(bytes(packet) for packet in encoder.ctx.encode(picture)) or None
+
+
+class ReusePipeline:
+    """The stages as CameraStream runs them now."""
+
+    def __init__(self, camera):
+        self.camera = camera
+
+    def capture(self):
+        return self.camera.read_frame()
+
+    def tiers(self, frame) -> tuple:
+        return self.camera.encode_tiers(frame, ALL_TIERS)
+
+    def h264(self, frame) -> bytes | None:
+        return self.camera.h264.encode(frame)
+
+
+def out_size(result) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, tuple):
+        return sum(len(jpeg) for jpeg in result if jpeg is not None)
+    return len(result) if isinstance(result, bytes) else 0      # A frame is not an output
+
+
+def heap_size() -> int:
+    """Traced bytes, minus this script's own bookkeeping (the sample lists)."""
+    snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, __file__)])
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+def traced(fn, *args) -> tuple:
+    """(result, peak bytes above the start, result bytes) for one call."""
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    result = fn(*args)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    return result, peak, out_size(result)
+
+
+def run(mode: str, args) -> dict:
+    capture = video.SyntheticCapture(args.width, args.height, paced=False)
+    camera = video.CameraStream(0, args.width, args.height, 20, capture=capture, encoder="opencv",
+                                h264="libx264" if video.AV_AVAILABLE else "off")
+    pipeline = CopyPipeline(camera) if mode == "copy" else ReusePipeline(camera)
+    stages = ["capture", "tiers"] + (["h264"] if camera.h264 is not None else [])
+
+    def step(measure):
+        frame = measure("capture", pipeline.capture)
+        measure("tiers", pipeline.tiers, frame)
+        if camera.h264 is not None:
+            measure("h264", pipeline.h264, frame)
+
+    # Untraced: time per stage
+    times = {stage: [] for stage in stages}
+
+    def timed(stage, fn, *fn_args):
+        t0 = time.perf_counter()
+        result = fn(*fn_args)
+        times[stage].append((time.perf_counter() - t0) * 1000.0)
+        return result
+
+    for _ in range(args.warmup):
+        step(lambda stage, fn, *fn_args: fn(*fn_args))
+    for _ in range(args.frames):
+        step(timed)
+
+    # Traced: allocations per stage
+    samples = {stage: [] for stage in stages}
+
+    def measure(stage, fn, *fn_args):
+        result, peak, out = traced(fn, *fn_args)
+        samples[stage].append((peak, out))
+        return result
+
+    tracemalloc.start()
+    for _ in range(args.warmup):
+        step(lambda stage, fn, *fn_args: fn(*fn_args))
+    start = heap_size()
+    for _ in range(args.frames):
+        step(measure)
+    left = heap_size() - start
+    tracemalloc.stop()
+    camera.close()
+    return {"times": times, "samples": samples, "left": left}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture→encode per-frame allocation benchmark")
+    parser.add_argument("--frames", type=int, default=100, help="Measured frames per pipeline (default: 100)")
+    parser.add_argument("--warmup", type=int, default=10, help="Frames before measuring (default: 10)")
+    parser.add_argument("--width", type=int, default=640, help="Frame width (default: 640)")
+    parser.add_argument("--height", type=int, default=480, help="Frame height (default: 480)")
+    args = parser.parse_args()
+
+    frame_kb = args.width * args.height * 3 / 1024
+    print(f"\n{args.width}x{args.height} synthetic frames ({frame_kb:.0f} KB BGR), {args.frames} frames per pipeline"
+          + ("" if video.AV_AVAILABLE else "; PyAV not installed, no h264 stage"))
+    print(f"{'pipeline':<10}{'stage':<9}{'peak KB':>9}{'max':>8}{'out KB':>8}{'scratch KB':>12}{'max':>8}{'ms':>7}")
+    failed = []
+    for mode in ("copy", "reuse"):
+        r = run(mode, args)
+        for stage, samples in r["samples"].items():
+            peak = [p / 1024 for p, _ in samples]
+            out = [o / 1024 for _, o in samples]
+            scratch = [(p - o) / 1024 for p, o in samples]
+            print(f"{mode:<10}{stage:<9}{percentile(peak, 50):>9.1f}{max(peak):>8.1f}{percentile(out, 50):>8.1f}"
+                  f"{percentile(scratch, 50):>12.1f}{max(scratch):>8.1f}{percentile(r['times'][stage], 50):>7.2f}")
+            if mode == "reuse" and max(scratch) > frame_kb / 8:
+                failed.append(stage)
+        print(f"{mode:<10}{'left behind after the run:':<34}{r['left'] / 1024:>8.1f} KB")
+    if failed:
+        print(f"\nFAIL: frame-sized scratch allocations in {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
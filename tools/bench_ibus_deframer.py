@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Benchmark: byte-at-a-time read_ibus_frame() vs block-oriented IBusDeframer.
+
+Replays an iBUS byte stream through a fake serial port and reports how many
+frames per second each synchronizer extracts. The stream is either a capture
+from the CP2102 (--capture, raw bytes as read from the port) or a synthetic
+stream with injected noise and corrupted frames.
+
+By default the stream is pushed through a pseudo-terminal and read back with
+pyserial, so every ser.read() is a real read() syscall on a tty just like on
+the CP2102. --transport memory replays from RAM instead and isolates the pure
+Python parsing cost.
+
+Both methods are timed as used by the sender: a frame only counts once
+parse_ibus_frame() has accepted it, and a run ends when every valid frame in
+the stream has been delivered.
+
+Usage:
+  python3 tools/bench_ibus_deframer.py
+  python3 tools/bench_ibus_deframer.py --frames 50000 --corrupt 0.05
+  python3 tools/bench_ibus_deframer.py --capture ibus_dump.bin
+"""
+import argparse
+import os
+import pty
+import random
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import serial  # noqa: E402
+
+from pc_rc_sender import IBUS_FRAME_LEN, IBusDeframer, parse_ibus_frame  # noqa: E402
+
+
+STALL_LIMIT = 60.0   # seconds before a run is abandoned
+
+
+def build_frame(channels) -> bytes:
+    body = b"\x20\x40" + struct.pack("<14H", *channels)
+    checksum = (0xFFFF - (sum(body) & 0xFFFF)) & 0xFFFF
+    return body + struct.pack("<H", checksum)
+
+
+def read_ibus_frame(ser: serial.Serial):
+    """
+    Read and synchronize to an iBUS frame from serial port, byte by byte.
+
+    Scans for the iBUS header (0x20 0x40) then reads remaining 30 bytes.
+    Handles partial frames and synchronization loss gracefully. This is the
+    synchronizer pc_rc_sender.py used before IBusDeframer.
+
+    Args:
+        ser: Open serial.Serial instance (CP2102 device)
+
+    Returns:
+        bytes: 32-byte iBUS frame or None on timeout/error
+    """
+    while True:
+        # Look for first header byte (with timeout handled by ser.timeout)
+        first = ser.read(1)
+        if not first:
+            return None          # Timeout – caller re-enters loop
+        if first != b"\x20":
+            continue
+
+        # Look for second header byte
+        second = ser.read(1)
+        if not second:
+            return None
+
+        # Handle case where we might have sync slipped to the middle of a stream
+        # e.g., ... 0x20 0x20 0x40 ...
+        # If second byte is 0x20, it might be the START of the new frame, not the 2nd byte.
+        if second == b"\x20":
+            # Peek next byte to see if it is 0x40
+            # Note: pyserial peek isn't standard, so we just read one more.
+            third = ser.read(1)
+            if not third:
+                return None
+
+            if third == b"\x40":
+                # Found 0x20 0x20 0x40 -> The second 0x20 was the start.
+                # We have consumed header (second, third).
+                # Need to read rest.
+                rest = ser.read(IBUS_FRAME_LEN - 2)
+                if len(rest) != IBUS_FRAME_LEN - 2:
+                    return None
+                return b"\x20\x40" + rest
+            elif third == b"\x20":
+                # 0x20 0x20 0x20 ... keep trying to sync
+                continue
+            else:
+                # 0x20 0x20 0x?? -> Not a valid header. Reset.
+                continue
+
+        if second != b"\x40":
+            continue
+
+        # Found 0x20 0x40
+        rest = ser.read(IBUS_FRAME_LEN - 2)
+        if len(rest) != IBUS_FRAME_LEN - 2:
+            return None
+
+        return first + second + rest
+
+
+def synthetic_stream(frames: int, corrupt: float, noise: float, seed: int) -> bytes:
+    """Valid frames with occasional flipped bytes and bursts of line noise."""
+    rng = random.Random(seed)
+    out = bytearray()
+    for i in range(frames):
+        channels = [1500 + int(400 * ((i + ch * 7) % 50) / 50) for ch in range(14)]
+        frame = bytearray(build_frame(channels))
+        if rng.random() < corrupt:
+            frame[rng.randrange(2, IBUS_FRAME_LEN)] ^= 0xFF
+        if rng.random() < noise:
+            out += bytes(rng.choice((0x20, 0x40, 0x00, 0xFF)) for _ in range(rng.randrange(1, 8)))
+        out += frame
+    return bytes(out)
+
+
+class ReplaySerial:
+    """Minimal pyserial stand-in that hands out a byte stream in USB-sized blocks."""
+
+    def __init__(self, data: bytes, block: int):
+        self.data = data
+        self.pos = 0
+        self.block = block
+        self.timeout = 0
+
+    @property
+    def in_waiting(self) -> int:
+        return min(self.block, len(self.data) - self.pos)
+
+    def drained(self) -> bool:
+        return self.pos >= len(self.data)
+
+    def read(self, size: int = 1) -> bytes:
+        chunk = self.data[self.pos:self.pos + size]
+        self.pos += len(chunk)
+        return chunk
+
+
+class PtySerial:
+    """Real tty: a writer thread feeds the pty master, pyserial reads the slave."""
+
+    def __init__(self, data: bytes, block: int):
+        master, slave = pty.openpty()
+        self.ser = serial.Serial(os.ttyname(slave), 115200, timeout=0.1)
+        os.close(slave)
+        self.master = master
+        self.writer = threading.Thread(target=self._write, args=(data, block), daemon=True)
+        self.writer.start()
+
+    def _write(self, data: bytes, block: int):
+        for i in range(0, len(data), block):
+            os.write(self.master, data[i:i + block])
+
+    def drained(self) -> bool:
+        return not self.writer.is_alive() and self.ser.in_waiting == 0
+
+    def close(self):
+        self.ser.close()
+        self.writer.join(timeout=1.0)
+        os.close(self.master)
+
+
+def open_port(transport: str, data: bytes, block: int):
+    if transport == "pty":
+        port = PtySerial(data, block)
+        return port.ser, port.drained, port.close
+    port = ReplaySerial(data, block)
+    return port, port.drained, lambda: None
+
+
+def count_valid(data: bytes) -> int:
+    """Number of frames a perfect synchronizer would accept."""
+    return sum(1 for frame in IBusDeframer().feed(data) if parse_ibus_frame(frame) is not None)
+
+
+def bench_bytewise(transport: str, data: bytes, block: int, expected: int):
+    ser, drained, close = open_port(transport, data, block)
+    frames = 0
+    start = time.perf_counter()
+    while frames < expected and time.perf_counter() - start < STALL_LIMIT:
+        frame = read_ibus_frame(ser)
+        if frame is None:
+            if drained():
+                break
+        elif parse_ibus_frame(frame) is not None:
+            frames += 1
+    elapsed = time.perf_counter() - start
+    close()
+    return frames, elapsed
+
+
+def bench_deframer(transport: str, data: bytes, block: int, expected: int):
+    ser, drained, close = open_port(transport, data, block)
+    deframer = IBusDeframer()
+    frames = 0
+    start = time.perf_counter()
+    while frames < expected and time.perf_counter() - start < STALL_LIMIT:
+        batch = deframer.read(ser)
+        if not batch and drained():
+            break
+        for frame in batch:
+            if parse_ibus_frame(frame) is not None:
+                frames += 1
+    elapsed = time.perf_counter() - start
+    close()
+    return frames, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="iBUS synchronizer throughput benchmark")
+    parser.add_argument("--capture", default="", help="Raw iBUS byte capture to replay (default: synthetic)")
+    parser.add_argument("--frames", type=int, default=20000, help="Synthetic frames to generate (default: 20000)")
+    parser.add_argument("--corrupt", type=float, default=0.02, help="Fraction of corrupted frames (default: 0.02)")
+    parser.add_argument("--noise", type=float, default=0.02, help="Fraction of frames preceded by noise (default: 0.02)")
+    parser.add_argument("--block", type=int, default=64, help="Bytes available per driver read (default: 64)")
+    parser.add_argument("--transport", choices=("pty", "memory"), default="pty",
+                        help="Replay through a pseudo-terminal or straight from RAM (default: pty)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.capture:
+        with open(args.capture, "rb") as f:
+            data = f.read()
+        source = args.capture
+    else:
+        data = synthetic_stream(args.frames, args.corrupt, args.noise, args.seed)
+        source = f"synthetic ({args.frames} frames, {args.corrupt:.0%} corrupt, {args.noise:.0%} noisy)"
+
+    expected = count_valid(data)
+    print(f"Stream : {source}, {len(data)} bytes, {args.block}-byte blocks via {args.transport}")
+    print(f"Valid  : {expected} frames")
+    print(f"{'method':<16}{'frames':>10}{'seconds':>10}{'frames/s':>14}")
+    results = {}
+    for name, fn in (("read_ibus_frame", bench_bytewise), ("IBusDeframer", bench_deframer)):
+        frames, elapsed = fn(args.transport, data, args.block, expected)
+        results[name] = frames / elapsed if elapsed else 0.0
+        print(f"{name:<16}{frames:>10}{elapsed:>10.3f}{results[name]:>14,.0f}")
+    if results["read_ibus_frame"]:
+        print(f"Speed-up: {results['IBusDeframer'] / results['read_ibus_frame']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Benchmark: UDP→UART forwarding latency while dashboard pollers hit the API.
+
+Runs RcBridge (selector loop) against a pty pair and forwards --hz frames
+while 0..N threads call /api/status and /api/logs through Flask test
+clients as fast as they can, the way many open dashboard tabs contend for
+the shared state. The frames are sent and read back from the pty by a
+child process, so the measurement itself never waits for this process's
+GIL. Two designs run under the same load:
+
+  locked    – the state before the bridge snapshots: the bridge handles
+              UDP, UART RX and TX drains under state.lock, and /api/status
+              and /api/logs hold that lock while they build the response
+              (including the rc_link percentile summary)
+  snapshot  – the current code: the bridge publishes immutable snapshots
+              and no reader takes a lock the forwarding path needs
+
+Reports forwarding latency percentiles and poller throughput for each
+poller count. Frames the bridge coalesced away because it fell behind are
+counted separately.
+
+Pollers that never block are a worst case: they keep the GIL busy, and the
+bridge thread, woken by epoll, must wait for the holder to drop it (up to
+one switch interval) once per handoff. The bridge process runs with the
+interval main() sets, GIL_SWITCH_INTERVAL_SEC; --switch-interval 0.005
+shows Python's default.
+
+Usage:
+  python3 tools/bench_state_contention.py
+  python3 tools/bench_state_contention.py --pollers 0,2,8,32 --frames 1000
+  python3 tools/bench_state_contention.py --switch-interval 0.005
+"""
+import argparse
+import json
+import os
+import pty
+import socket
+import subprocess
+import sys
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_bridge_loop import build_frame, frame_index, percentile  # noqa: E402
+from pi_rover_system import GIL_SWITCH_INTERVAL_SEC, IBUS_FRAME_LEN, RcBridge, SharedState, create_app  # noqa: E402
+
+
+class LockedBridge(RcBridge):
+    """RcBridge with its event handlers serialized on state.lock, as before the snapshots."""
+
+    def handle_udp(self, socks):
+        with self.state.lock:
+            super().handle_udp(socks)
+
+    def _on_uart_readable(self):
+        with self.state.lock:
+            super()._on_uart_readable()
+
+    def _uart_drain(self, now: float):
+        with self.state.lock:
+            super()._uart_drain(now)
+
+
+def lock_views(app, state, bridge):
+    """Make /api/status and /api/logs hold state.lock while they build the response."""
+    status, logs = app.view_functions["api_status"], app.view_functions["api_logs"]
+
+    def locked_status():
+        with state.lock:
+            bridge.rc_link.snapshot()      # The summary used to be computed per request
+            return status()
+
+    def locked_logs():
+        with state.lock:
+            return logs()
+
+    app.view_functions["api_status"] = locked_status
+    app.view_functions["api_logs"] = locked_logs
+
+
+def drive(master: int, port: int, frames: int, hz: float):
+    """Child process: send the frames, time their arrival on the pty master, print JSON."""
+    os.set_blocking(master, False)
+    sent_at, arrived_at = {}, {}
+    done = threading.Event()
+
+    def drain_master():
+        buf = bytearray()
+        while not done.is_set():
+            try:
+                chunk = os.read(master, 4096)
+            except BlockingIOError:
+                time.sleep(0.0001)
+                continue
+            now = time.perf_counter()
+            buf += chunk
+            while True:
+                start = buf.find(b"\x20\x40")
+                if start < 0 or len(buf) - start < IBUS_FRAME_LEN:
+                    break
+                arrived_at.setdefault(frame_index(bytes(buf[start:start + IBUS_FRAME_LEN])), now)
+                del buf[:start + IBUS_FRAME_LEN]
+
+    reader = threading.Thread(target=drain_master, daemon=True)
+    reader.start()
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    interval = 1.0 / hz
+    deadline = time.perf_counter()
+    for i in range(frames):
+        deadline += interval
+        while time.perf_counter() < deadline:
+            time.sleep(max(0.0, deadline - time.perf_counter() - 0.0005))
+        sent_at[i] = time.perf_counter()
+        tx.sendto(build_frame(i), ("127.0.0.1", port))
+        if i % 10 == 0:
+            # Some ESP32 chatter so /api/logs has work too
+            os.write(master, f"IBUS: frame {i}\r\n".encode())
+    time.sleep(0.3)
+    done.set()
+    reader.join(timeout=2.0)
+    tx.close()
+    # Frames that never reached the UART were superseded while the bridge lagged
+    lat = [(arrived_at[i] - sent_at[i]) * 1e6 for i in sent_at if i in arrived_at]
+    print(json.dumps({"lat": lat, "coalesced": len(sent_at) - len(lat)}))
+
+
+def run(design: str, pollers: int, args) -> dict:
+    master, slave = pty.openpty()
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+
+    state = SharedState()
+    ns = types.SimpleNamespace(listen_ip="127.0.0.1", listen_port=port, extra_listen=[],
+                               uart_port=os.ttyname(slave), baud=115200, eth_interface="lo")
+    bridge = (LockedBridge if design == "locked" else RcBridge)(state, ns)
+    if not bridge.open():
+        raise SystemExit("bridge could not bind")
+    app = create_app(state, None, ns)
+    if design == "locked":
+        state.lock = threading.RLock()     # build_status() takes it again for the GPIO fields
+        lock_views(app, state, bridge)
+    bridge_thread = threading.Thread(target=bridge.run, daemon=True)
+    bridge_thread.start()
+
+    done = threading.Event()
+    polls = [0] * pollers
+
+    def poll(i):
+        client = app.test_client()
+        since = 0
+        while not done.is_set():
+            client.get("/api/status")
+            logs = client.get(f"/api/logs?since={since}").get_json()["logs"]
+            if logs:
+                since = logs[-1]["id"]
+            polls[i] += 2
+
+    threads = [threading.Thread(target=poll, args=(i,), daemon=True) for i in range(pollers)]
+    for t in threads:
+        t.start()
+    time.sleep(0.3)
+
+    t0 = time.perf_counter()
+    child = subprocess.run([sys.executable, os.path.abspath(__file__), "--drive", str(master), str(port),
+                            "--frames", str(args.frames), "--hz", str(args.hz)],
+                           pass_fds=(master,), stdout=subprocess.PIPE, text=True, check=True)
+    elapsed = time.perf_counter() - t0
+    done.set()
+    for t in threads:
+        t.join(timeout=2.0)
+    bridge.stop()
+    bridge_thread.join(timeout=2.0)
+    bridge.close()
+    os.close(master)
+    os.close(slave)
+
+    result = json.loads(child.stdout.strip().splitlines()[-1])
+    result["polls_per_s"] = sum(polls) / elapsed
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared-state contention benchmark")
+    parser.add_argument("--pollers", default="0,4,16", help="Comma-separated poller thread counts (default: 0,4,16)")
+    parser.add_argument("--frames", type=int, default=500, help="UDP frames per run (default: 500)")
+    parser.add_argument("--hz", type=float, default=100.0, help="UDP send rate (default: 100)")
+    parser.add_argument("--switch-interval", type=float, default=GIL_SWITCH_INTERVAL_SEC,
+                        help=f"sys.setswitchinterval() for the bridge process (default: {GIL_SWITCH_INTERVAL_SEC:g})")
+    parser.add_argument("--drive", nargs=2, type=int, metavar=("FD", "PORT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.drive:
+        drive(args.drive[0], args.drive[1], args.frames, args.hz)
+        return
+    sys.setswitchinterval(args.switch_interval)
+
+    rows = [(design, n, run(design, n, args))
+            for n in (int(x) for x in args.pollers.split(",")) for design in ("locked", "snapshot")]
+    print(f"\n{args.frames} frames @ {args.hz:g} Hz, GIL switch interval {sys.getswitchinterval() * 1000:g} ms")
+    print(f"{'design':<10}{'pollers':>8}{'API req/s':>11}{'UDP→UART p50 µs':>18}{'p99 µs':>10}{'max µs':>10}"
+          f"{'coalesced':>11}")
+    for design, n, r in rows:
+        lat = r["lat"]
+        print(f"{design:<10}{n:>8}{r['polls_per_s']:>11.0f}{percentile(lat, 50):>18.0f}{percentile(lat, 99):>10.0f}"
+              f"{max(lat) if lat else float('nan'):>10.0f}{r['coalesced']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of one Pi telemetry sample, subprocess helpers vs TelemetryCollector.
+
+  subprocess – what SystemMonitor used to run every 10 s: vcgencmd
+               measure_temp / measure_volts / get_throttled and free -h
+  native     – pi_rover_system.TelemetryCollector.sample(): pread() on
+               sysfs/procfs files kept open, /dev/vcio ioctls on a Pi
+
+Reports wall time and CPU time per sample (including forked children) and
+the CPU share each approach would take at 1 Hz and 10 Hz. Off a Pi the
+vcgencmd calls fail at exec, so the subprocess figures there are a lower
+bound: they still pay for the fork but not for vcgencmd itself.
+
+Usage:
+  python3 tools/bench_telemetry.py
+  python3 tools/bench_telemetry.py --samples 500
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_bridge_loop import percentile  # noqa: E402
+from pi_rover_system import TelemetryCollector  # noqa: E402
+
+
+def legacy_sample() -> dict:
+    """The four subprocess readings SystemMonitor took before TelemetryCollector."""
+    def run(cmd):
+        try:
+            return subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    temp = run(["vcgencmd", "measure_temp"])
+    volts = run(["vcgencmd", "measure_volts"])
+    free = run(["free", "-h"])
+    throttled = run(["vcgencmd", "get_throttled"])
+    mem = free.splitlines()[1].split() if free else None    # Mem: total used free ...
+    return {
+        "temp": temp.replace("temp=", "").strip() if temp else "N/A",
+        "volts": volts.replace("volt=", "").strip() if volts else "N/A",
+        "ram": f"{mem[2]}/{mem[1]}" if mem else "N/A",
+        "throttled": int(throttled.split("=")[1], 16) if throttled else None,
+    }
+
+
+def cpu_seconds() -> float:
+    # process_time() is precise for this process; children only show in os.times()
+    t = os.times()
+    return time.process_time() + t.children_user + t.children_system
+
+
+def measure(sample, count: int) -> dict:
+    sample()          # warm up (first native sample primes the rate counters)
+    walls = []
+    cpu0 = cpu_seconds()
+    for _ in range(count):
+        t0 = time.perf_counter()
+        sample()
+        walls.append((time.perf_counter() - t0) * 1e6)
+    return {"wall": walls, "cpu_us": (cpu_seconds() - cpu0) / count * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry sampling cost benchmark")
+    parser.add_argument("--samples", type=int, default=200, help="Samples per approach (default: 200)")
+    args = parser.parse_args()
+
+    collector = TelemetryCollector("lo")
+    results = {
+        "subprocess": measure(legacy_sample, args.samples),
+        "native": measure(collector.sample, args.samples),
+    }
+    collector.close()
+
+    print(f"\n{args.samples} samples each")
+    print(f"{'approach':<12}{'wall p50 µs':>13}{'p99 µs':>10}{'CPU µs/sample':>15}{'CPU @1 Hz':>11}{'CPU @10 Hz':>12}")
+    for name, r in results.items():
+        print(f"{name:<12}{percentile(r['wall'], 50):>13.0f}{percentile(r['wall'], 99):>10.0f}"
+              f"{r['cpu_us']:>15.0f}{r['cpu_us'] / 1e4:>10.3f}%{r['cpu_us'] / 1e3:>11.3f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark: iBUS command age on the UART wire, write-always vs backpressure-aware.
+
+Feeds RcBridge iBUS frames over UDP at --rc-hz and replaces its serial port
+with LineRateUart, which drains written bytes at baud/10 bytes per second
+and reports the kernel-queue depth through out_waiting like TIOCOUTQ does.
+A pty cannot be used here: it never reports a TX backlog. Each frame
+carries its index (see bench_bridge_loop.build_frame), so the moment its
+last byte leaves the simulated wire gives the age of the command the ESP32
+acts on.
+
+  legacy – the old write path: every frame straight into the TX queue
+  queue  – RcBridge._uart_write_frame(): hold the newest frame until the
+           TX queue is empty
+
+Run at a rate the line can carry (115200 baud) and at one it cannot
+(--slow-baud), where the old path queues without bound.
+
+Usage:
+  python3 tools/bench_uart_backpressure.py
+  python3 tools/bench_uart_backpressure.py --rc-hz 200 --duration 5
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+import types
+from contextlib import suppress
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_bridge_loop import build_frame, frame_index, percentile  # noqa: E402
+from pi_rover_system import RcBridge, SharedState  # noqa: E402
+
+
+class LineRateUart:
+    """serial.Serial stand-in whose TX queue drains at the line rate."""
+
+    def __init__(self, baud: int):
+        self.baud = baud
+        self.wire_free = 0.0           # When the last queued byte has left
+        self.delivered = []            # (time the frame's last byte left, frame)
+        self._r, self._w = os.pipe()   # Never readable: no ESP32 output
+        self.in_waiting = 0
+
+    def fileno(self) -> int:
+        return self._r
+
+    @property
+    def out_waiting(self) -> int:
+        return max(0, int((self.wire_free - time.monotonic()) * self.baud / 10.0))
+
+    def write(self, data: bytes) -> int:
+        start = max(time.monotonic(), self.wire_free)
+        self.wire_free = start + len(data) * 10.0 / self.baud
+        self.delivered.append((self.wire_free, bytes(data)))
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        return b""
+
+    def flush(self):
+        pass
+
+    def close(self):
+        os.close(self._r)
+        os.close(self._w)
+
+
+class LegacyBridge(RcBridge):
+    def _uart_write_frame(self, frame: bytes, now: float):
+        """The write path before backpressure handling."""
+        with suppress(Exception):
+            self.uart_dev.write(frame)
+            self.packets_uart_tx += 1
+
+
+def run(mode: str, baud: int, args) -> dict:
+    state = SharedState()
+    ns = types.SimpleNamespace(listen_ip="127.0.0.1", listen_port=0, extra_listen=[],
+                               uart_port="/nonexistent", baud=baud)
+    bridge = (LegacyBridge if mode == "legacy" else RcBridge)(state, ns)
+    bridge.open()
+    uart = bridge.uart_dev = LineRateUart(baud)
+    port = next(iter(bridge.socks)).getsockname()[1]
+    thread = threading.Thread(target=bridge.run, daemon=True)
+    thread.start()
+
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sent_at = {}
+    interval = 1.0 / args.rc_hz
+    deadline = time.monotonic()
+    for index in range(1, int(args.rc_hz * args.duration) + 1):
+        deadline += interval
+        sent_at[index] = time.monotonic()
+        tx.sendto(build_frame(index), ("127.0.0.1", port))
+        time.sleep(max(0.0, deadline - time.monotonic()))
+    end = time.monotonic()
+    time.sleep(0.05)
+    bridge._publish(link=True)
+    tx_path = state.bridge.uart_link["tx_path"]
+    bridge.stop()
+    thread.join(timeout=2.0)
+    bridge.close()
+    tx.close()
+
+    ages = [(t - sent_at[frame_index(frame)]) * 1000.0 for t, frame in uart.delivered if t <= end]
+    return {"sent": len(sent_at), "on_wire": len(ages), "ages": ages,
+            "backlog_ms": max(0.0, uart.wire_free - end) * 1000.0,
+            "dropped": tx_path["stale_dropped"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UART backpressure benchmark")
+    parser.add_argument("--rc-hz", type=float, default=100.0, help="iBUS frames per second (default: 100)")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per run (default: 3)")
+    parser.add_argument("--slow-baud", type=int, default=19200,
+                        help="Rate too low for --rc-hz frames (default: 19200, 60 frames/s)")
+    args = parser.parse_args()
+
+    print(f"\n{args.rc_hz:g} iBUS frames/s for {args.duration:g}s")
+    print(f"{'baud':>7}  {'path':<7}{'sent':>6}{'on wire':>9}{'replaced':>10}{'age p50 ms':>12}{'p99 ms':>9}"
+          f"{'max ms':>9}{'backlog ms':>12}")
+    for baud in (115200, args.slow_baud):
+        for mode in ("legacy", "queue"):
+            r = run(mode, baud, args)
+            ages = r["ages"]
+            print(f"{baud:>7}  {mode:<7}{r['sent']:>6}{r['on_wire']:>9}{r['dropped']:>10}"
+                  f"{percentile(ages, 50):>12.1f}{percentile(ages, 99):>9.1f}{max(ages):>9.1f}"
+                  f"{r['backlog_ms']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
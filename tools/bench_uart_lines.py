@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ESP32 UART line splitting, per-byte loop vs chunk-level split.
+
+Replays a captured-style ESP32 stream (IBUS channel dumps with a sprinkling
+of BOOT/CAL lines and an over-long unterminated run) in chunks of the sizes
+a UART read returns, and measures lines/s for:
+
+  split      – splitting alone: the old `for b in chunk` loop vs
+               pi_rover_system.split_uart_lines()
+  split+log  – splitting plus logging: add_log() per line (one lock
+               acquisition each) vs one add_logs() per chunk
+
+Usage:
+  python3 tools/bench_uart_lines.py
+  python3 tools/bench_uart_lines.py --lines 100000 --chunks 32,256,4096
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pi_rover_system import LogRing, SharedState, split_uart_lines  # noqa: E402
+
+
+def legacy_split(carry: bytearray, chunk: bytes, log) -> int:
+    """The per-byte loop RcBridge.handle_uart_rx() used before split_uart_lines()."""
+    lines = 0
+    for b in chunk:
+        if b == ord('\n'):
+            if line_str := carry.decode('ascii', errors='replace').strip():
+                log("ESP32", line_str)
+                lines += 1
+            carry.clear()
+        elif b != ord('\r'):
+            carry.append(b)
+            if len(carry) > 256:
+                carry.clear()
+    return lines
+
+
+def make_stream(count: int) -> bytes:
+    rng = random.Random(1)
+    out = []
+    for i in range(count):
+        if i % 50 == 0:
+            out.append("BOOT: IMU init OK")
+        elif i % 50 == 25:
+            out.append(f"CAL: load valid=1 roll={rng.uniform(-5, 5):.2f} pitch=0.00 yaw=0.00")
+        else:
+            out.append("IBUS: " + " ".join(f"CH{c}={rng.randint(1000, 2000)}" for c in range(1, 15)))
+    stream = "\r\n".join(out).encode() + b"\r\n"
+    return stream + b"x" * 600 + b"\n"       # exercise the overflow guard once
+
+
+def run(stream: bytes, chunk_size: int, mode: str) -> tuple:
+    state = SharedState(logs=LogRing(1000))
+    chunks = [stream[i:i + chunk_size] for i in range(0, len(stream), chunk_size)]
+    carry = bytearray()
+    lines = 0
+    t0 = time.perf_counter()
+    if mode == "legacy split":
+        for chunk in chunks:
+            lines += legacy_split(carry, chunk, lambda src, msg: None)
+    elif mode == "chunk split":
+        for chunk in chunks:
+            lines += len(split_uart_lines(carry, chunk))
+    elif mode == "legacy split+log":
+        for chunk in chunks:
+            lines += legacy_split(carry, chunk, state.add_log)
+    else:
+        for chunk in chunks:
+            batch = split_uart_lines(carry, chunk)
+            if batch:
+                state.add_logs("ESP32", batch)
+                lines += len(batch)
+    return lines, lines / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UART line splitting lines/s benchmark")
+    parser.add_argument("--lines", type=int, default=50000, help="Lines in the replayed stream (default: 50000)")
+    parser.add_argument("--chunks", default="32,512,4096", help="Comma-separated read sizes (default: 32,512,4096)")
+    args = parser.parse_args()
+
+    stream = make_stream(args.lines)
+    modes = ("legacy split", "chunk split", "legacy split+log", "chunk split+log")
+    print(f"\n{args.lines} lines, {len(stream)} bytes")
+    print(f"{'chunk':>6}  {'mode':<18}{'lines':>8}{'lines/s':>12}")
+    for size in (int(c) for c in args.chunks.split(",")):
+        for mode in modes:
+            lines, lps = run(stream, size, mode)
+            print(f"{size:>6}  {mode:<18}{lines:>8}{lps:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
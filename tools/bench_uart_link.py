@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Pi↔ESP32 UART utilisation with ASCII, binary and negotiated links.
+
+Runs RcBridge against tools/esp32_standin.py on a pty while a UDP sender
+feeds it iBUS frames at --rc-hz, with the stand-in reporting channels back
+at --report-hz. Scenarios:
+
+  ascii        – today's link: 115200 baud, "IBUS: CH1=.." debug lines
+  binary       – 115200 baud, LINK_MSG_CHANNELS frames instead of text
+  negotiated   – --link-baud 921600 accepted, binary frames at the new rate
+  old-firmware – --link-baud 921600 against firmware that ignores the
+                 request; the bridge must fall back and keep working
+
+Reports the negotiation outcome and time, channel reports the Pi parsed per
+second, and per-direction utilisation from /api/status's uart_link.
+
+Usage:
+  python3 tools/bench_uart_link.py
+  python3 tools/bench_uart_link.py --duration 5 --report-hz 200
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_bridge_loop import build_frame  # noqa: E402
+from esp32_standin import Esp32Standin  # noqa: E402
+from pi_rover_system import RcBridge, SharedState  # noqa: E402
+
+SCENARIOS = {
+    "ascii": dict(framing="ascii", link_baud=0, old_firmware=False),
+    "binary": dict(framing="binary", link_baud=0, old_firmware=False),
+    "negotiated": dict(framing="auto", link_baud=921600, old_firmware=False),
+    "old-firmware": dict(framing="auto", link_baud=921600, old_firmware=True),
+}
+
+
+def run(name: str, args) -> dict:
+    spec = SCENARIOS[name]
+    standin = Esp32Standin(115200, args.report_hz, spec["framing"], spec["old_firmware"]).start()
+    state = SharedState()
+    bridge_args = types.SimpleNamespace(listen_ip="127.0.0.1", listen_port=0, extra_listen=[],
+                                        uart_port=standin.port, baud=115200, link_baud=spec["link_baud"])
+    bridge = RcBridge(state, bridge_args)
+    bridge.open()
+    port = next(iter(bridge.socks)).getsockname()[1]
+    thread = threading.Thread(target=bridge.run, daemon=True)
+    thread.start()
+
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    interval = 1.0 / args.rc_hz
+    t_start = time.monotonic()
+    deadline = t_start
+    parsed0 = None
+    index = 0
+    while time.monotonic() - t_start < args.duration:
+        deadline += interval
+        index += 1
+        tx.sendto(build_frame(index), ("127.0.0.1", port))
+        if parsed0 is None and time.monotonic() - t_start >= args.settle:
+            parsed0 = (state.esp32.parsed, time.monotonic())
+        time.sleep(max(0.0, deadline - time.monotonic()))
+    parsed1 = (state.esp32.parsed, time.monotonic())
+    bridge._publish(link=True)
+    link = dict(state.bridge.uart_link)
+    bridge.stop()
+    thread.join(timeout=2.0)
+    bridge.close()
+    standin.stop()
+    tx.close()
+    link["reports_s"] = (parsed1[0] - parsed0[0]) / (parsed1[1] - parsed0[1])
+    # Frames between the last one sent and the one whose channels (CH1/CH2 = index,
+    # see build_frame) the stand-in echoed last
+    echoed = state.esp32.channels
+    link["echo_lag"] = index - ((echoed[0] - 1000) | ((echoed[1] - 1000) << 10)) if echoed else None
+    return link
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pi↔ESP32 UART link utilisation benchmark")
+    parser.add_argument("--duration", type=float, default=4.0, help="Seconds per scenario (default: 4)")
+    parser.add_argument("--settle", type=float, default=1.5,
+                        help="Seconds excluded from the report rate while the link settles (default: 1.5)")
+    parser.add_argument("--rc-hz", type=float, default=100.0, help="iBUS frames per second from UDP (default: 100)")
+    parser.add_argument("--report-hz", type=float, default=100.0,
+                        help="Channel reports per second from the stand-in (default: 100)")
+    args = parser.parse_args()
+
+    print(f"\niBUS {args.rc_hz:g}/s down, channel reports {args.report_hz:g}/s up, {args.duration:g}s per scenario")
+    print(f"{'scenario':<14}{'baud':>8}{'mode':>8}{'negotiate ms':>14}{'fallbacks':>11}{'reports/s':>11}"
+          f"{'TX B/s':>9}{'TX %':>7}{'RX B/s':>9}{'RX %':>7}{'CRC err':>9}{'echo lag':>10}")
+    for name in SCENARIOS:
+        r = run(name, args)
+        neg = "-" if r["negotiate_ms"] is None else f"{r['negotiate_ms']:.1f}"
+        print(f"{name:<14}{r['baud']:>8}{r['mode']:>8}{neg:>14}{r['fallbacks']:>11}{r['reports_s']:>11.1f}"
+              f"{r['tx_bytes_s']:>9.0f}{r['tx_util_pct']:>7.1f}{r['rx_bytes_s']:>9.0f}{r['rx_util_pct']:>7.1f}"
+              f"{r['crc_errors']:>9}{str(r['echo_lag']):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MJPEG /video_feed with a fast and a slow viewer, fixed vs adaptive delivery.
+
+Serves pi_web_video_stream.py from a child process fed by StampedCapture
+(see bench_video_h264.py: the capture time is drawn into every frame). Two
+viewers read /video_feed at once:
+
+  fast – reads as fast as the loopback allows
+  slow – a raw socket with a small receive buffer, read at --slow-kbps,
+         like a viewer on a weak Wi-Fi link behind the tether
+
+and the server runs one of:
+
+  fixed    – the route before adaptive delivery: every viewer gets the
+             newest full-quality frame as soon as its last write returned,
+             so the kernel send queue absorbs whatever the link cannot carry
+  adaptive – build_app(): hold frames while the send queue is non-empty and
+             step slow viewers down MJPEG_TIERS
+
+Per viewer it reports delivered fps, KB/s and capture→received latency
+(decoded from the stamp); for the adaptive server also the tier the viewer
+ended on and the frames it skipped, from /stats.
+
+Usage:
+  python3 tools/bench_video_adaptive.py
+  python3 tools/bench_video_adaptive.py --slow-kbps 150 --duration 10
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+from flask import Flask, Response  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+import pi_web_video_stream as video  # noqa: E402
+from bench_bridge_loop import percentile  # noqa: E402
+from bench_video_fanout import reply  # noqa: E402
+from bench_video_h264 import StampedCapture, now_ms, read_stamp  # noqa: E402
+
+
+def fixed_app(camera) -> Flask:
+    """/video_feed as it was: newest full-tier frame per viewer, no backpressure check."""
+    app = Flask(__name__)
+
+    @app.route("/video_feed")
+    def video_feed() -> Response:
+        hub = camera.hub
+
+        def generate():
+            hub.join()
+            try:
+                seq = 0
+                while True:
+                    seq, frame = hub.wait_next(seq, timeout=1.0)
+                    if frame is None:
+                        continue
+                    yield b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame.tiers[0] + b"\r\n"
+            finally:
+                hub.leave()
+
+        return Response(generate(), mimetype="multipart/x-mixed-replace; boundary=frame")
+
+    return app
+
+
+def serve(mode: str, fps: float) -> None:
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    camera = video.CameraStream(0, 640, 480, int(fps), capture=StampedCapture(fps=fps, paced=False),
+                                encoder="opencv")
+    camera.start()
+    app = video.build_app(camera) if mode == "adaptive" else fixed_app(camera)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"port {server.server_port}", flush=True)
+    sys.stdin.read()
+
+
+class Viewer:
+    """Reads /video_feed over a raw socket, optionally rate limited; records (received ms, captured ms)."""
+
+    def __init__(self, port: int, rate: float = 0.0, rcvbuf: int = 0):
+        self.port = port
+        self.rate = rate                  # Bytes/s, 0 = unlimited
+        self.rcvbuf = rcvbuf
+        self.frames = []
+        self.bytes = []
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if self.rcvbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+        sock.connect(("127.0.0.1", self.port))
+        sock.sendall(b"GET /video_feed HTTP/1.1\r\nHost: bench\r\n\r\n")
+        buf, credit, last = b"", 0.0, time.monotonic()
+        while not self.stop.is_set():
+            size = 65536
+            if self.rate:
+                # Token bucket with an 8 KB burst: the link never runs ahead of its rate
+                now = time.monotonic()
+                credit, last = min(8192.0, credit + self.rate * (now - last)), now
+                size = min(4096, int(credit))
+                if size <= 0:
+                    time.sleep(0.002)
+                    continue
+            try:
+                chunk = sock.recv(size)
+            except OSError:
+                break
+            if not chunk:
+                break
+            credit -= len(chunk)
+            self.bytes.append((now_ms(), len(chunk)))
+            buf += chunk
+            while True:
+                start = buf.find(b"\r\n\r\n", buf.find(b"--frame"))
+                end = buf.find(b"\xff\xd9", start + 4) if start >= 0 else -1
+                if end < 0:
+                    break
+                gray = cv2.imdecode(np.frombuffer(buf[start + 4:end + 2], dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+                buf = buf[end + 2:]
+                if gray is not None:
+                    self.frames.append((now_ms(), read_stamp(gray)))
+        sock.close()
+
+    def result(self, t0: int, t1: int) -> dict:
+        frames = [(t, c) for t, c in self.frames if t0 <= t < t1]
+        dt = (t1 - t0) / 1000.0
+        return {"fps": len(frames) / dt, "kb_s": sum(n for t, n in self.bytes if t0 <= t < t1) / dt / 1024,
+                "latency": [t - c for t, c in frames]}
+
+
+def run(mode: str, args) -> list:
+    child = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", mode, "--fps", str(args.fps)],
+                             stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        port = reply(child, "port")
+        viewers = {"fast": Viewer(port), "slow": Viewer(port, args.slow_kbps * 1024, args.rcvbuf)}
+        for viewer in viewers.values():
+            viewer.thread.start()
+        time.sleep(args.warmup)
+        t0 = now_ms()
+        time.sleep(args.duration)
+        t1 = now_ms()
+        clients = []
+        if mode == "adaptive":
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/stats", timeout=5) as resp:
+                clients = json.load(resp)["mjpeg_clients"]
+        for viewer in viewers.values():
+            viewer.stop.set()
+        rows = []
+        for name, viewer in viewers.items():
+            r = viewer.result(t0, t1)
+            # Slow viewer: the one /stats saw sending the fewest bytes
+            stats = sorted(clients, key=lambda c: c["bytes_s"], reverse=name == "fast")
+            r["stats"] = stats[0] if stats else None
+            rows.append((name, r))
+        return rows
+    finally:
+        child.kill()
+        child.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive MJPEG delivery benchmark")
+    parser.add_argument("--duration", type=float, default=6.0, help="Measured seconds per mode (default: 6)")
+    parser.add_argument("--warmup", type=float, default=3.0,
+                        help="Seconds before measuring, for queues to fill and tiers to settle (default: 3)")
+    parser.add_argument("--fps", type=float, default=20.0, help="Camera frame rate (default: 20)")
+    parser.add_argument("--slow-kbps", type=float, default=300.0, help="Slow viewer's read rate, KB/s (default: 300)")
+    parser.add_argument("--rcvbuf", type=int, default=65536,
+                        help="Slow viewer's socket receive buffer, the link's queue (default: 65536)")
+    parser.add_argument("--serve", choices=("fixed", "adaptive"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve, args.fps)
+        return
+
+    print(f"\n640x480 stamped synthetic camera at {args.fps:g} fps; slow viewer {args.slow_kbps:g} KB/s, "
+          f"{args.rcvbuf // 1024} KB receive buffer; {args.duration:g}s after {args.warmup:g}s warm-up")
+    print(f"{'server':<10}{'viewer':<7}{'fps':>6}{'KB/s':>7}{'latency p50':>13}{'p90':>7}{'max':>7}"
+          f"{'tier':>6}{'skipped':>9}")
+    for mode in ("fixed", "adaptive"):
+        for name, r in run(mode, args):
+            lat = r["latency"]
+            stats = r["stats"] or {}
+            print(f"{mode:<10}{name:<7}{r['fps']:>6.1f}{r['kb_s']:>7.0f}{percentile(lat, 50):>11.0f}ms"
+                  f"{percentile(lat, 90):>7.0f}{max(lat, default=0):>7.0f}{stats.get('tier', '-'):>6}"
+                  f"{stats.get('skipped', '-'):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JPEG encode rate and CPU per pi_web_video_stream.py encoder backend.
+
+Frame backends (opencv, v4l2m2m) encode --duration seconds of frames back to
+back, from SyntheticCapture's 640x480 test pattern or, with --source camera,
+from frames read off the camera once up front, so only the encoder is timed.
+The picamera2 backend is fed by the camera's own request loop; it is timed
+while the camera streams at --fps, so its fps is capped by the sensor and
+CPU% is what the whole capture+encode path costs.
+
+  fps      – frames encoded per second
+  CPU %    – process CPU time / wall time (100% = one core)
+  CPU ms   – CPU time per frame
+  KB       – mean encoded frame size
+
+Backends that cannot be opened here (no CSI camera, no bcm2835-codec node)
+are listed as skipped with the reason, so the software path can be measured
+on any Linux box.
+
+Usage:
+  python3 tools/bench_video_encoders.py
+  python3 tools/bench_video_encoders.py --source camera --duration 10 --quality 90
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pi_web_video_stream as video  # noqa: E402
+
+
+def measure(encode_one, duration: float) -> dict:
+    frames = size = 0
+    cpu0, t0 = time.process_time(), time.monotonic()
+    while time.monotonic() - t0 < duration:
+        size += encode_one(frames)
+        frames += 1
+    return result(frames, size, time.process_time() - cpu0, time.monotonic() - t0)
+
+
+def result(frames: int, size: int, cpu: float, wall: float) -> dict:
+    return {"fps": frames / wall, "cpu": 100.0 * cpu / wall,
+            "cpu_ms": 1000.0 * cpu / frames if frames else float("nan"),
+            "kb": size / frames / 1024.0 if frames else float("nan")}
+
+
+def run_frame_encoder(encoder, frames: list, duration: float) -> dict:
+    def encode_one(i: int) -> int:
+        return len(encoder.encode(frames[i % len(frames)]) or b"")
+
+    encoder.encode(frames[0])               # Warm-up: first-frame setup in the driver/library
+    try:
+        return measure(encode_one, duration)
+    finally:
+        encoder.close()
+
+
+def run_picamera2(camera, duration: float) -> dict:
+    sizes = []
+    lock = threading.Lock()
+
+    def publish(jpeg: bytes) -> None:
+        with lock:
+            sizes.append(len(jpeg))
+
+    camera.encoder.start(publish)
+    time.sleep(1.0)
+    with lock:
+        start = len(sizes)
+    cpu0, t0 = time.process_time(), time.monotonic()
+    time.sleep(duration)
+    with lock:
+        got = sizes[start:]
+    r = result(len(got), sum(got), time.process_time() - cpu0, time.monotonic() - t0)
+    camera.encoder.close()
+    return r
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Camera JPEG encoder backend benchmark")
+    parser.add_argument("--source", choices=("synthetic", "camera"), default="synthetic",
+                        help="Frames to encode (default: synthetic)")
+    parser.add_argument("--backends", default="opencv,v4l2m2m,picamera2",
+                        help="Comma-separated backends (default: opencv,v4l2m2m,picamera2)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Measured seconds per backend (default: 5)")
+    parser.add_argument("--width", type=int, default=640, help="Frame width (default: 640)")
+    parser.add_argument("--height", type=int, default=480, help="Frame height (default: 480)")
+    parser.add_argument("--fps", type=int, default=30, help="Camera frame rate for --source camera (default: 30)")
+    parser.add_argument("--quality", type=int, default=80, help="JPEG quality (default: 80)")
+    args = parser.parse_args()
+
+    camera = None
+    if args.source == "camera":
+        camera = video.CameraStream(0, args.width, args.height, args.fps, encoder="opencv", quality=args.quality)
+        # read_frame() reuses one buffer: keep copies
+        frames = [f.copy() for f in (camera.read_frame() for _ in range(30)) if f is not None]
+    else:
+        frames = video.SyntheticCapture(args.width, args.height, paced=False).frames
+
+    print(f"\n{args.width}x{args.height} {args.source} frames, quality {args.quality}, "
+          f"{args.duration:g}s per backend")
+    print(f"{'backend':<11}{'fps':>8}{'CPU %':>8}{'CPU ms':>8}{'KB':>7}")
+    for name in args.backends.split(","):
+        try:
+            if name == "opencv":
+                r = run_frame_encoder(video.OpenCVJpegEncoder(args.quality), frames, args.duration)
+            elif name == "v4l2m2m":
+                device = video.find_m2m_encoder("encode_image")
+                if device is None:
+                    raise OSError("no V4L2 M2M JPEG encoder found")
+                encoder = video.V4L2M2MEncoder(device, args.width, args.height, quality=args.quality)
+                r = run_frame_encoder(encoder, frames, args.duration)
+            elif name == "picamera2":
+                if camera is None or camera.pi_cam is None:
+                    raise RuntimeError("needs --source camera with the CSI camera")
+                camera.encoder = video.Picamera2MjpegEncoder(camera.pi_cam, args.quality)
+                r = run_picamera2(camera, args.duration)
+            else:
+                raise ValueError("unknown backend")
+        except Exception as e:
+            print(f"{name:<11}skipped: {e}")
+            continue
+        print(f"{name:<11}{r['fps']:>8.1f}{r['cpu']:>8.1f}{r['cpu_ms']:>8.2f}{r['kb']:>7.1f}")
+    if camera is not None:
+        camera.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MJPEG fan-out, per-viewer capture+encode vs one shared producer.
+
+Serves pi_web_video_stream.py's /video_feed from a child process, fed by
+its SyntheticCapture (a 640x480 moving test pattern at --fps) and the OpenCV
+encoder, and connects 1, 3 and 10 viewers that read the multipart stream for
+--duration seconds.
+--capture picks how the synthetic camera behaves:
+
+  paced   – read() blocks until the next frame period (V4L2 without
+            buffered frames); extra readers split the camera's frames
+  latest  – read() returns the newest frame at once (picamera2 with a
+            completed request, V4L2 with queued buffers); extra readers
+            re-encode the same frame
+
+  per-viewer – the old route: every viewer's generate() calls
+               camera.read_jpeg() itself and sleeps a frame period, so the
+               camera is read and each frame JPEG-encoded once per viewer,
+               with viewers serialized on CameraStream.lock
+  shared     – CameraStream.start(): one capture+encode thread publishes
+               to FrameHub; viewers only wait and send
+
+Reports frames/s per viewer, encodes/s and the server process's CPU, total
+and per viewer.
+
+Usage:
+  python3 tools/bench_video_fanout.py
+  python3 tools/bench_video_fanout.py --viewers 1,3,10 --duration 10 --fps 30
+"""
+import argparse
+import http.client
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from flask import Flask, Response  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+import pi_web_video_stream as video  # noqa: E402
+from bench_bridge_loop import percentile  # noqa: E402
+
+
+def per_viewer_app(camera) -> Flask:
+    """The /video_feed route as it was: capture and encode inside each viewer's generator."""
+    app = Flask(__name__)
+    frame_delay = 1.0 / camera.fps
+
+    @app.route("/video_feed")
+    def video_feed() -> Response:
+        def generate():
+            while True:
+                frame = camera.read_jpeg()
+                if frame is None:
+                    time.sleep(frame_delay)
+                    continue
+                camera.frames += 1
+                yield b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n"
+                time.sleep(frame_delay)
+
+        return Response(generate(), mimetype="multipart/x-mixed-replace; boundary=frame")
+
+    return app
+
+
+def serve(mode: str, fps: float, capture: str) -> None:
+    """Child process: serve /video_feed, print its port, answer "count" on stdin with encodes so far."""
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    source = video.SyntheticCapture(fps=fps, paced=capture == "paced")
+    camera = video.CameraStream(0, 640, 480, int(fps), capture=source, encoder="opencv")
+    if mode == "shared":
+        camera.start()
+        app = video.build_app(camera)
+    else:
+        app = per_viewer_app(camera)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"port {server.server_port}", flush=True)
+    for line in sys.stdin:
+        if line.strip() == "count":
+            print(f"count {camera.frames}", flush=True)
+
+
+def proc_cpu(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def viewer(port: int, stop: threading.Event, counts: list, slot: int) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    conn.request("GET", "/video_feed")
+    resp = conn.getresponse()
+    tail = b""
+    try:
+        while not stop.is_set():
+            chunk = resp.read1(65536)
+            if not chunk:
+                break
+            data = tail + chunk
+            counts[slot] += data.count(b"--frame\r\n")
+            tail = data[-9:]
+    except (OSError, http.client.HTTPException):
+        pass                               # Server killed at the end of the run
+    conn.close()
+
+
+def reply(child, key: str) -> int:
+    # Skip whatever else the child prints (camera and GPIO notices)
+    while True:
+        line = child.stdout.readline()
+        if not line:
+            raise SystemExit("benchmark server exited")
+        if line.startswith(key + " "):
+            return int(line.split()[1])
+
+
+def run(mode: str, viewers: int, args) -> dict:
+    child = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", mode, "--fps", str(args.fps),
+                              "--capture", args.capture],
+                             stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    port = reply(child, "port")
+    stop = threading.Event()
+    counts = [0] * viewers
+    threads = [threading.Thread(target=viewer, args=(port, stop, counts, i), daemon=True) for i in range(viewers)]
+    for t in threads:
+        t.start()
+    time.sleep(1.0)                      # Warm-up: connections up, first frames out
+
+    def encodes() -> int:
+        child.stdin.write("count\n")
+        child.stdin.flush()
+        return reply(child, "count")
+
+    start_counts, start_enc, cpu0, t0 = list(counts), encodes(), proc_cpu(child.pid), time.monotonic()
+    time.sleep(args.duration)
+    end_counts, end_enc, cpu1, t1 = list(counts), encodes(), proc_cpu(child.pid), time.monotonic()
+    stop.set()
+    child.kill()
+    child.wait()
+    dt = t1 - t0
+    fps = [(e - s) / dt for s, e in zip(start_counts, end_counts)]
+    return {"fps": fps, "encodes": (end_enc - start_enc) / dt, "cpu": 100.0 * (cpu1 - cpu0) / dt}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MJPEG fan-out FPS/CPU benchmark")
+    parser.add_argument("--viewers", default="1,3,10", help="Comma-separated viewer counts (default: 1,3,10)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Measured seconds per run (default: 5)")
+    parser.add_argument("--fps", type=float, default=20.0, help="Camera frame rate (default: 20)")
+    parser.add_argument("--capture", choices=("paced", "latest"), default="latest",
+                        help="Synthetic camera behaviour, see above (default: latest)")
+    parser.add_argument("--serve", choices=("per-viewer", "shared"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve, args.fps, args.capture)
+        return
+
+    print(f"\n640x480 synthetic {args.capture} camera at {args.fps:g} fps, {args.duration:g}s per run")
+    print(f"{'mode':<11}{'viewers':>8}{'fps/viewer p50':>16}{'min':>7}{'encodes/s':>11}"
+          f"{'server CPU':>12}{'CPU/viewer':>12}")
+    for n in (int(v) for v in args.viewers.split(",")):
+        for mode in ("per-viewer", "shared"):
+            r = run(mode, n, args)
+            print(f"{mode:<11}{n:>8}{percentile(r['fps'], 50):>16.1f}{min(r['fps']):>7.1f}{r['encodes']:>11.1f}"
+                  f"{r['cpu']:>11.1f}%{r['cpu'] / n:>11.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bandwidth and latency of the H.264 /video.mp4 stream vs MJPEG /video_feed.
+
+Serves pi_web_video_stream.py from a child process fed by StampedCapture:
+SyntheticCapture's test pattern with the capture time (CLOCK_MONOTONIC ms)
+drawn into the top rows as 32 black/white blocks. One viewer at a time
+reads an endpoint for --duration seconds, decodes every frame (cv2 for JPEG,
+PyAV's h264 decoder for the fMP4 fragments) and reads the stamp back, so:
+
+  KB/s, Mbit/s – bytes on the wire per second
+  fps          – frames decoded per second
+  latency      – capture → decoded frame on the viewer; glass-to-glass minus
+                 sensor exposure and display, which neither path changes
+  first ms     – request sent → first decoded frame (keyframe-on-join)
+  server CPU   – the child process, capture and both encoders included
+
+Both processes share the host clock, so the stamps need no synchronisation.
+The H.264 backend is --h264 (default libx264 through PyAV, the software
+path; use auto on a Pi 4 for the hardware encoder).
+
+Usage:
+  python3 tools/bench_video_h264.py
+  python3 tools/bench_video_h264.py --bitrate 800000 --gop 20 --duration 10
+"""
+import argparse
+import http.client
+import logging
+import os
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import av  # noqa: E402
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+import pi_web_video_stream as video  # noqa: E402
+from bench_bridge_loop import percentile  # noqa: E402
+from bench_video_fanout import proc_cpu, reply  # noqa: E402
+
+STAMP_BITS = 32
+STAMP_W = 20                      # Block size; survives heavy JPEG/H.264 quantisation
+STAMP_H = 24
+
+
+def now_ms() -> int:
+    return time.monotonic_ns() // 1000000
+
+
+class StampedCapture(video.SyntheticCapture):
+    """SyntheticCapture that writes the capture time into each frame it returns."""
+
+    def read(self, image=None):
+        ok, frame = super().read(image)
+        if frame is not image:
+            frame = frame.copy()          # Never stamp the shared pattern frames
+        stamp = now_ms() & 0xFFFFFFFF
+        for bit in range(STAMP_BITS):
+            frame[:STAMP_H, bit * STAMP_W:(bit + 1) * STAMP_W] = 255 if stamp >> bit & 1 else 0
+        return ok, frame
+
+
+def read_stamp(gray) -> int:
+    """Capture time of a decoded frame, expanded from 32 bits against the current time."""
+    scale = gray.shape[1] / 640.0                     # Frames may arrive downscaled
+    w, h = STAMP_W * scale, STAMP_H * scale
+    row = gray[int(h / 4):int(h * 3 / 4)]
+    stamp = 0
+    for bit in range(STAMP_BITS):
+        if row[:, int(bit * w + w / 4):int((bit + 1) * w - w / 4)].mean() > 128:
+            stamp |= 1 << bit
+    now = now_ms()
+    return (now & ~0xFFFFFFFF) | stamp if stamp <= (now & 0xFFFFFFFF) else ((now >> 32) - 1) << 32 | stamp
+
+
+def serve(args) -> None:
+    """Child process: serve both endpoints, print the port, then wait to be killed."""
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    camera = video.CameraStream(0, 640, 480, int(args.fps), capture=StampedCapture(fps=args.fps, paced=False),
+                                encoder="opencv", quality=args.quality, h264=args.h264,
+                                bitrate=args.bitrate, gop=args.gop)
+    camera.start()
+    server = make_server("127.0.0.1", 0, video.build_app(camera), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"port {server.server_port}", flush=True)
+    sys.stdin.read()
+
+
+class Viewer:
+    """Reads one endpoint, decodes every frame and records (arrival ms, capture ms)."""
+
+    def __init__(self, port: int, path: str):
+        self.port = port
+        self.path = path
+        self.frames = []                 # (decoded at ms, captured at ms)
+        self.bytes = []                  # (received at ms, byte count)
+        self.requested = None
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+        self.requested = now_ms()
+        conn.request("GET", self.path)
+        resp = conn.getresponse()
+        decode = self.mjpeg() if self.path == "/video_feed" else self.fmp4()
+        next(decode)
+        try:
+            while not self.stop.is_set():
+                chunk = resp.read1(65536)
+                if not chunk:
+                    break
+                self.bytes.append((now_ms(), len(chunk)))
+                decode.send(chunk)
+        except (OSError, http.client.HTTPException):
+            pass
+        conn.close()
+
+    def mjpeg(self):
+        buf = b""
+        while True:
+            buf += yield
+            while True:
+                # EOI ends the JPEG; waiting for the next boundary would add a frame period
+                start = buf.find(b"\r\n\r\n")
+                end = buf.find(b"\xff\xd9", start + 4) if start >= 0 else -1
+                if end < 0:
+                    break
+                jpeg = np.frombuffer(buf[start + 4:end + 2], dtype=np.uint8)
+                buf = buf[end + 2:]
+                gray = cv2.imdecode(jpeg, cv2.IMREAD_GRAYSCALE)
+                if gray is not None:
+                    self.frames.append((now_ms(), read_stamp(gray)))
+
+    def fmp4(self):
+        buf = b""
+        decoder = av.CodecContext.create("h264", "r")
+        decoder.flags |= av.codec.context.Flags.low_delay
+        headers = b""
+        while True:
+            buf += yield
+            while len(buf) >= 8:
+                size, kind = struct.unpack(">I4s", buf[:8])
+                if len(buf) < size:
+                    break
+                box, buf = buf[8:size], buf[size:]
+                if kind == b"moov":
+                    # SPS/PPS from avcC become the Annex-B prefix of the first sample
+                    i = box.find(b"avcC") + 4
+                    sps_len = struct.unpack(">H", box[i + 6:i + 8])[0]
+                    sps = box[i + 8:i + 8 + sps_len]
+                    j = i + 9 + sps_len
+                    pps = box[j + 2:j + 2 + struct.unpack(">H", box[j:j + 2])[0]]
+                    headers = b"\x00\x00\x00\x01" + sps + b"\x00\x00\x00\x01" + pps
+                elif kind == b"mdat":
+                    annexb, k = [headers], 0
+                    headers = b""
+                    while k < len(box):
+                        n = struct.unpack(">I", box[k:k + 4])[0]
+                        annexb.append(b"\x00\x00\x00\x01" + box[k + 4:k + 4 + n])
+                        k += 4 + n
+                    for frame in decoder.decode(av.Packet(b"".join(annexb))):
+                        self.frames.append((now_ms(), read_stamp(frame.to_ndarray(format="gray"))))
+
+
+def measure(port: int, child_pid: int, path: str, args) -> dict:
+    viewer = Viewer(port, path)
+    viewer.thread.start()
+    time.sleep(args.warmup)
+    t0, cpu0 = now_ms(), proc_cpu(child_pid)
+    time.sleep(args.duration)
+    t1, cpu1 = now_ms(), proc_cpu(child_pid)
+    viewer.stop.set()
+    viewer.thread.join(timeout=5.0)
+    frames = [(t, c) for t, c in viewer.frames if t0 <= t < t1]
+    dt = (t1 - t0) / 1000.0
+    return {"bytes_s": sum(n for t, n in viewer.bytes if t0 <= t < t1) / dt,
+            "fps": len(frames) / dt,
+            "latency": [t - c for t, c in frames],
+            "first": viewer.frames[0][0] - viewer.requested if viewer.frames else float("nan"),
+            "cpu": 100.0 * (cpu1 - cpu0) / dt}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="H.264 fMP4 vs MJPEG bandwidth/latency benchmark")
+    parser.add_argument("--duration", type=float, default=5.0, help="Measured seconds per endpoint (default: 5)")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds before measuring (default: 1)")
+    parser.add_argument("--fps", type=float, default=20.0, help="Camera frame rate (default: 20)")
+    parser.add_argument("--quality", type=int, default=80, help="MJPEG quality (default: 80)")
+    parser.add_argument("--h264", choices=video.H264_ENCODERS[:-1], default="libx264",
+                        help="H.264 backend (default: libx264)")
+    parser.add_argument("--bitrate", type=int, default=1500000, help="H.264 bits/s (default: 1500000)")
+    parser.add_argument("--gop", type=int, default=40, help="H.264 frames between keyframes (default: 40)")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args)
+        return
+
+    child = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", "--fps", str(args.fps),
+                              "--quality", str(args.quality), "--h264", args.h264,
+                              "--bitrate", str(args.bitrate), "--gop", str(args.gop)],
+                             stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        port = reply(child, "port")
+        print(f"\n640x480 stamped synthetic camera at {args.fps:g} fps, {args.duration:g}s per endpoint; "
+              f"MJPEG q{args.quality}, H.264 {args.h264} {args.bitrate / 1e6:g} Mbit/s GOP {args.gop}")
+        print(f"{'endpoint':<13}{'KB/s':>8}{'Mbit/s':>8}{'fps':>6}{'latency p50':>13}{'p90':>6}{'max':>6}"
+              f"{'first ms':>10}{'server CPU':>12}")
+        for path in ("/video_feed", "/video.mp4"):
+            r = measure(port, child.pid, path, args)
+            lat = r["latency"]
+            print(f"{path:<13}{r['bytes_s'] / 1024:>8.0f}{r['bytes_s'] * 8 / 1e6:>8.2f}{r['fps']:>6.1f}"
+                  f"{percentile(lat, 50):>11.0f}ms{percentile(lat, 90):>6.0f}{max(lat, default=0):>6.0f}"
+                  f"{r['first']:>10.0f}{r['cpu']:>11.1f}%")
+    finally:
+        child.kill()
+        child.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+ESP32 stand-in on a pseudo-terminal, for exercising the Pi↔ESP32 UART link
+without the rover.
+
+Opens a pty and prints the slave path; point pi_rover_system.py at it with
+--uart-port. The stand-in behaves like esp32_receiver.ino as seen from the
+Pi's side of the wire:
+
+  - decodes the 32-byte iBUS frames the bridge writes and reports the
+    channels back --rate times per second, either as "IBUS: CH1=.." text
+    lines or as binary LINK_MSG_CHANNELS frames (--framing)
+  - answers LINK_MSG_BAUD_REQUEST with an ack at the current rate, switches,
+    and answers LINK_MSG_PING with LINK_MSG_PONG; it drops back to the base
+    rate if no ping arrives, as the firmware would after losing the Pi
+  - --old-firmware ignores link frames entirely; --refuse nacks every request
+
+A pty carries bytes at memory speed and ignores the baud rate, so the
+stand-in emulates both: every write holds the "wire" for 10 bit times per
+byte at its current rate, and while the rate the Pi set on the tty differs
+from its own, input is discarded and output turns into noise, which is what
+a rate mismatch on a real UART produces.
+
+Usage:
+  python3 tools/esp32_standin.py
+  python3 tools/esp32_standin.py --framing binary --rate 100
+  python3 pi_rover_system.py --uart-port /dev/pts/N --link-baud 921600
+"""
+import argparse
+import binascii
+import os
+import random
+import select
+import sys
+import termios
+import threading
+import time
+import tty
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pi_rover_system import (IBUS_FRAME_LEN, IBUS_HEADER, LINK_CHANNELS, LINK_CRC,  # noqa: E402
+                             LINK_KEEPALIVE_SEC, LINK_MSG_BAUD_ACK, LINK_MSG_BAUD_REQUEST,
+                             LINK_MSG_CHANNELS, LINK_MSG_PING, LINK_MSG_PONG, LINK_MSG_TEXT,
+                             LINK_OVERHEAD, LINK_SYNC, LINK_U32, pack_link_frame)
+
+# termios speed constant -> bits per second
+SPEEDS = {getattr(termios, f"B{b}"): b for b in (9600, 19200, 38400, 57600, 115200, 230400, 460800,
+                                                 500000, 576000, 921600, 1000000, 1500000, 2000000)
+          if hasattr(termios, f"B{b}")}
+VERIFY_SEC = 1.0                 # After an ack, revert unless a ping arrives within this
+
+
+class Esp32Standin:
+    def __init__(self, base_baud: int = 115200, rate: float = 50.0, framing: str = "auto",
+                 old_firmware: bool = False, refuse: bool = False):
+        self.base_baud = base_baud
+        self.baud = base_baud
+        self.rate = rate
+        self.framing = framing
+        self.old_firmware = old_firmware
+        self.refuse = refuse
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self._set_tty_speed(base_baud)
+        self.port = os.ttyname(self.slave)
+        self.channels = (1500,) * 14
+        self.inbuf = b""
+        self.fast = False                # Switched away from base_baud
+        self.last_ping = 0.0
+        self.rng = random.Random(7)
+        self.stats = {"ibus_frames": 0, "reports": 0, "tx_bytes": 0, "rx_bytes": 0,
+                      "mismatched_rx": 0, "mismatched_tx": 0, "pings": 0, "switches": 0, "reverts": 0}
+        self._running = False
+        self._thread = None
+
+    # ── emulated wire ───────────────────────────────────────────────────────
+    def _set_tty_speed(self, baud: int):
+        attrs = termios.tcgetattr(self.slave)
+        speed = next(k for k, v in SPEEDS.items() if v == baud)
+        attrs[4] = attrs[5] = speed
+        termios.tcsetattr(self.slave, termios.TCSANOW, attrs)
+
+    def pi_baud(self) -> int:
+        """Rate the Pi side last set on the tty (termios is shared by every fd of the pty)."""
+        return SPEEDS.get(termios.tcgetattr(self.slave)[4], 0)
+
+    def _write(self, data: bytes):
+        if self.pi_baud() != self.baud:
+            self.stats["mismatched_tx"] += len(data)
+            data = bytes(self.rng.randrange(256) for _ in data)
+        os.write(self.master, data)
+        self.stats["tx_bytes"] += len(data)
+        time.sleep(len(data) * 10.0 / self.baud)      # Serial.write() blocks on a full TX FIFO
+
+    # ── input ───────────────────────────────────────────────────────────────
+    def _on_input(self, data: bytes):
+        self.stats["rx_bytes"] += len(data)
+        if self.pi_baud() != self.baud:
+            self.stats["mismatched_rx"] += len(data)
+            self.inbuf = b""
+            return
+        buf = self.inbuf + data
+        while True:
+            i = buf.find(IBUS_HEADER)
+            j = -1 if self.old_firmware else buf.find(LINK_SYNC)
+            if i < 0 and j < 0:
+                buf = buf[-1:]
+                break
+            if j < 0 or 0 <= i < j:
+                if len(buf) - i < IBUS_FRAME_LEN:
+                    buf = buf[i:]
+                    break
+                frame = buf[i:i + IBUS_FRAME_LEN]
+                self.channels = tuple(int.from_bytes(frame[2 + 2 * c:4 + 2 * c], "little") & 0x0FFF
+                                      for c in range(14))
+                self.stats["ibus_frames"] += 1
+                buf = buf[i + IBUS_FRAME_LEN:]
+                continue
+            if len(buf) - j < 3 or len(buf) - j < LINK_OVERHEAD + buf[j + 2]:
+                buf = buf[j:]
+                break
+            end = j + LINK_OVERHEAD + buf[j + 2]
+            body = buf[j + 2:end - LINK_CRC.size]
+            if binascii.crc_hqx(body, 0xFFFF) == LINK_CRC.unpack_from(buf, end - LINK_CRC.size)[0]:
+                self._on_frame(body[1], body[2:])
+                buf = buf[end:]
+            else:
+                buf = buf[j + 1:]
+        self.inbuf = buf
+
+    def _on_frame(self, msg_type: int, payload: bytes):
+        if msg_type == LINK_MSG_BAUD_REQUEST:
+            baud = LINK_U32.unpack(payload)[0]
+            if self.refuse or baud not in SPEEDS.values():
+                self._write(pack_link_frame(LINK_MSG_BAUD_ACK, LINK_U32.pack(0)))
+                return
+            self._write(pack_link_frame(LINK_MSG_BAUD_ACK, LINK_U32.pack(baud)))
+            self.baud = baud
+            self.fast = baud != self.base_baud
+            # Backdated so the revert check in run() fires VERIFY_SEC from now without a ping
+            self.last_ping = time.monotonic() - LINK_KEEPALIVE_SEC * 3 + VERIFY_SEC
+            self.stats["switches"] += 1
+        elif msg_type == LINK_MSG_PING:
+            self.stats["pings"] += 1
+            self.last_ping = time.monotonic()
+            self._write(pack_link_frame(LINK_MSG_PONG, payload))
+
+    # ── output ──────────────────────────────────────────────────────────────
+    def _report(self):
+        binary = self.framing == "binary" or (self.framing == "auto" and self.fast)
+        if binary:
+            self._write(pack_link_frame(LINK_MSG_CHANNELS, LINK_CHANNELS.pack(*self.channels)))
+        else:
+            text = "IBUS: " + " ".join(f"CH{i}={v}" for i, v in enumerate(self.channels, 1))
+            self._write(text.encode() + b"\r\n")
+        self.stats["reports"] += 1
+
+    def _text(self, line: str):
+        if self.framing == "binary" or (self.framing == "auto" and self.fast):
+            self._write(pack_link_frame(LINK_MSG_TEXT, line.encode()))
+        else:
+            self._write(line.encode() + b"\r\n")
+
+    # ── loop ────────────────────────────────────────────────────────────────
+    def run(self):
+        self._running = True
+        self._text("BOOT: setup start")
+        self._text("BOOT: IMU init OK")
+        interval = 1.0 / self.rate
+        next_report = time.monotonic()
+        while self._running:
+            now = time.monotonic()
+            if self.fast and now - self.last_ping > LINK_KEEPALIVE_SEC * 3:
+                # Lost the Pi at the fast rate: go back to where it will look for us
+                self.baud = self.base_baud
+                self.fast = False
+                self.stats["reverts"] += 1
+            if now >= next_report:
+                self._report()
+                next_report = max(next_report + interval, time.monotonic())
+            ready, _, _ = select.select([self.master], [], [], max(0.0, next_report - time.monotonic()))
+            if ready:
+                try:
+                    self._on_input(os.read(self.master, 4096))
+                except OSError:
+                    break
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        os.close(self.master)
+        os.close(self.slave)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pty-based ESP32 stand-in for the Pi UART link")
+    parser.add_argument("--baud", type=int, default=115200, help="Base rate (default: 115200)")
+    parser.add_argument("--rate", type=float, default=50.0, help="Channel reports per second (default: 50)")
+    parser.add_argument("--framing", choices=("ascii", "binary", "auto"), default="auto",
+                        help="Report format; auto = binary once at a negotiated rate (default: auto)")
+    parser.add_argument("--old-firmware", action="store_true", help="Ignore link frames like current firmware")
+    parser.add_argument("--refuse", action="store_true", help="Refuse every baud request")
+    args = parser.parse_args()
+
+    standin = Esp32Standin(args.baud, args.rate, args.framing, args.old_firmware, args.refuse)
+    print(f"ESP32 stand-in on {standin.port} @ {args.baud}")
+    standin.start()
+    try:
+        while True:
+            time.sleep(5.0)
+            print(f"{standin.baud} baud  {standin.stats}")
+    except KeyboardInterrupt:
+        pass
+    standin.stop()
+
+
+if __name__ == "__main__":
+    main()
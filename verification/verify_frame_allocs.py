@@ -0,0 +1,92 @@
+"""
+Steady-state allocations on the capture → encode path of pi_web_video_stream.py.
+
+Covers the frame backends, which read every frame into CameraStream.frame_buf:
+OpenCV JPEG for all MJPEG_TIERS, plus libx264 when PyAV is installed. Runs on
+SyntheticCapture, so no camera is needed. picamera2's push encoders never
+bring frames into Python and are not covered here.
+
+    python3 -m pytest -q verification/verify_frame_allocs.py
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pi_web_video_stream as video  # noqa: E402
+
+WIDTH, HEIGHT = 640, 480
+FRAME_BYTES = WIDTH * HEIGHT * 3
+WARMUP = 10
+FRAMES = 50
+
+
+def open_camera() -> video.CameraStream:
+    capture = video.SyntheticCapture(WIDTH, HEIGHT, paced=False)
+    return video.CameraStream(0, WIDTH, HEIGHT, 20, capture=capture, encoder="opencv",
+                              h264="libx264" if video.AV_AVAILABLE else "off")
+
+
+def traced_peak(fn, *args) -> tuple:
+    """(result, tracemalloc peak above the traced memory at the call)."""
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    result = fn(*args)
+    return result, tracemalloc.get_traced_memory()[1] - base
+
+
+def test_read_frame_reuses_one_buffer():
+    camera = open_camera()
+    try:
+        first = camera.read_frame()
+        second = camera.read_frame()
+        assert first is second is camera.frame_buf
+    finally:
+        camera.close()
+
+
+def test_capture_encode_allocates_only_the_output():
+    camera = open_camera()
+    tiers = set(range(len(video.MJPEG_TIERS)))
+
+    def step():
+        frame = camera.read_frame()
+        return camera.encode_tiers(frame, tiers), camera.h264.encode(frame) if camera.h264 else None
+
+    try:
+        for _ in range(WARMUP):
+            step()
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            for _ in range(FRAMES):
+                frame, capture_peak = traced_peak(camera.read_frame)
+                jpegs, tiers_peak = traced_peak(camera.encode_tiers, frame, tiers)
+                # The JPEGs themselves are the product; what matters is the scratch around them
+                assert capture_peak < FRAME_BYTES // 100, f"capture allocated {capture_peak} bytes"
+                scratch = tiers_peak - sum(len(jpeg) for jpeg in jpegs)
+                assert scratch < FRAME_BYTES // 8, f"tiers needed {scratch} bytes of scratch"
+                unit = None
+                if camera.h264 is not None:
+                    unit, h264_peak = traced_peak(camera.h264.encode, frame)
+                    scratch = h264_peak - len(unit or b"")
+                    assert scratch < FRAME_BYTES // 8, f"libx264 needed {scratch} bytes of scratch"
+                del frame, jpegs, unit
+            # Nothing accumulates from frame to frame
+            left = tracemalloc.get_traced_memory()[0] - start
+            assert left < 16 * 1024, f"{left} bytes left behind after {FRAMES} frames"
+        finally:
+            tracemalloc.stop()
+    finally:
+        camera.close()
+
+
+if __name__ == "__main__":
+    try:
+        test_read_frame_reuses_one_buffer()
+        test_capture_encode_allocates_only_the_output()
+        print("Frame buffer allocation checks passed")
+    except AssertionError as e:
+        print(f"Test failed: {e}")
+        exit(1)